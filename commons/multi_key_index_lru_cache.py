@@ -1,4 +1,6 @@
-from commons.ds.multi_key_index import MultiKeyIndex
+from typing import Optional
+
+from commons.ds.multi_key_index import MultiKeyIndex, MultiKeyIndexObject
 
 
 class MultiKeyIndexLRUCache:
@@ -10,48 +12,58 @@ class MultiKeyIndexLRUCache:
     ):
         self.max_object_count = max_object_count
         self.index = MultiKeyIndex(primary_key, secondary_keys)
-        self.object_count = 0
+
+    @property
+    def object_count(self):
+        return len(self.index.primary_index)
 
     def _pop_lru(self):
         lru_key = next(iter(self.index.primary_index))
         return self.index.pop(lru_key)
 
-    def _push_to_mru(self, obj):
-        key = obj[self.index.primary_index_object_key]
+    def _push_to_mru(self, entry: MultiKeyIndexObject):
+        key = entry.value[self.index.primary_index_object_key]
 
         self.index.primary_index.pop(key)
-        self.index.primary_index[key] = obj
+        self.index.primary_index[key] = entry
 
     def set_max_object_count(self, max_object_count):
         self.max_object_count = max_object_count
         while self.object_count > self.max_object_count:
             self._pop_lru()
 
-    def add(self, obj: dict):
-        self.index.add(obj)
-        self.object_count += 1
+    def add(self, obj: dict, context: dict = None):
+        self.index.add(MultiKeyIndexObject(obj, context))
 
         while self.object_count > self.max_object_count:
             self._pop_lru()
 
+    def pop(self, key) -> Optional[dict]:
+        entry = self.index.pop(key)
+        return entry.value if entry else None
+
+    def clear(self):
+        while self.object_count:
+            self._pop_lru()
+
+    def get_entry(self, key) -> Optional[MultiKeyIndexObject]:
+        entry = self.index.primary_index.get(key)
+        if entry:
+            self._push_to_mru(entry)
+        return entry
+
     def query(self, query: dict):
-        objs = self.index.query(query)
-        for obj in objs:
-            self._push_to_mru(obj)
-        return objs
+        entries = [entry for entry in self.index.query(query) if entry]
+        for entry in entries:
+            self._push_to_mru(entry)
+        return [entry.value for entry in entries]
 
     def get_all(self, key, value):
-        objs = self.index.get_all(key, value)
-        for obj in objs:
-            self._push_to_mru(obj)
-        return objs
+        return self.query({key: value})
 
     def get_one(self, key, value, at_index=0):
-        obj = self.index.get_one(key, value, at_index)
-        self._push_to_mru(obj)
-        return obj
+        objs = self.get_all(key, value)
+        return objs[at_index] if len(objs) > at_index else None
 
     def get_first(self, key, value):
-        obj = self.index.get_first(key, value)
-        self._push_to_mru(obj)
-        return obj
+        return self.get_one(key, value)
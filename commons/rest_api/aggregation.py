@@ -0,0 +1,81 @@
+from enum import Enum
+from typing import Tuple, Union
+
+from sqlalchemy import func, distinct
+from sqlalchemy.orm import InstrumentedAttribute
+
+TIME_BUCKET_LABEL = 'bucket'
+
+MetricSpec = Union[str, Tuple[str, str]]
+
+
+class AggregateFunction(str, Enum):
+    COUNT = 'count'
+    COUNT_DISTINCT = 'count_distinct'
+    SUM = 'sum'
+    AVG = 'avg'
+    MIN = 'min'
+    MAX = 'max'
+
+
+class TimeBucketUnit(str, Enum):
+    MINUTE = 'minute'
+    HOUR = 'hour'
+    DAY = 'day'
+    WEEK = 'week'
+    MONTH = 'month'
+    YEAR = 'year'
+
+
+_SQLITE_BUCKET_FORMATS = {
+    TimeBucketUnit.MINUTE: '%Y-%m-%d %H:%M:00',
+    TimeBucketUnit.HOUR: '%Y-%m-%d %H:00:00',
+    TimeBucketUnit.DAY: '%Y-%m-%d 00:00:00',
+    TimeBucketUnit.MONTH: '%Y-%m-01 00:00:00',
+    TimeBucketUnit.YEAR: '%Y-01-01 00:00:00',
+}
+
+_AGGREGATES = {
+    AggregateFunction.SUM: func.sum,
+    AggregateFunction.AVG: func.avg,
+    AggregateFunction.MIN: func.min,
+    AggregateFunction.MAX: func.max,
+}
+
+
+def split_metric_spec(spec: MetricSpec) -> Tuple[AggregateFunction, str]:
+    function, column = (spec, None) if isinstance(spec, str) else spec
+
+    try:
+        function = AggregateFunction(function)
+    except ValueError:
+        raise ValueError(f'Unsupported aggregate function {function}')
+
+    if column is None and function != AggregateFunction.COUNT:
+        raise ValueError(f'Aggregate function {function.value} requires a column')
+
+    return function, column
+
+
+def create_metric_expression(function: AggregateFunction, attr: InstrumentedAttribute = None):
+    if function == AggregateFunction.COUNT:
+        return func.count(attr) if attr is not None else func.count()
+    if function == AggregateFunction.COUNT_DISTINCT:
+        return func.count(distinct(attr))
+
+    return _AGGREGATES[function](attr)
+
+
+def create_time_bucket_expression(attr: InstrumentedAttribute, unit: str, dialect_name: str):
+    try:
+        unit = TimeBucketUnit(unit)
+    except ValueError:
+        raise ValueError(f'Unsupported time bucket unit {unit}')
+
+    if dialect_name == 'postgresql':
+        return func.date_trunc(unit.value, attr)
+
+    if dialect_name == 'sqlite' and unit in _SQLITE_BUCKET_FORMATS:
+        return func.strftime(_SQLITE_BUCKET_FORMATS[unit], attr)
+
+    raise ValueError(f'Time bucket {unit.value} is not supported by the {dialect_name} dialect')
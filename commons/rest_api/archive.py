@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Type, Callable, Optional
+
+from sqlalchemy import Table, Column, MetaData, select, insert, delete, union_all
+from sqlalchemy.engine import Engine, Connection
+
+from commons.datetime import now
+from commons.logging import log_info, log_error
+from commons.rest_api.base_model import BaseDBModel
+from commons.threads import run_in_separate_thread, ThreadWrapper
+
+ARCHIVE_TABLE_SUFFIX = '_archive'
+
+archive_metadata = MetaData()
+
+
+class ArchiveMode(str, Enum):
+    ARCHIVE = 'archive'
+    PURGE = 'purge'
+
+
+def get_archive_table(db_model_class: Type[BaseDBModel]) -> Table:
+    table = db_model_class.__table__
+    name = f'{table.name}{ARCHIVE_TABLE_SUFFIX}'
+    key = f'{table.schema}.{name}' if table.schema else name
+
+    if key in archive_metadata.tables:
+        return archive_metadata.tables[key]
+
+    return Table(name, archive_metadata, schema=table.schema, *[
+        Column(column.name, column.type, primary_key=column.primary_key, autoincrement=False, nullable=column.nullable)
+        for column in table.columns
+    ])
+
+
+def create_archive_table(engine: Engine, db_model_class: Type[BaseDBModel]) -> Table:
+    archive_table = get_archive_table(db_model_class)
+    archive_table.create(bind=engine, checkfirst=True)
+    return archive_table
+
+
+def create_archive_union(db_model_class: Type[BaseDBModel]):
+    table = db_model_class.__table__
+    archive_table = get_archive_table(db_model_class)
+    return union_all(
+        select(*table.columns),
+        select(*[archive_table.c[column.name] for column in table.columns])
+    ).subquery(f'{table.name}_with_archive')
+
+
+@dataclass
+class ArchiveProgress:
+    table: str
+    mode: ArchiveMode
+    cutoff: datetime
+    processed: int = 0
+    chunks: int = 0
+    last_id: int = 0
+    started_at: datetime = field(default_factory=now)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+
+class SoftDeleteArchiver:
+    def __init__(
+            self,
+            db_model_class: Type[BaseDBModel],
+            engine: Engine,
+            *,
+            older_than_days: float = 30,
+            mode: ArchiveMode = ArchiveMode.ARCHIVE,
+            chunk_size: int = 1000,
+            sleep_seconds: float = 0.1,
+            max_chunks: int = None,
+            on_progress: Callable[[ArchiveProgress], None] = None
+    ):
+        self.db_model_class = db_model_class
+        self.engine = engine
+        self.older_than_days = older_than_days
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.sleep_seconds = sleep_seconds
+        self.max_chunks = max_chunks
+        self.on_progress = on_progress
+        self.table = db_model_class.__table__
+        self.archive_table = get_archive_table(db_model_class) if mode == ArchiveMode.ARCHIVE else None
+        self.last_progress: Optional[ArchiveProgress] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[ThreadWrapper] = None
+
+    def _create_chunk_query(self, connection: Connection, cutoff: datetime, last_id: int):
+        query = select(self.table.c.id) \
+            .where(self.table.c.deleted_at < cutoff, self.table.c.id > last_id) \
+            .order_by(self.table.c.id) \
+            .limit(self.chunk_size)
+
+        if connection.dialect.name == 'postgresql':
+            query = query.with_for_update(skip_locked=True)
+
+        return query
+
+    def _process_chunk(self, progress: ArchiveProgress) -> int:
+        with self.engine.begin() as connection:
+            ids = connection.execute(self._create_chunk_query(connection, progress.cutoff, progress.last_id)) \
+                .scalars().all()
+
+            if not ids:
+                return 0
+
+            condition = self.table.c.id.in_(ids)
+            if self.archive_table is not None:
+                connection.execute(insert(self.archive_table).from_select(
+                    [column.name for column in self.table.columns],
+                    select(*self.table.columns).where(condition)
+                ))
+            connection.execute(delete(self.table).where(condition))
+
+        progress.processed += len(ids)
+        progress.chunks += 1
+        progress.last_id = ids[-1]
+        return len(ids)
+
+    def _report(self, progress: ArchiveProgress) -> None:
+        log_info(f'{progress.mode.value.upper()} {progress.table}: {progress.processed} rows in {progress.chunks} '
+                 f'chunks (last id {progress.last_id})')
+        if self.on_progress is not None:
+            self.on_progress(progress)
+
+    def run(self) -> ArchiveProgress:
+        if self.archive_table is not None:
+            self.archive_table.create(bind=self.engine, checkfirst=True)
+
+        progress = ArchiveProgress(
+            table=self.table.name,
+            mode=self.mode,
+            cutoff=now() - timedelta(days=self.older_than_days)
+        )
+        self.last_progress = progress
+
+        while not self._stop_event.is_set():
+            if self.max_chunks is not None and progress.chunks >= self.max_chunks:
+                break
+            if not self._process_chunk(progress):
+                break
+
+            self._report(progress)
+            if self.sleep_seconds:
+                self._stop_event.wait(self.sleep_seconds)
+
+        progress.finished_at = now()
+        return progress
+
+    def _run_forever(self, interval_seconds: float) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.run()
+            except Exception as e:
+                log_error(f'{self.mode.value.upper()} {self.table.name} failed: {type(e).__name__}: {e}')
+            self._stop_event.wait(interval_seconds)
+
+    def start(self, interval_seconds: float = 3600) -> ThreadWrapper:
+        self._stop_event.clear()
+        self._thread = run_in_separate_thread(self._run_forever, args=(interval_seconds,))
+        return self._thread
+
+    def stop(self, timeout: float = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.thread.join(timeout)
+            self._thread = None
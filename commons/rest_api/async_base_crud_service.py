@@ -0,0 +1,286 @@
+from typing import TypeVar, Type, Optional, Any, List, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from commons.rest_api.async_base_dao import AsyncBaseDao
+from commons.rest_api.base_crud_service import BaseCrudService
+from commons.rest_api.base_model import BaseBLModel
+from commons.rest_api.id_loader import AsyncIdLoader
+from commons.rest_api.model_validator import AsyncModelValidator
+from commons.rest_api.pagination import PaginationOptions, PaginatedResults, CountStrategy
+
+_T = TypeVar('_T', bound=BaseBLModel)
+
+
+class AsyncBaseCrudService(BaseCrudService[_T]):
+    dao: AsyncBaseDao
+
+    def __init__(
+            self,
+            dao: AsyncBaseDao,
+            bl_model_class: Type[_T],
+            model_validator_class: Type[AsyncModelValidator] = None
+    ):
+        super().__init__(dao, bl_model_class, model_validator_class or AsyncModelValidator)
+
+    async def _count_by_strategy(
+            self,
+            pagination_options: PaginationOptions,
+            filters: dict = None,
+            db_session: AsyncSession = None
+    ) -> Optional[int]:
+
+        if pagination_options.count == CountStrategy.NONE:
+            return None
+
+        if pagination_options.count == CountStrategy.ESTIMATED:
+            return await self.dao.estimate_count_by_filter(filters=filters or {}, db_session=db_session)
+
+        return await self.count_by_filter(filters=filters, db_session=db_session)
+
+    async def get_all(
+            self,
+            filters: dict = None,
+            db_session: AsyncSession = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None,
+            **kwargs
+    ) -> List[_T]:
+        self._assert_valid_read(filters, fields)
+
+        return await self.dao.get_all(**self._get_read_kwargs(filters, db_session, exclude_fields, fields, **kwargs))
+
+    async def get_all_paginated(
+            self,
+            filters: dict = None,
+            pagination_options: PaginationOptions = None,
+            db_session: AsyncSession = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None,
+            **kwargs
+    ) -> PaginatedResults[_T]:
+
+        pagination_options = pagination_options or PaginationOptions()
+        self._assert_valid_read(filters, fields)
+
+        if pagination_options.is_cursor_mode():
+            return await self._get_all_cursor_paginated(
+                filters=filters,
+                pagination_options=pagination_options,
+                db_session=db_session,
+                exclude_fields=exclude_fields,
+                fields=fields,
+                **kwargs
+            )
+
+        offset, limit = self._get_offset_limit(pagination_options)
+
+        if pagination_options.count == CountStrategy.EXACT:
+            models, total = await self.dao.get_all_with_total(
+                offset=offset,
+                limit=limit,
+                **self._get_read_kwargs(filters, db_session, exclude_fields, fields, **kwargs)
+            )
+
+            if total is None:
+                total = 0 if offset == 0 else await self.count_by_filter(filters=filters, db_session=db_session)
+
+            return self._cast_to_offset_page(models, pagination_options, offset, total)
+
+        models = await self.get_all(
+            filters=filters,
+            offset=offset,
+            limit=limit + 1,
+            db_session=db_session,
+            exclude_fields=exclude_fields,
+            fields=fields,
+            **kwargs
+        )
+        total = await self._count_by_strategy(pagination_options, filters=filters, db_session=db_session)
+
+        return self._cast_to_limited_page(models, pagination_options, limit, total)
+
+    async def _get_all_cursor_paginated(
+            self,
+            filters: dict = None,
+            pagination_options: PaginationOptions = None,
+            db_session: AsyncSession = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None,
+            **kwargs
+    ) -> PaginatedResults[_T]:
+
+        order_by = self.dao.get_keyset_ordering(kwargs.pop('order_by', None))
+        cursor = pagination_options.cursor or None
+
+        if cursor is not None:
+            self._assert_valid_cursor(cursor, order_by)
+
+        models = await self.get_all(
+            filters=filters,
+            after=cursor,
+            limit=pagination_options.size + 1,
+            order_by=order_by,
+            db_session=db_session,
+            exclude_fields=exclude_fields,
+            fields=fields,
+            **kwargs
+        )
+        total = await self._count_by_strategy(pagination_options, filters=filters, db_session=db_session)
+
+        return self._cast_to_cursor_page(models, pagination_options, order_by, total)
+
+    async def get_all_by_field(
+            self,
+            field: str,
+            value: Any,
+            db_session: AsyncSession = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None
+    ) -> List[_T]:
+
+        self._assert_valid_fields([field])
+        self._assert_valid_read(fields=fields)
+
+        return await self.dao.get_all_by_field(
+            field,
+            value,
+            db_session=db_session,
+            exclude_columns=exclude_fields,
+            fields=fields
+        )
+
+    async def get_all_by_field_paginated(
+            self,
+            field: str,
+            value: Any,
+            pagination_options: PaginationOptions = None,
+            db_session: AsyncSession = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None
+    ) -> PaginatedResults[_T]:
+
+        self._assert_valid_fields([field])
+
+        return await self.get_all_paginated(
+            filters={field: value},
+            pagination_options=pagination_options,
+            db_session=db_session,
+            exclude_fields=exclude_fields,
+            fields=fields
+        )
+
+    async def get_one_by_field(
+            self,
+            field: str,
+            value: Any,
+            db_session: AsyncSession = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None
+    ) -> Optional[_T]:
+
+        self._assert_valid_read(fields=fields)
+
+        model = await self.dao.get_one_by_field(
+            field,
+            value,
+            db_session=db_session,
+            exclude_columns=exclude_fields,
+            fields=fields
+        )
+        self._assert_found_by_field(model, field, value)
+
+        return model
+
+    async def get_by_id(
+            self,
+            resource_id: int,
+            db_session: AsyncSession = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None,
+            **kwargs
+    ) -> Optional[_T]:
+
+        self._assert_valid_read(fields=fields)
+
+        model = await self.dao.get_by_id(
+            resource_id,
+            db_session=db_session,
+            exclude_columns=exclude_fields,
+            fields=fields,
+            **kwargs
+        )
+        self._assert_found_by_id(model, resource_id)
+
+        return model
+
+    async def get_by_ids(
+            self,
+            resource_ids: List[int],
+            db_session: AsyncSession = None,
+            exclude_fields: List[str] = None,
+            **kwargs
+    ) -> List[Optional[_T]]:
+        return await self.dao.get_by_ids(resource_ids, db_session=db_session, exclude_columns=exclude_fields, **kwargs)
+
+    def create_id_loader(self, db_session: AsyncSession = None, **kwargs) -> AsyncIdLoader[_T]:
+        return AsyncIdLoader(self.dao, db_session, **kwargs)
+
+    async def exists(self, resource_id: int, db_session: AsyncSession = None, **kwargs) -> bool:
+        return await self.dao.exists_by_id(resource_id, db_session=db_session, **kwargs)
+
+    async def create(self, model: _T, db_session: AsyncSession = None, **kwargs) -> _T:
+        return await self.dao.create(model, db_session=db_session, **kwargs)
+
+    async def create_many(self, models: List[_T], db_session: AsyncSession = None, **kwargs) -> List[_T]:
+        return await self.dao.create_many(models, db_session=db_session, **kwargs)
+
+    async def update_by_id(self, resource_id: int, model: _T) -> _T:
+        self.get_validator(model) \
+            .assert_resource_id_matches_path_variable_id(resource_id) \
+            .validate_in_memory()
+
+        return await self.update(model)
+
+    async def update(self, model: _T) -> _T:
+
+        await self.get_validator(model) \
+            .assert_model_exists_in_db_by_id() \
+            .validate()
+
+        return await self.dao.update(model)
+
+    async def count_by_filter(self, filters: dict = None, db_session: AsyncSession = None, **kwargs) -> int:
+        self._assert_valid_read(filters)
+
+        return await self.dao.count_by_filter(
+            filters=filters or {},
+            db_session=db_session,
+            **kwargs
+        )
+
+    async def aggregate(self, filters: dict = None, db_session: AsyncSession = None, **kwargs) -> List[Dict[str, Any]]:
+        self._assert_valid_read(filters)
+
+        return await self.dao.aggregate(
+            filters=filters or {},
+            db_session=db_session,
+            **kwargs
+        )
+
+    async def partial_update(self, resource_id: int, partial_model: dict) -> _T:
+        model = await self.dao.patch(resource_id, self._get_patch_changes(partial_model))
+        self._assert_found_by_id(model, resource_id)
+
+        return model
+
+    async def delete_by_id(self, resource_id: int, db_session: AsyncSession, *, hard_delete: bool = False) -> None:
+        await self.get_validator() \
+            .assert_model_exists_in_db_by_id(resource_id) \
+            .validate()
+
+        await self.dao.delete_by_id(
+            resource_id,
+            db_session=db_session,
+            hard_delete=hard_delete
+        )
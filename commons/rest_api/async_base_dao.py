@@ -0,0 +1,425 @@
+from __future__ import annotations
+
+from typing import Type, Generic, TypeVar, Optional, Iterable, AsyncIterator, List, Any, Tuple, Dict
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseBLModel, BaseDBModel
+from commons.rest_api.replica_router import ReplicaRouter, ReplicaStrategy
+from commons.rest_api.unit_of_work import get_current_async_session, has_session_writes
+
+_T = TypeVar('_T', bound=BaseBLModel)
+
+
+class AsyncBaseDao(Generic[_T]):
+    bl_model_class: Type[BaseBLModel] = None
+    db_model_class: Type[BaseDBModel] = None
+    sync_dao_class: Type[BaseDao] = BaseDao
+    engine: AsyncEngine
+    replica_engines: List[AsyncEngine] = None
+    replica_strategy: ReplicaStrategy = ReplicaStrategy.ROUND_ROBIN
+
+    def __init__(
+            self,
+            *,
+            bl_model_class: Type[BaseBLModel] = None,
+            db_model_class: Type[BaseDBModel] = None,
+            engine: AsyncEngine = None,
+            replica_engines: List[AsyncEngine] = None,
+            replica_strategy: ReplicaStrategy = None,
+            **kwargs
+    ):
+        self.bl_model_class = bl_model_class or self.bl_model_class
+        self.db_model_class = db_model_class or self.db_model_class
+        self.engine = engine or self.engine
+        self.replica_engines = replica_engines or self.replica_engines
+        self.replica_strategy = replica_strategy or self.replica_strategy
+        self.replica_router = ReplicaRouter(self.replica_engines, self.replica_strategy) \
+            if self.replica_engines else None
+        self.sync_dao = self.sync_dao_class(
+            bl_model_class=self.bl_model_class,
+            db_model_class=self.db_model_class,
+            engine=self.engine.sync_engine,
+            **kwargs
+        )
+
+    def _create_session(self) -> AsyncSession:
+        return AsyncSession(self.engine)
+
+    def _create_read_session(self, use_primary: bool = False) -> AsyncSession:
+        if use_primary or self.replica_router is None:
+            return self._create_session()
+
+        return AsyncSession(self.replica_router.choose())
+
+    def _get_session(self) -> Tuple[AsyncSession, bool]:
+        if (session := get_current_async_session(self.engine)) is not None:
+            return session, False
+
+        return self._create_session(), True
+
+    def _get_read_session(self, use_primary: bool = False) -> Tuple[AsyncSession, bool]:
+        session = get_current_async_session(self.engine)
+        if session is not None and (
+                use_primary or self.replica_router is None or has_session_writes(session.sync_session)
+        ):
+            return session, False
+
+        return self._create_read_session(use_primary), True
+
+    async def _run_sync_read(
+            self,
+            method_name: str,
+            db_session: AsyncSession,
+            close_db_session: bool,
+            *args,
+            use_primary: bool = False,
+            **kwargs
+    ):
+        if db_session is None:
+            db_session, close_db_session = self._get_read_session(use_primary)
+
+        return await self._run_sync(method_name, db_session, close_db_session, *args, **kwargs)
+
+    async def _run_sync(self, method_name: str, db_session: AsyncSession, close_db_session: bool, *args, **kwargs):
+        if db_session is None:
+            db_session, close_db_session = self._get_session()
+
+        method = getattr(self.sync_dao, method_name)
+
+        try:
+            return await db_session.run_sync(lambda session: method(*args, db_session=session, **kwargs))
+
+        finally:
+            if close_db_session:
+                await db_session.close()
+
+    def get_keyset_ordering(self, ordering: dict = None) -> dict:
+        return self.sync_dao.get_keyset_ordering(ordering)
+
+    def encode_cursor(self, model: _T, order_by: dict = None) -> str:
+        return self.sync_dao.encode_cursor(model, order_by)
+
+    def decode_cursor(self, cursor: str, order_by: dict = None) -> List[Any]:
+        return self.sync_dao.decode_cursor(cursor, order_by)
+
+    async def get_all(
+            self,
+            filters: dict = None,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> List[_T]:
+        return await self._run_sync_read('get_all', db_session, close_db_session, filters, **kwargs)
+
+    async def get_all_with_total(
+            self,
+            filters: dict = None,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> Tuple[List[_T], Optional[int]]:
+        return await self._run_sync_read('get_all_with_total', db_session, close_db_session, filters, **kwargs)
+
+    async def iter_all(
+            self,
+            filters: dict = None,
+            order_by: dict = None,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            *,
+            batch_size: int = 1000,
+            batches: bool = False,
+            include_soft_deleted: bool = False,
+            exclude_columns: List[str] = None,
+            bl_model_class: Type[BaseBLModel] = None,
+            use_primary: bool = False,
+    ) -> AsyncIterator[_T] | AsyncIterator[List[_T]]:
+
+        bl_model_class = bl_model_class or self.bl_model_class
+        filters = filters or {}
+        order_by = order_by or {'id': 'asc'}
+
+        if db_session is None:
+            db_session, close_db_session = self._get_read_session(use_primary)
+
+        query, params = self.sync_dao._create_get_all_query(
+            filters,
+            order_by=order_by,
+            include_soft_deleted=include_soft_deleted,
+            exclude_columns=exclude_columns,
+        )
+        query = query.execution_options(max_row_buffer=batch_size)
+
+        try:
+            async_result = await db_session.stream(query, params)
+            keys = async_result.keys()
+            async for partition in async_result.partitions(batch_size):
+                models = self.sync_dao._cast_rows_to_bl_models(partition, keys, bl_model_class)
+                if batches:
+                    yield models
+                else:
+                    for model in models:
+                        yield model
+
+        finally:
+            if close_db_session:
+                await db_session.close()
+
+    async def get_all_by_field(
+            self,
+            field: str,
+            value: Any,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> List[_T]:
+        return await self._run_sync_read('get_all_by_field', db_session, close_db_session, field, value, **kwargs)
+
+    async def get_one_by_field(
+            self,
+            field: str,
+            value: Any,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> Optional[_T]:
+        return await self._run_sync_read('get_one_by_field', db_session, close_db_session, field, value, **kwargs)
+
+    async def get_by_id(
+            self,
+            resource_id: int,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> Optional[_T]:
+        return await self._run_sync_read('get_by_id', db_session, close_db_session, resource_id, **kwargs)
+
+    async def get_by_ids(
+            self,
+            resource_ids: Iterable[int],
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> List[Optional[_T]]:
+        return await self._run_sync_read('get_by_ids', db_session, close_db_session, resource_ids, **kwargs)
+
+    async def create(
+            self,
+            model: _T,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> _T:
+        return await self._run_sync('create', db_session, close_db_session, model, **kwargs)
+
+    async def create_many(
+            self,
+            models: Iterable[_T],
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> List[_T]:
+        return await self._run_sync('create_many', db_session, close_db_session, models, **kwargs)
+
+    async def bulk_create_many(
+            self,
+            models: Iterable[_T],
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> List[_T]:
+        return await self._run_sync('bulk_create_many', db_session, close_db_session, models, **kwargs)
+
+    async def update(
+            self,
+            model: _T,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> _T:
+        return await self._run_sync('update', db_session, close_db_session, model, **kwargs)
+
+    async def patch(
+            self,
+            resource_id: int,
+            changes: Dict[str, Any] | BaseBLModel,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> Optional[_T]:
+        return await self._run_sync('patch', db_session, close_db_session, resource_id, changes, **kwargs)
+
+    async def upsert_many(
+            self,
+            models: Iterable[_T],
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> List[_T]:
+        return await self._run_sync('upsert_many', db_session, close_db_session, models, **kwargs)
+
+    async def update_many(
+            self,
+            models: Iterable[_T],
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> List[_T]:
+        return await self._run_sync('update_many', db_session, close_db_session, models, **kwargs)
+
+    async def delete(
+            self,
+            model: _T,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> None:
+        return await self._run_sync('delete', db_session, close_db_session, model, **kwargs)
+
+    async def hard_delete(
+            self,
+            model: _T,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> None:
+        return await self._run_sync('hard_delete', db_session, close_db_session, model, **kwargs)
+
+    async def soft_delete(
+            self,
+            model: _T,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> None:
+        return await self._run_sync('soft_delete', db_session, close_db_session, model, **kwargs)
+
+    async def delete_by_id(
+            self,
+            resource_id: int,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> None:
+        return await self._run_sync('delete_by_id', db_session, close_db_session, resource_id, **kwargs)
+
+    async def hard_delete_by_id(
+            self,
+            resource_id: int,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> None:
+        return await self._run_sync('hard_delete_by_id', db_session, close_db_session, resource_id, **kwargs)
+
+    async def soft_delete_by_id(
+            self,
+            resource_id: int,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> None:
+        return await self._run_sync('soft_delete_by_id', db_session, close_db_session, resource_id, **kwargs)
+
+    async def update_by_filter(
+            self,
+            filters: dict,
+            values: dict,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> int:
+        return await self._run_sync('update_by_filter', db_session, close_db_session, filters, values, **kwargs)
+
+    async def delete_by_filter(
+            self,
+            filters: dict,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> int:
+        return await self._run_sync('delete_by_filter', db_session, close_db_session, filters, **kwargs)
+
+    async def soft_delete_by_filter(
+            self,
+            filters: dict,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> int:
+        return await self._run_sync('soft_delete_by_filter', db_session, close_db_session, filters, **kwargs)
+
+    async def hard_delete_by_filter(
+            self,
+            filters: dict,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> int:
+        return await self._run_sync('hard_delete_by_filter', db_session, close_db_session, filters, **kwargs)
+
+    async def count_by_filter(
+            self,
+            filters: dict = None,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> int:
+        return await self._run_sync_read('count_by_filter', db_session, close_db_session, filters, **kwargs)
+
+    async def aggregate(
+            self,
+            filters: dict = None,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> List[Dict[str, Any]]:
+        return await self._run_sync_read('aggregate', db_session, close_db_session, filters, **kwargs)
+
+    async def estimate_count_by_filter(
+            self,
+            filters: dict = None,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> int:
+        return await self._run_sync_read('estimate_count_by_filter', db_session, close_db_session, filters, **kwargs)
+
+    async def exists_by_filter(
+            self,
+            filters: dict = None,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> bool:
+        return await self._run_sync_read('exists_by_filter', db_session, close_db_session, filters, **kwargs)
+
+    async def exists_many(
+            self,
+            filters_list: List[dict],
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> List[bool]:
+        return await self._run_sync_read('exists_many', db_session, close_db_session, filters_list, **kwargs)
+
+    async def exists_by_field(
+            self,
+            field: str,
+            value: Any,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> bool:
+        return await self._run_sync_read('exists_by_field', db_session, close_db_session, field, value, **kwargs)
+
+    async def exists_by_id(
+            self,
+            resource_id: int,
+            db_session: AsyncSession = None,
+            close_db_session: bool = False,
+            **kwargs
+    ) -> bool:
+        return await self._run_sync_read('exists_by_id', db_session, close_db_session, resource_id, **kwargs)
@@ -1,11 +1,13 @@
-from typing import TypeVar, Generic, Type, Optional, Any, List
+from typing import TypeVar, Generic, Type, Optional, Any, List, Dict
 
 from sqlalchemy.orm import Session
 
-from commons.rest_api.pagination import PaginationOptions, PaginatedResults
+from commons.rest_api.pagination import PaginationOptions, PaginatedResults, CountStrategy
 from commons.rest_api.base_dao import BaseDao
 from commons.rest_api.base_model import BaseBLModel
-from commons.rest_api.model_validator import ModelValidator
+from commons.rest_api.filters import split_filter_key
+from commons.rest_api.id_loader import IdLoader
+from commons.rest_api.model_validator import ModelValidator, ValidationError
 
 _T = TypeVar('_T', bound=BaseBLModel)
 
@@ -29,27 +31,160 @@ class BaseCrudService(Generic[_T]):
             self,
             models: List[_T],
             pagination_options: PaginationOptions,
-            total: int
+            total: Optional[int],
+            next_cursor: str = None,
+            has_next: bool = None
     ) -> PaginatedResults[_T]:
         return PaginatedResults(
             results=models,
             params=pagination_options.dict(),
-            total=total
+            total=total,
+            has_next=has_next,
+            next_cursor=next_cursor
+        )
+
+    def _cast_to_offset_page(
+            self,
+            models: List[_T],
+            pagination_options: PaginationOptions,
+            offset: int,
+            total: int
+    ) -> PaginatedResults[_T]:
+        return self._cast_to_paginated_results(
+            models=models,
+            pagination_options=pagination_options,
+            total=total,
+            has_next=offset + len(models) < total
+        )
+
+    def _cast_to_limited_page(
+            self,
+            models: List[_T],
+            pagination_options: PaginationOptions,
+            limit: int,
+            total: Optional[int]
+    ) -> PaginatedResults[_T]:
+        return self._cast_to_paginated_results(
+            models=models[:limit],
+            pagination_options=pagination_options,
+            total=total,
+            has_next=len(models) > limit
+        )
+
+    def _cast_to_cursor_page(
+            self,
+            models: List[_T],
+            pagination_options: PaginationOptions,
+            order_by: dict,
+            total: Optional[int]
+    ) -> PaginatedResults[_T]:
+        next_cursor = None
+        if len(models) > pagination_options.size:
+            models = models[:pagination_options.size]
+            next_cursor = self.dao.encode_cursor(models[-1], order_by)
+
+        return self._cast_to_paginated_results(
+            models=models,
+            pagination_options=pagination_options,
+            total=total,
+            next_cursor=next_cursor,
+            has_next=next_cursor is not None
         )
 
+    def _get_read_kwargs(
+            self,
+            filters: dict = None,
+            db_session: Session = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None,
+            **kwargs
+    ) -> dict:
+        return {
+            'filters': filters or {},
+            'db_session': db_session,
+            'exclude_columns': exclude_fields,
+            'fields': fields,
+            **kwargs
+        }
+
+    def _get_patch_changes(self, partial_model: dict) -> dict:
+        return {
+            key: value for key, value in partial_model.items()
+            if key in self.bl_model_class.__fields__ and self.dao.db_model_class.has_column(key)
+        }
+
+    def _count_by_strategy(
+            self,
+            pagination_options: PaginationOptions,
+            filters: dict = None,
+            db_session: Session = None
+    ) -> Optional[int]:
+
+        if pagination_options.count == CountStrategy.NONE:
+            return None
+
+        if pagination_options.count == CountStrategy.ESTIMATED:
+            return self.dao.estimate_count_by_filter(filters=filters or {}, db_session=db_session)
+
+        return self.count_by_filter(filters=filters, db_session=db_session)
+
+    def _assert_valid_filters(self, filters: dict) -> None:
+        validator = self.get_validator()
+
+        for key, value in filters.items():
+            field, _ = split_filter_key(key)
+            validator \
+                .assert_field_exists_on_model(field, self.bl_model_class) \
+                .assert_valid_filter(key, value)
+
+        validator.validate_in_memory()
+
+    def _assert_valid_fields(self, fields: List[str]) -> None:
+        validator = self.get_validator()
+
+        for field in fields:
+            validator.assert_field_exists_on_model(field, self.bl_model_class)
+
+        validator.validate_in_memory()
+
+    def _assert_valid_read(self, filters: dict = None, fields: List[str] = None) -> None:
+        if filters:
+            self._assert_valid_filters(filters)
+
+        if fields:
+            self._assert_valid_fields(fields)
+
+    def _assert_valid_cursor(self, cursor: str, order_by: dict = None) -> None:
+        try:
+            self.dao.decode_cursor(cursor, order_by)
+        except ValueError as e:
+            self.get_validator() \
+                .add_custom_validation_error(ValidationError(str(e))) \
+                .validate_in_memory()
+
+    def _assert_found_by_field(self, model: Optional[_T], field: str, value: Any) -> None:
+        if model is None:
+            self.get_validator() \
+                .add_model_not_found_by_field_error(field, value) \
+                .validate_in_memory()
+
+    def _assert_found_by_id(self, model: Optional[_T], resource_id: int) -> None:
+        if model is None:
+            self.get_validator() \
+                .add_model_not_found_by_id_error(resource_id) \
+                .validate_in_memory()
+
     def get_all(
             self,
             filters: dict = None,
             db_session: Session = None,
             exclude_fields: List[str] = None,
+            fields: List[str] = None,
             **kwargs
     ) -> List[_T]:
-        return self.dao.get_all(
-            filters=filters or {},
-            db_session=db_session,
-            exclude_columns=exclude_fields,
-            **kwargs
-        )
+        self._assert_valid_read(filters, fields)
+
+        return self.dao.get_all(**self._get_read_kwargs(filters, db_session, exclude_fields, fields, **kwargs))
 
     def get_all_paginated(
             self,
@@ -57,47 +192,98 @@ class BaseCrudService(Generic[_T]):
             pagination_options: PaginationOptions = None,
             db_session: Session = None,
             exclude_fields: List[str] = None,
+            fields: List[str] = None,
             **kwargs
     ) -> PaginatedResults[_T]:
-        
+
         pagination_options = pagination_options or PaginationOptions()
+        self._assert_valid_read(filters, fields)
+
+        if pagination_options.is_cursor_mode():
+            return self._get_all_cursor_paginated(
+                filters=filters,
+                pagination_options=pagination_options,
+                db_session=db_session,
+                exclude_fields=exclude_fields,
+                fields=fields,
+                **kwargs
+            )
 
         offset, limit = self._get_offset_limit(pagination_options)
+
+        if pagination_options.count == CountStrategy.EXACT:
+            models, total = self.dao.get_all_with_total(
+                offset=offset,
+                limit=limit,
+                **self._get_read_kwargs(filters, db_session, exclude_fields, fields, **kwargs)
+            )
+
+            if total is None:
+                total = 0 if offset == 0 else self.count_by_filter(filters=filters, db_session=db_session)
+
+            return self._cast_to_offset_page(models, pagination_options, offset, total)
+
         models = self.get_all(
             filters=filters,
             offset=offset,
-            limit=limit,
+            limit=limit + 1,
             db_session=db_session,
             exclude_fields=exclude_fields,
+            fields=fields,
             **kwargs
         )
+        total = self._count_by_strategy(pagination_options, filters=filters, db_session=db_session)
 
-        return self._cast_to_paginated_results(
-            models=models,
-            pagination_options=pagination_options,
-            total=self.count_by_filter(
-                filters=filters,
-                db_session=db_session
-            )
+        return self._cast_to_limited_page(models, pagination_options, limit, total)
+
+    def _get_all_cursor_paginated(
+            self,
+            filters: dict = None,
+            pagination_options: PaginationOptions = None,
+            db_session: Session = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None,
+            **kwargs
+    ) -> PaginatedResults[_T]:
+
+        order_by = self.dao.get_keyset_ordering(kwargs.pop('order_by', None))
+        cursor = pagination_options.cursor or None
+
+        if cursor is not None:
+            self._assert_valid_cursor(cursor, order_by)
+
+        models = self.get_all(
+            filters=filters,
+            after=cursor,
+            limit=pagination_options.size + 1,
+            order_by=order_by,
+            db_session=db_session,
+            exclude_fields=exclude_fields,
+            fields=fields,
+            **kwargs
         )
+        total = self._count_by_strategy(pagination_options, filters=filters, db_session=db_session)
+
+        return self._cast_to_cursor_page(models, pagination_options, order_by, total)
 
     def get_all_by_field(
             self,
             field: str,
             value: Any,
             db_session: Session = None,
-            exclude_fields: List[str] = None
+            exclude_fields: List[str] = None,
+            fields: List[str] = None
     ) -> List[_T]:
 
-        self.get_validator(self.bl_model_class) \
-            .assert_field_exists_on_model(field) \
-            .validate()
+        self._assert_valid_fields([field])
+        self._assert_valid_read(fields=fields)
 
         return self.dao.get_all_by_field(
             field,
             value,
             db_session=db_session,
-            exclude_columns=exclude_fields
+            exclude_columns=exclude_fields,
+            fields=fields
         )
 
     def get_all_by_field_paginated(
@@ -106,49 +292,71 @@ class BaseCrudService(Generic[_T]):
             value: Any,
             pagination_options: PaginationOptions = None,
             db_session: Session = None,
-            exclude_fields: List[str] = None
+            exclude_fields: List[str] = None,
+            fields: List[str] = None
     ) -> PaginatedResults[_T]:
 
-        self.get_validator(self.bl_model_class) \
-            .assert_field_exists_on_model(field) \
-            .validate()
+        self._assert_valid_fields([field])
 
         return self.get_all_paginated(
             filters={field: value},
             pagination_options=pagination_options,
             db_session=db_session,
-            exclude_fields=exclude_fields
+            exclude_fields=exclude_fields,
+            fields=fields
         )
 
-    def get_one_by_field(self, field: str, value: Any, db_session: Session = None, exclude_fields: List[str] = None) \
-            -> Optional[_T]:
+    def get_one_by_field(
+            self,
+            field: str,
+            value: Any,
+            db_session: Session = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None
+    ) -> Optional[_T]:
 
-        model = self.dao.get_one_by_field(field, value, db_session=db_session, exclude_columns=exclude_fields)
+        self._assert_valid_read(fields=fields)
 
-        if model is None:
-            self.get_validator() \
-                .add_model_not_found_by_field_error(field, value) \
-                .validate()
+        model = self.dao.get_one_by_field(
+            field,
+            value,
+            db_session=db_session,
+            exclude_columns=exclude_fields,
+            fields=fields
+        )
+        self._assert_found_by_field(model, field, value)
 
         return model
 
-    def get_by_id(self, resource_id: int, db_session: Session = None, exclude_fields: List[str] = None, **kwargs) \
-            -> Optional[_T]:
+    def get_by_id(
+            self,
+            resource_id: int,
+            db_session: Session = None,
+            exclude_fields: List[str] = None,
+            fields: List[str] = None,
+            **kwargs
+    ) -> Optional[_T]:
+
+        self._assert_valid_read(fields=fields)
 
         model = self.dao.get_by_id(
             resource_id,
             db_session=db_session,
             exclude_columns=exclude_fields,
+            fields=fields,
             **kwargs
         )
-
-        if model is None:
-            self.get_validator() \
-                .add_model_not_found_by_id_error(resource_id) \
-                .validate()
+        self._assert_found_by_id(model, resource_id)
 
         return model
 
+    def get_by_ids(self, resource_ids: List[int], db_session: Session = None, exclude_fields: List[str] = None,
+                   **kwargs) -> List[Optional[_T]]:
+        return self.dao.get_by_ids(resource_ids, db_session=db_session, exclude_columns=exclude_fields, **kwargs)
+
+    def create_id_loader(self, db_session: Session = None, **kwargs) -> IdLoader[_T]:
+        return IdLoader(self.dao, db_session, **kwargs)
+
     def exists(self, resource_id: int, db_session: Session = None, **kwargs) -> bool:
         return self.dao.exists_by_id(resource_id, db_session=db_session, **kwargs)
 
@@ -161,7 +369,7 @@ class BaseCrudService(Generic[_T]):
     def update_by_id(self, resource_id: int, model: _T) -> _T:
         self.get_validator(model) \
             .assert_resource_id_matches_path_variable_id(resource_id) \
-            .validate()
+            .validate_in_memory()
 
         return self.update(model)
 
@@ -174,25 +382,28 @@ class BaseCrudService(Generic[_T]):
         return self.dao.update(model)
 
     def count_by_filter(self, filters: dict = None, db_session: Session = None, **kwargs) -> int:
+        self._assert_valid_read(filters)
+
         return self.dao.count_by_filter(
             filters=filters or {},
             db_session=db_session,
             **kwargs
         )
 
-    def partial_update(self, resource_id: int, partial_model: dict) -> _T:
-        model = self.get_by_id(resource_id)
+    def aggregate(self, filters: dict = None, db_session: Session = None, **kwargs) -> List[Dict[str, Any]]:
+        self._assert_valid_read(filters)
 
-        if not model:
-            self.get_validator() \
-                .add_model_not_found_by_id_error(resource_id) \
-                .validate()
+        return self.dao.aggregate(
+            filters=filters or {},
+            db_session=db_session,
+            **kwargs
+        )
 
-        for key, value in partial_model.items():
-            if hasattr(model, key):
-                setattr(model, key, value)
+    def partial_update(self, resource_id: int, partial_model: dict) -> _T:
+        model = self.dao.patch(resource_id, self._get_patch_changes(partial_model))
+        self._assert_found_by_id(model, resource_id)
 
-        return self.update(model)
+        return model
 
     def delete_by_id(self, resource_id: int, db_session: Session, *, hard_delete: bool = False) -> None:
         self.get_validator() \
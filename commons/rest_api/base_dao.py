@@ -1,37 +1,165 @@
 from __future__ import annotations
 
+import io
+import time
 from abc import ABC
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Type, Generic, TypeVar, Optional, Iterable, List, Any, Dict
-
-from sqlalchemy import update, select, exists, func, delete
+from itertools import groupby
+from threading import Lock
+from typing import Type, Generic, TypeVar, Optional, Iterable, Iterator, List, Any, Dict, Tuple, Callable, Sequence
+
+import orjson
+from pydantic import validate_model
+from sqlalchemy import update, select, exists, func, delete, insert, tuple_, and_, or_, values, column, cast, bindparam, \
+    Integer, event
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.engine import Engine, Row
-from sqlalchemy.orm import Session, InstrumentedAttribute, RelationshipProperty
-
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, InstrumentedAttribute, Load
+from sqlalchemy.sql.util import ClauseAdapter
+
+from commons.datetime import now
+from commons.rest_api.aggregation import AggregateFunction, MetricSpec, TIME_BUCKET_LABEL, split_metric_spec, \
+    create_metric_expression, create_time_bucket_expression
+from commons.rest_api.archive import create_archive_union
 from commons.rest_api.base_model import BaseBLModel, BaseDBModel
+from commons.rest_api.filters import split_filter_key, create_filter_clause, get_filter_param, get_filter_shape, \
+    has_filter_param
+from commons.rest_api.identity_cache import IdentityCache
+from commons.rest_api.integrity_errors import translate_integrity_error
+from commons.rest_api.query_recorder import QueryShapeRecorder, create_query_shape
+from commons.rest_api.replica_router import ReplicaRouter, ReplicaStrategy
+from commons.rest_api.pagination import encode_cursor, decode_cursor, coerce_cursor_value
+from commons.rest_api.partitioning import coerce_partition_value, assert_partitioning_supported
+from commons.rest_api.unit_of_work import get_current_session, has_session_writes, mark_session_writes, \
+    is_unit_of_work_session
+from commons.utils import pop_first
 
 _T = TypeVar('_T', bound=BaseBLModel)
 
+_IMMUTABLE_DEFAULT_TYPES = (type(None), str, int, float, bool, bytes, tuple, frozenset)
+
+_TOTAL_COUNT_LABEL = '_total_count'
+
+_SERVER_MANAGED_COLUMNS = frozenset({'id', 'created_at', 'updated_at', 'deleted_at'})
+
+_COPY_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+_PENDING_INVALIDATIONS_KEY = 'commons_pending_invalidations'
+
+
+def _run_pending_invalidations(session: Session) -> None:
+    for invalidate in session.info.pop(_PENDING_INVALIDATIONS_KEY, []):
+        invalidate()
+
+
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
+
 
 class BaseDao(ABC, Generic[_T]):
     bl_model_class: Type[BaseBLModel] = None
     db_model_class: Type[BaseDBModel] = None
     engine: Engine
+    query_cache_size: int = 256
+    trusted_hydration: bool = False
+    identity_cache: IdentityCache = None
+    replica_engines: List[Engine] = None
+    replica_strategy: ReplicaStrategy = ReplicaStrategy.ROUND_ROBIN
+    query_recorder: QueryShapeRecorder = None
 
     def __init__(
             self,
             *,
             bl_model_class: Type[BaseBLModel] = None,
             db_model_class: Type[BaseDBModel] = None,
-            engine: Engine = None
+            engine: Engine = None,
+            trusted_hydration: bool = None,
+            identity_cache: IdentityCache = None,
+            replica_engines: List[Engine] = None,
+            replica_strategy: ReplicaStrategy = None,
+            query_recorder: QueryShapeRecorder = None
     ):
         self.bl_model_class = bl_model_class or self.bl_model_class
         self.db_model_class = db_model_class or self.db_model_class
         self.engine = engine or self.engine
+        self.trusted_hydration = self.trusted_hydration if trusted_hydration is None else trusted_hydration
+        self.identity_cache = identity_cache or self.identity_cache
+        self.replica_engines = replica_engines or self.replica_engines
+        self.replica_strategy = replica_strategy or self.replica_strategy
+        self.replica_router = ReplicaRouter(self.replica_engines, self.replica_strategy) \
+            if self.replica_engines else None
+        self.query_recorder = query_recorder or self.query_recorder
+        if self.db_model_class is not None and getattr(self, 'engine', None) is not None:
+            assert_partitioning_supported(self.engine, self.db_model_class)
+        self._query_cache = {}
+        self._query_cache_lock = Lock()
+        self._hydrator_cache = {}
+
+    @staticmethod
+    def _create_hydrator(bl_model_class: Type[BaseBLModel], keys: Tuple[str, ...]) -> Callable[[Sequence], _T]:
+        fields = bl_model_class.__fields__
+        indexed_keys = [(i, key) for i, key in enumerate(keys) if key in fields]
+        fields_set = {key for _, key in indexed_keys}
+        static_defaults = {}
+        dynamic_default_fields = []
+
+        for name, field in fields.items():
+            if name in fields_set or field.required:
+                continue
+            if field.default_factory is None and isinstance(field.default, _IMMUTABLE_DEFAULT_TYPES):
+                static_defaults[name] = field.default
+            else:
+                dynamic_default_fields.append(field)
+
+        has_private_attributes = bool(bl_model_class.__private_attributes__)
+
+        def hydrate(row: Sequence) -> _T:
+            values = static_defaults.copy()
+            for field in dynamic_default_fields:
+                values[field.name] = field.get_default()
+            for i, key in indexed_keys:
+                values[key] = row[i]
+
+            model = bl_model_class.__new__(bl_model_class)
+            object.__setattr__(model, '__dict__', values)
+            object.__setattr__(model, '__fields_set__', fields_set.copy())
+            if has_private_attributes:
+                model._init_private_attributes()
+            return model
+
+        return hydrate
+
+    def _get_hydrator(self, bl_model_class: Type[BaseBLModel], keys: Tuple[str, ...]) -> Callable[[Sequence], _T]:
+        cache_key = (bl_model_class, keys)
+        hydrator = self._hydrator_cache.get(cache_key)
+
+        if hydrator is None:
+            hydrator = self._hydrator_cache[cache_key] = self._create_hydrator(bl_model_class, keys)
+
+        return hydrator
+
+    def _cast_rows_to_bl_models(self, rows: Iterable[Row], keys: Sequence[str], bl_model_class: Type[BaseBLModel] = None) \
+            -> List[_T]:
+
+        bl_model_class = bl_model_class or self.bl_model_class
+
+        if self.trusted_hydration:
+            hydrate = self._get_hydrator(bl_model_class, tuple(keys))
+            return [hydrate(row) for row in rows]
+
+        return [self._cast_to_bl_model(row, bl_model_class) for row in rows]
 
     def _cast_to_bl_model(self, model: BaseDBModel | Dict | Row, bl_model_class: Type[BaseBLModel] = None) -> _T:
         bl_model_class = bl_model_class or self.bl_model_class
 
+        if self.trusted_hydration:
+            if isinstance(model, Row):
+                return self._get_hydrator(bl_model_class, tuple(model._fields))(model)
+            if isinstance(model, dict):
+                return self._get_hydrator(bl_model_class, tuple(model))(tuple(model.values()))
+
         if isinstance(model, Row):
             model = self.db_model_class(**model)
 
@@ -44,31 +172,380 @@ class BaseDao(ABC, Generic[_T]):
         db_model_class = db_model_class or self.db_model_class
         return db_model_class(**model.dict())
 
+    def _cast_to_insert_row(self, model_dict: Dict, column_names: set, timestamp: datetime) -> Dict:
+        row = {key: value for key, value in model_dict.items() if key in column_names}
+
+        if row.get('id') is None:
+            row.pop('id', None)
+
+        row['created_at'] = row.get('created_at') or timestamp
+        row['updated_at'] = row.get('updated_at') or timestamp
+
+        return row
+
+    def _cast_to_insert_rows(self, models: Iterable[BaseBLModel]) -> List[Tuple[Dict, Dict]]:
+        column_names = set(self.db_model_class.get_column_names())
+        timestamp = now()
+        pairs = []
+
+        for model in models:
+            model_dict = model.dict()
+            pairs.append((model_dict, self._cast_to_insert_row(model_dict, column_names, timestamp)))
+
+        return pairs
+
+    @staticmethod
+    def _chunk_insert_rows(pairs: List[Tuple[Dict, Dict]], chunk_size: int) -> Iterator[List[Tuple[Dict, Dict]]]:
+        for _, group in groupby(pairs, key=lambda pair: tuple(pair[1])):
+            group = list(group)
+            for i in range(0, len(group), chunk_size):
+                yield group[i:i + chunk_size]
+
+    @staticmethod
+    def _dedupe_upsert_rows(rows: List[Dict], conflict_columns: List[str]) -> Tuple[List[Dict], List[int]]:
+        unique_rows = []
+        positions_by_key = {}
+        positions = []
+
+        for row in rows:
+            key = tuple(row.get(name) for name in conflict_columns)
+            if None in key:
+                key = object()
+
+            if key in positions_by_key:
+                unique_rows[positions_by_key[key]] = row
+            else:
+                positions_by_key[key] = len(unique_rows)
+                unique_rows.append(row)
+
+            positions.append(positions_by_key[key])
+
+        return unique_rows, positions
+
+    @staticmethod
+    def _format_copy_value(value: Any, processor: Callable[[Any], Any] = None) -> str:
+        if value is not None and processor is not None:
+            value = processor(value)
+
+        if value is None:
+            return '\\N'
+
+        if isinstance(value, (dict, list)):
+            value = orjson.dumps(value).decode()
+
+        return str(value).translate(_COPY_TEXT_ESCAPES)
+
+    def _is_cacheable_read(
+            self,
+            field: str,
+            filters: dict = None,
+            order_by: dict = None,
+            include_soft_deleted: bool = False,
+            exclude_columns: List[str] = None,
+            bl_model_class: Type[BaseBLModel] = None,
+    ) -> bool:
+        return self.identity_cache is not None \
+            and self.identity_cache.has_field(field) \
+            and not filters \
+            and not order_by \
+            and not include_soft_deleted \
+            and not exclude_columns \
+            and bl_model_class in (None, self.bl_model_class)
+
+    def _is_cached_existence(self, filters: dict, include_soft_deleted: bool = False) -> bool:
+        if len(filters) != 1 or include_soft_deleted:
+            return False
+
+        (field, value), = filters.items()
+        if not self._is_cacheable_read(field) or isinstance(value, (list, tuple, set, frozenset)):
+            return False
+
+        if field == 'id':
+            return self.identity_cache.contains(value)
+
+        return self.identity_cache.get_by_field(field, value, self.bl_model_class) is not None
+
+    @staticmethod
+    def _invalidate_now_and_after_commit(db_session: Session, invalidate: Callable[[], None]) -> None:
+        invalidate()
+        db_session.info.setdefault(_PENDING_INVALIDATIONS_KEY, []).append(invalidate)
+
+        if not event.contains(db_session, 'after_commit', _run_pending_invalidations):
+            event.listen(db_session, 'after_commit', _run_pending_invalidations)
+            event.listen(db_session, 'after_rollback', _discard_pending_invalidations)
+
+    def _invalidate_cache(self, db_session: Session, *resource_ids: int) -> None:
+        if self.identity_cache is not None:
+            self._invalidate_now_and_after_commit(db_session, lambda: self.identity_cache.invalidate(*resource_ids))
+
+    def _clear_cache(self, db_session: Session) -> None:
+        if self.identity_cache is not None:
+            self._invalidate_now_and_after_commit(db_session, self.identity_cache.clear)
+
+    @staticmethod
+    def _parse_include(include: Iterable[str]) -> Dict[str, Dict]:
+        tree = {}
+        for path in include:
+            node = tree
+            for key in path.split('.'):
+                node = node.setdefault(key, {})
+        return tree
+
+    def _create_loader_options(
+            self,
+            db_model_class: Type[BaseDBModel],
+            include_tree: Dict[str, Dict],
+            parent: Load = None
+    ) -> List[Load]:
+        relationships = db_model_class.get_relationships()
+        parent = parent or Load(db_model_class)
+        options = []
+
+        for key, subtree in include_tree.items():
+            if key not in relationships:
+                raise ValueError(f'{db_model_class.__name__} has no relationship named {key}')
+
+            relationship = relationships[key]
+            attr = getattr(db_model_class, key)
+            option = parent.selectinload(attr) if relationship.uselist else parent.joinedload(attr)
+
+            options.append(option)
+            options.extend(self._create_loader_options(relationship.mapper.class_, subtree, option))
+
+        return options
+
+    def _cast_to_nested_dict(
+            self,
+            db_model: BaseDBModel,
+            include_tree: Dict[str, Dict],
+            column_names: Iterable[str] = None
+    ) -> Dict:
+        obj = {name: getattr(db_model, name) for name in column_names or db_model.get_column_names()}
+
+        for key, subtree in include_tree.items():
+            value = getattr(db_model, key)
+            if isinstance(value, list):
+                obj[key] = [self._cast_to_nested_dict(item, subtree) for item in value]
+            else:
+                obj[key] = None if value is None else self._cast_to_nested_dict(value, subtree)
+
+        return obj
+
+    def _cast_to_bl_model_with_includes(
+            self,
+            db_model: BaseDBModel,
+            include_tree: Dict[str, Dict],
+            exclude_columns: List[str] = None,
+            bl_model_class: Type[BaseBLModel] = None,
+            fields: List[str] = None
+    ) -> _T:
+        bl_model_class = bl_model_class or self.bl_model_class
+        column_names = [attr.key for attr in self._get_projected_attributes(fields=fields)] if fields else None
+        obj = self._cast_to_nested_dict(db_model, include_tree, column_names)
+
+        for key in exclude_columns or []:
+            obj.pop(getattr(key, 'key', key), None)
+
+        if fields:
+            return self._cast_to_partial_bl_model(obj, bl_model_class)
+
+        return bl_model_class(**obj)
+
+    def _cast_to_partial_bl_model(self, obj: Dict, bl_model_class: Type[BaseBLModel] = None) -> _T:
+        bl_model_class = bl_model_class or self.bl_model_class
+
+        if self.trusted_hydration:
+            return self._get_hydrator(bl_model_class, tuple(obj))(tuple(obj.values()))
+
+        values, fields_set, errors = validate_model(bl_model_class, obj)
+        if errors is not None and any(error['loc'][0] in obj for error in errors.errors()):
+            raise errors
+
+        return bl_model_class.construct(fields_set, **values)
+
+    def _record_query_shape(self, filters: dict, order_by: dict, started_at: float) -> None:
+        if self.query_recorder is not None and self.query_recorder.should_record():
+            shape = create_query_shape(self.db_model_class.__tablename__, filters, order_by)
+            self.query_recorder.record(shape, time.perf_counter() - started_at)
+
     def _create_session(self):
         return Session(self.engine)
 
-    def _create_select_query(self, *, exclude_columns: List[str | InstrumentedAttribute] = None) -> select:
+    @contextmanager
+    def _translate_integrity_errors(self, db_session: Session) -> Iterator[None]:
+        try:
+            yield
+
+        except IntegrityError as e:
+            db_session.rollback()
+            if (exception := translate_integrity_error(e, self.db_model_class.metadata)) is None:
+                raise
+            raise exception from e
+
+    def _execute_write(self, db_session: Session, query, params=None):
+        mark_session_writes(db_session)
+        with self._translate_integrity_errors(db_session):
+            return db_session.execute(query, params)
+
+    def _commit(self, db_session: Session) -> None:
+        with self._translate_integrity_errors(db_session):
+            if is_unit_of_work_session(db_session):
+                db_session.flush()
+            else:
+                db_session.commit()
+
+    def _create_read_session(self, use_primary: bool = False):
+        if use_primary or self.replica_router is None:
+            return self._create_session()
+
+        return Session(self.replica_router.choose())
+
+    def _get_session(self) -> Tuple[Session, bool]:
+        if (session := get_current_session(self.engine)) is not None:
+            return session, False
+
+        return self._create_session(), True
+
+    def _get_read_session(self, use_primary: bool = False) -> Tuple[Session, bool]:
+        session = get_current_session(self.engine)
+        if session is not None and (use_primary or self.replica_router is None or has_session_writes(session)):
+            return session, False
+
+        return self._create_read_session(use_primary), True
+
+    def _get_projected_attributes(
+            self,
+            *,
+            exclude_columns: List[str | InstrumentedAttribute] = None,
+            fields: Iterable[str] = None
+    ) -> List[InstrumentedAttribute]:
         exclude_columns = set(exclude_columns or [])
-        attributes = self.db_model_class.get_instrumented_attributes(
-            filters=[
-                lambda attr: not isinstance(attr.property, RelationshipProperty),
-                lambda attr: attr not in exclude_columns and attr.key not in exclude_columns,
-            ]
-        )
-        return select(*attributes)
+        selected = {'id', *fields} if fields else None
+        return [
+            attr for attr in self.db_model_class.get_column_attributes()
+            if attr not in exclude_columns and attr.key not in exclude_columns
+            and (selected is None or attr.key in selected)
+        ]
+
+    def _create_select_query(
+            self,
+            *,
+            exclude_columns: List[str | InstrumentedAttribute] = None,
+            fields: Iterable[str] = None
+    ) -> select:
+        return select(*self._get_projected_attributes(exclude_columns=exclude_columns, fields=fields))
 
-    def _apply_filters(self, query, filters: dict):
-        for key, value, in filters.items():
-            if attr := getattr(self.db_model_class, key, None):
-                query = query.where(attr.in_(value) if isinstance(value, list) else attr == value)
+    def _adapt_to_archive(self, query):
+        return ClauseAdapter(create_archive_union(self.db_model_class)).traverse(query)
+
+    def _get_filter_attribute(self, key: str) -> InstrumentedAttribute:
+        field, _ = split_filter_key(key)
+        self._assert_model_has_column(field)
+        return getattr(self.db_model_class, field)
+
+    def _coerce_filter_value(self, key: str, value: Any) -> Any:
+        partitioning = self.db_model_class.__partitioning__
+        if partitioning is None or split_filter_key(key)[0] != partitioning.column:
+            return value
+
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return [coerce_partition_value(item) for item in value]
+
+        return coerce_partition_value(value)
+
+    def _apply_filters(self, query, filters: dict, *, bind_values: bool = True, unique_params: bool = False):
+        for key, value in filters.items():
+            attr = self._get_filter_attribute(key)
+            value = self._coerce_filter_value(key, value)
+            query = query.where(create_filter_clause(attr, key, value, bind_value=bind_values, unique=unique_params))
         return query
 
+    def _apply_bound_filters(self, query, filters: dict):
+        return self._apply_filters(query, filters, bind_values=False)
+
+    def _get_bound_filter_params(self, filters: dict) -> dict:
+        return {
+            f'filter_{key}': get_filter_param(key, self._coerce_filter_value(key, value))
+            for key, value in filters.items()
+            if has_filter_param(key, value)
+        }
+
+    def _is_nullable_column(self, key: str) -> bool:
+        return self._model_has_column(key) and self.db_model_class.get_column(key).nullable
+
     def _apply_ordering(self, query, ordering: dict):
         for key, value in ordering.items():
             if attr := getattr(self.db_model_class, key, None):
-                query = query.order_by(attr.desc() if value == 'desc' else attr.asc())
+                clause = attr.desc() if value == 'desc' else attr.asc()
+                if self._is_nullable_column(key):
+                    clause = clause.nulls_first() if value == 'desc' else clause.nulls_last()
+                query = query.order_by(clause)
         return query
 
+    def get_keyset_ordering(self, ordering: dict = None) -> dict:
+        keyset_ordering = {}
+
+        for key, value in (ordering or {'id': 'asc'}).items():
+            if self._model_has_column(key):
+                keyset_ordering[key] = 'desc' if value == 'desc' else 'asc'
+
+        if 'id' not in keyset_ordering:
+            keyset_ordering['id'] = next(reversed(keyset_ordering.values()), 'asc')
+
+        return keyset_ordering
+
+    def _apply_keyset(self, query, ordering: dict):
+        attrs = [getattr(self.db_model_class, key) for key in ordering]
+        values = [bindparam(f'after_{key}', type_=attr.type) for key, attr in zip(ordering, attrs)]
+        directions = set(ordering.values())
+        nullable = [self._is_nullable_column(key) for key in ordering]
+
+        if len(directions) == 1 and not any(nullable):
+            lhs, rhs = tuple_(*attrs), tuple_(*values)
+            return query.where(lhs < rhs if directions.pop() == 'desc' else lhs > rhs)
+
+        clauses = []
+        for i, (attr, value, direction) in enumerate(zip(attrs, values, ordering.values())):
+            preceding = [
+                attrs[j].is_not_distinct_from(values[j]) if nullable[j] else attrs[j] == values[j]
+                for j in range(i)
+            ]
+            clauses.append(and_(*preceding, self._create_keyset_clause(attr, value, direction, nullable[i])))
+
+        return query.where(or_(*clauses))
+
+    @staticmethod
+    def _create_keyset_clause(attr: InstrumentedAttribute, value, direction: str, nullable: bool):
+        if not nullable:
+            return attr < value if direction == 'desc' else attr > value
+
+        if direction == 'desc':
+            return or_(attr < value, and_(value.is_(None), attr.is_not(None)))
+
+        return and_(value.is_not(None), or_(attr > value, attr.is_(None)))
+
+    def encode_cursor(self, model: _T, order_by: dict = None) -> str:
+        keys = list(self.get_keyset_ordering(order_by))
+        return encode_cursor(keys, [getattr(model, key, None) for key in keys])
+
+    def decode_cursor(self, cursor: str, order_by: dict = None) -> List[Any]:
+        keys = list(self.get_keyset_ordering(order_by))
+        pairs = decode_cursor(cursor)
+
+        if [key for key, _ in pairs] != keys:
+            raise ValueError(f'Pagination cursor does not match ordering {keys}')
+
+        values = []
+        for key, value in pairs:
+            try:
+                python_type = self.db_model_class.get_column(key).type.python_type
+            except NotImplementedError:
+                values.append(value)
+                continue
+            values.append(coerce_cursor_value(value, python_type))
+
+        return values
+
     def _apply_offset(self, query, offset: int):
         if offset:
             query = query.offset(offset)
@@ -86,7 +563,131 @@ class BaseDao(ABC, Generic[_T]):
         if not self._model_has_column(key):
             raise ValueError(f'Field {key} does not exist in {self.db_model_class.__name__}')
 
-    def get_all(
+    def _get_get_all_query_shape(
+            self,
+            filters: dict,
+            *,
+            offset: int = None,
+            limit: int = None,
+            order_by: dict = None,
+            exclude_columns: List[str] = None,
+            after: List[Any] = None,
+            with_total: bool = False,
+            include: List[str] = None,
+            fields: List[str] = None,
+            include_archived: bool = False,
+    ) -> tuple:
+
+        return (
+            frozenset(getattr(key, 'key', key) for key in exclude_columns or []),
+            tuple((key, get_filter_shape(key, value)) for key, value in filters.items()),
+            tuple(order_by.items()),
+            bool(offset),
+            bool(limit),
+            after is not None,
+            with_total,
+            tuple(include or ()),
+            tuple(fields or ()),
+            include_archived,
+        )
+
+    def _build_get_all_query(
+            self,
+            filters: dict,
+            *,
+            offset: int = None,
+            limit: int = None,
+            order_by: dict = None,
+            exclude_columns: List[str] = None,
+            after: List[Any] = None,
+            with_total: bool = False,
+            include: List[str] = None,
+            fields: List[str] = None,
+            include_archived: bool = False,
+    ) -> select:
+
+        if include and include_archived:
+            raise ValueError('Archived rows cannot be read with include')
+
+        if include:
+            loader_options = self._create_loader_options(self.db_model_class, self._parse_include(include))
+            query = select(self.db_model_class).options(*loader_options)
+            if fields:
+                query = query.options(Load(self.db_model_class).load_only(
+                    *self._get_projected_attributes(fields=[*fields, *order_by])
+                ))
+        else:
+            fields = [*fields, *order_by] if fields else None
+            query = self._create_select_query(exclude_columns=exclude_columns, fields=fields)
+
+        if with_total:
+            query = query.add_columns(func.count().over().label(_TOTAL_COUNT_LABEL))
+        query = self._apply_bound_filters(query, filters)
+        if after is not None:
+            query = self._apply_keyset(query, order_by)
+        if offset:
+            query = query.offset(bindparam('offset', type_=Integer))
+        if limit:
+            query = query.limit(bindparam('limit', type_=Integer))
+        query = self._apply_ordering(query, order_by)
+        if include_archived:
+            query = self._adapt_to_archive(query)
+
+        return query
+
+    def _create_get_all_query(
+            self,
+            filters: dict,
+            *,
+            offset: int = None,
+            limit: int = None,
+            order_by: dict = None,
+            include_soft_deleted: bool = False,
+            exclude_columns: List[str] = None,
+            after: List[Any] = None,
+            with_total: bool = False,
+            include: List[str] = None,
+            fields: List[str] = None,
+            include_archived: bool = False,
+    ) -> Tuple[select, dict]:
+
+        if not include_soft_deleted:
+            filters['deleted_at'] = None
+
+        kwargs = {
+            'offset': offset,
+            'limit': limit,
+            'order_by': order_by,
+            'exclude_columns': exclude_columns,
+            'after': after,
+            'with_total': with_total,
+            'include': include,
+            'fields': fields,
+            'include_archived': include_archived,
+        }
+
+        shape = self._get_get_all_query_shape(filters, **kwargs)
+        with self._query_cache_lock:
+            query = self._query_cache.get(shape)
+
+        if query is None:
+            query = self._build_get_all_query(filters, **kwargs)
+            with self._query_cache_lock:
+                self._query_cache[shape] = query
+                while len(self._query_cache) > self.query_cache_size:
+                    pop_first(self._query_cache)
+
+        params = self._get_bound_filter_params(filters)
+        if after is not None:
+            params.update({f'after_{key}': value for key, value in zip(order_by, after)})
+        if offset:
+            params['offset'] = offset
+        if limit:
+            params['limit'] = limit
+
+        return query, params
+
+    def _get_all(
             self,
             filters: dict = None,
             db_session: Session = None,
@@ -98,33 +699,182 @@ class BaseDao(ABC, Generic[_T]):
             include_soft_deleted: bool = False,
             exclude_columns: List[str] = None,
             bl_model_class: Type[BaseBLModel] = None,
-    ) -> List[_T]:
+            after: str = None,
+            with_total: bool = False,
+            include: List[str] = None,
+            fields: List[str] = None,
+            use_primary: bool = False,
+            include_archived: bool = False,
+    ) -> Tuple[List[_T], Optional[int]]:
 
         bl_model_class = bl_model_class or self.bl_model_class
         filters = filters or {}
         order_by = order_by or {'id': 'asc'}
 
+        if after is not None:
+            order_by = self.get_keyset_ordering(order_by)
+            after = self.decode_cursor(after, order_by)
+
         if db_session is None:
-            db_session = self._create_session()
-            close_db_session = True
+            db_session, close_db_session = self._get_read_session(use_primary)
 
-        if not include_soft_deleted:
-            filters['deleted_at'] = None
+        query, params = self._create_get_all_query(
+            filters,
+            offset=offset,
+            limit=limit,
+            order_by=order_by,
+            include_soft_deleted=include_soft_deleted,
+            exclude_columns=exclude_columns,
+            after=after,
+            with_total=with_total,
+            include=include,
+            fields=fields,
+            include_archived=include_archived,
+        )
 
-        query = self._create_select_query(exclude_columns=exclude_columns)
-        query = self._apply_filters(query, filters or {})
-        query = self._apply_offset(query, offset)
-        query = self._apply_limit(query, limit)
-        query = self._apply_ordering(query, order_by)
+        started_at = time.perf_counter()
+        cursor_result = db_session.execute(query, params)
+        rows = cursor_result.all()
+        self._record_query_shape(filters, order_by, started_at)
 
-        cursor_result = db_session.execute(query)
-        results = [self._cast_to_bl_model(row, bl_model_class) for row in cursor_result]
+        if include:
+            include_tree = self._parse_include(include)
+            results = [
+                self._cast_to_bl_model_with_includes(row[0], include_tree, exclude_columns, bl_model_class, fields)
+                for row in rows
+            ]
+        elif fields and self.trusted_hydration:
+            hydrate = self._get_hydrator(bl_model_class, tuple(cursor_result.keys()))
+            results = [hydrate(row) for row in rows]
+        elif fields:
+            results = [self._cast_to_partial_bl_model(dict(row._mapping), bl_model_class) for row in rows]
+        else:
+            results = self._cast_rows_to_bl_models(rows, cursor_result.keys(), bl_model_class)
+
+        total = rows[0]._mapping[_TOTAL_COUNT_LABEL] if with_total and rows else None
 
         if close_db_session:
             db_session.close()
 
+        return results, total
+
+    def get_all(
+            self,
+            filters: dict = None,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            offset: int = None,
+            limit: int = None,
+            order_by: dict = None,
+            include_soft_deleted: bool = False,
+            exclude_columns: List[str] = None,
+            bl_model_class: Type[BaseBLModel] = None,
+            after: str = None,
+            include: List[str] = None,
+            fields: List[str] = None,
+            use_primary: bool = False,
+            include_archived: bool = False,
+    ) -> List[_T]:
+
+        results, _ = self._get_all(
+            filters,
+            db_session,
+            close_db_session,
+            offset=offset,
+            limit=limit,
+            order_by=order_by,
+            include_soft_deleted=include_soft_deleted,
+            exclude_columns=exclude_columns,
+            bl_model_class=bl_model_class,
+            after=after,
+            include=include,
+            fields=fields,
+            use_primary=use_primary,
+            include_archived=include_archived,
+        )
+
         return results
 
+    def get_all_with_total(
+            self,
+            filters: dict = None,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            offset: int = None,
+            limit: int = None,
+            order_by: dict = None,
+            include_soft_deleted: bool = False,
+            exclude_columns: List[str] = None,
+            bl_model_class: Type[BaseBLModel] = None,
+            include: List[str] = None,
+            fields: List[str] = None,
+            use_primary: bool = False,
+            include_archived: bool = False,
+    ) -> Tuple[List[_T], Optional[int]]:
+
+        return self._get_all(
+            filters,
+            db_session,
+            close_db_session,
+            offset=offset,
+            limit=limit,
+            order_by=order_by,
+            include_soft_deleted=include_soft_deleted,
+            exclude_columns=exclude_columns,
+            bl_model_class=bl_model_class,
+            with_total=True,
+            include=include,
+            fields=fields,
+            use_primary=use_primary,
+            include_archived=include_archived,
+        )
+
+    def iter_all(
+            self,
+            filters: dict = None,
+            order_by: dict = None,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            batch_size: int = 1000,
+            batches: bool = False,
+            include_soft_deleted: bool = False,
+            exclude_columns: List[str] = None,
+            bl_model_class: Type[BaseBLModel] = None,
+            use_primary: bool = False,
+    ) -> Iterator[_T] | Iterator[List[_T]]:
+
+        bl_model_class = bl_model_class or self.bl_model_class
+        filters = filters or {}
+        order_by = order_by or {'id': 'asc'}
+
+        if db_session is None:
+            db_session, close_db_session = self._get_read_session(use_primary)
+
+        query, params = self._create_get_all_query(
+            filters,
+            order_by=order_by,
+            include_soft_deleted=include_soft_deleted,
+            exclude_columns=exclude_columns,
+        )
+        query = query.execution_options(stream_results=True, max_row_buffer=batch_size)
+
+        try:
+            cursor_result = db_session.execute(query, params)
+            keys = cursor_result.keys()
+            for partition in cursor_result.partitions(batch_size):
+                models = self._cast_rows_to_bl_models(partition, keys, bl_model_class)
+                if batches:
+                    yield models
+                else:
+                    yield from models
+
+        finally:
+            if close_db_session:
+                db_session.close()
+
     def get_all_by_field(
             self,
             field: str,
@@ -139,6 +889,9 @@ class BaseDao(ABC, Generic[_T]):
             include_soft_deleted: bool = False,
             exclude_columns: List[str] = None,
             bl_model_class: Type[BaseBLModel] = None,
+            include: List[str] = None,
+            fields: List[str] = None,
+            use_primary: bool = False,
     ) -> List[_T]:
 
         self._assert_model_has_column(field)
@@ -156,6 +909,9 @@ class BaseDao(ABC, Generic[_T]):
             include_soft_deleted=include_soft_deleted,
             exclude_columns=exclude_columns,
             bl_model_class=bl_model_class,
+            include=include,
+            fields=fields,
+            use_primary=use_primary,
         )
 
     def get_one_by_field(
@@ -170,8 +926,24 @@ class BaseDao(ABC, Generic[_T]):
             include_soft_deleted: bool = False,
             exclude_columns: List[str] = None,
             bl_model_class: Type[BaseBLModel] = None,
+            include: List[str] = None,
+            fields: List[str] = None,
+            use_primary: bool = False,
     ) -> Optional[_T]:
 
+        cacheable = not include and not fields and self._is_cacheable_read(
+            field, filters, order_by, include_soft_deleted, exclude_columns, bl_model_class
+        )
+
+        if cacheable:
+            result = self.identity_cache.get_by_field(field, value, self.bl_model_class)
+
+            if result is not None:
+                if close_db_session and db_session is not None:
+                    db_session.close()
+
+                return result
+
         results = self.get_all_by_field(
             field,
             value,
@@ -184,34 +956,246 @@ class BaseDao(ABC, Generic[_T]):
             include_soft_deleted=include_soft_deleted,
             exclude_columns=exclude_columns,
             bl_model_class=bl_model_class,
+            include=include,
+            fields=fields,
+            use_primary=use_primary,
+        )
+
+        result = next(iter(results), None)
+
+        if cacheable:
+            self.identity_cache.put(result)
+
+        return result
+
+    def get_by_id(
+            self,
+            resource_id: int,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            filters: dict = None,
+            *,
+            include_soft_deleted: bool = False,
+            exclude_columns: List[str] = None,
+            bl_model_class: Type[BaseBLModel] = None,
+            include: List[str] = None,
+            fields: List[str] = None,
+            use_primary: bool = False,
+    ) -> Optional[_T]:
+
+        return self.get_one_by_field(
+            'id',
+            resource_id,
+            db_session=db_session,
+            close_db_session=close_db_session,
+            filters=filters,
+            include_soft_deleted=include_soft_deleted,
+            exclude_columns=exclude_columns,
+            bl_model_class=bl_model_class,
+            include=include,
+            fields=fields,
+            use_primary=use_primary,
         )
 
-        return next(iter(results), None)
+    def get_by_ids(
+            self,
+            resource_ids: Iterable[int],
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            include_soft_deleted: bool = False,
+            exclude_columns: List[str] = None,
+            bl_model_class: Type[BaseBLModel] = None,
+            include: List[str] = None,
+            fields: List[str] = None,
+            use_primary: bool = False,
+    ) -> List[Optional[_T]]:
+
+        resource_ids = list(resource_ids)
+        unique_ids = list(dict.fromkeys(resource_ids))
+
+        if not unique_ids:
+            if close_db_session and db_session is not None:
+                db_session.close()
+
+            return []
+
+        results = self.get_all(
+            filters={'id': unique_ids},
+            db_session=db_session,
+            close_db_session=close_db_session,
+            include_soft_deleted=include_soft_deleted,
+            exclude_columns=exclude_columns,
+            bl_model_class=bl_model_class,
+            include=include,
+            fields=fields,
+            use_primary=use_primary,
+        )
+        results_by_id = {result.id: result for result in results}
+
+        return [results_by_id.get(resource_id) for resource_id in resource_ids]
+
+    def create(
+            self,
+            model: _T,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            commit: bool = True
+    ) -> _T:
+
+        if db_session is None:
+            db_session, close_db_session = self._get_session()
+
+        db_model = self._cast_to_db_model(model)
+        db_session.add(db_model)
+
+        if commit:
+            self._commit(db_session)
+
+        result = self._cast_to_bl_model(db_model)
+        self._invalidate_cache(db_session, result.id)
+
+        if close_db_session:
+            db_session.close()
+
+        return result
+
+    def create_many(
+            self,
+            models: Iterable[_T],
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            commit: bool = True,
+            bulk: bool = False,
+            use_copy: bool = False,
+            chunk_size: int = 1000
+    ) -> List[_T]:
+
+        if use_copy:
+            return self.copy_create_many(models, db_session, close_db_session, commit=commit)
+
+        if bulk:
+            return self.bulk_create_many(models, db_session, close_db_session, commit=commit, chunk_size=chunk_size)
+
+        if db_session is None:
+            db_session, close_db_session = self._get_session()
+
+        db_models = [self._cast_to_db_model(model) for model in models]
+        db_session.add_all(db_models)
+
+        if commit:
+            self._commit(db_session)
+
+        results = [self._cast_to_bl_model(db_model) for db_model in db_models]
+        self._invalidate_cache(db_session, *[result.id for result in results])
+
+        if close_db_session:
+            db_session.close()
+
+        return results
+
+    def bulk_create_many(
+            self,
+            models: Iterable[_T],
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            commit: bool = True,
+            chunk_size: int = 1000
+    ) -> List[_T]:
+
+        if db_session is None:
+            db_session, close_db_session = self._get_session()
+
+        if not db_session.get_bind().dialect.full_returning:
+            return self.create_many(models, db_session, close_db_session, commit=commit)
+
+        executemany = db_session.get_bind().dialect.insert_executemany_returning
+        table = self.db_model_class.__table__
+        pairs = self._cast_to_insert_rows(models)
+        results = []
+
+        for chunk in self._chunk_insert_rows(pairs, chunk_size):
+            rows = [row for _, row in chunk]
+            query = insert(table).returning(table.c.id, table.c.created_at, table.c.updated_at)
+
+            if executemany:
+                cursor_result = self._execute_write(db_session, query, rows)
+            else:
+                cursor_result = self._execute_write(db_session, query.values(rows))
+
+            for (model_dict, row), returned in zip(chunk, cursor_result):
+                results.append(self._cast_to_bl_model({**model_dict, **row, **returned._mapping}))
+
+        self._invalidate_cache(db_session, *[result.id for result in results])
+
+        if commit:
+            self._commit(db_session)
+
+        if close_db_session:
+            db_session.close()
 
-    def get_by_id(
+        return results
+
+    def copy_create_many(
             self,
-            resource_id: int,
+            models: Iterable[_T],
             db_session: Session = None,
             close_db_session: bool = False,
-            filters: dict = None,
             *,
-            include_soft_deleted: bool = False,
-            exclude_columns: List[str] = None,
-            bl_model_class: Type[BaseBLModel] = None,
-    ) -> Optional[_T]:
+            commit: bool = True
+    ) -> List[_T]:
 
-        return self.get_one_by_field(
-            'id',
-            resource_id,
-            db_session=db_session,
-            close_db_session=close_db_session,
-            filters=filters,
-            include_soft_deleted=include_soft_deleted,
-            exclude_columns=exclude_columns,
-            bl_model_class=bl_model_class,
+        if db_session is None:
+            db_session, close_db_session = self._get_session()
+
+        dialect = db_session.get_bind().dialect
+        if dialect.name != 'postgresql' or dialect.driver != 'psycopg2':
+            raise ValueError(f'COPY is not supported by the {dialect.name}+{dialect.driver} dialect')
+
+        table = self.db_model_class.__table__
+        pairs = self._cast_to_insert_rows(models)
+        rows_missing_id = [row for _, row in pairs if 'id' not in row]
+
+        if rows_missing_id:
+            sequence = func.pg_get_serial_sequence(table.fullname, table.c.id.name)
+            query = select(func.nextval(sequence)).select_from(func.generate_series(1, len(rows_missing_id)))
+            for row, resource_id in zip(rows_missing_id, db_session.execute(query).scalars()):
+                row['id'] = resource_id
+
+        column_names = [column.name for column in table.columns]
+        processors = [column.type.dialect_impl(dialect).bind_processor(dialect) for column in table.columns]
+        buffer = io.StringIO()
+        for _, row in pairs:
+            buffer.write('\t'.join(
+                self._format_copy_value(row.get(name), processor) for name, processor in zip(column_names, processors)
+            ) + '\n')
+        buffer.seek(0)
+
+        preparer = dialect.identifier_preparer
+        statement = 'COPY {} ({}) FROM STDIN'.format(
+            preparer.format_table(table),
+            ', '.join(preparer.quote(name) for name in column_names)
         )
 
-    def create(
+        mark_session_writes(db_session)
+        with db_session.connection().connection.cursor() as cursor:
+            cursor.copy_expert(statement, buffer)
+
+        results = [self._cast_to_bl_model({**model_dict, **row}) for model_dict, row in pairs]
+        self._invalidate_cache(db_session, *[result.id for result in results])
+
+        if commit:
+            self._commit(db_session)
+
+        if close_db_session:
+            db_session.close()
+
+        return results
+
+    def update(
             self,
             model: _T,
             db_session: Session = None,
@@ -221,14 +1205,14 @@ class BaseDao(ABC, Generic[_T]):
     ) -> _T:
 
         if db_session is None:
-            db_session = self._create_session()
-            close_db_session = True
+            db_session, close_db_session = self._get_session()
 
         db_model = self._cast_to_db_model(model)
-        db_session.add(db_model)
+        db_session.merge(db_model)
+        self._invalidate_cache(db_session, model.id)
 
         if commit:
-            db_session.commit()
+            self._commit(db_session)
 
         result = self._cast_to_bl_model(db_model)
 
@@ -237,57 +1221,176 @@ class BaseDao(ABC, Generic[_T]):
 
         return result
 
-    def create_many(
+    def patch(
             self,
-            models: Iterable[_T],
+            resource_id: int,
+            changes: Dict[str, Any] | BaseBLModel,
             db_session: Session = None,
             close_db_session: bool = False,
             *,
             commit: bool = True
-    ) -> List[_T]:
+    ) -> Optional[_T]:
+
+        if isinstance(changes, BaseBLModel):
+            changes = changes.get_changes()
+
+        changes = {key: value for key, value in changes.items() if key not in _SERVER_MANAGED_COLUMNS}
+        for key in changes:
+            self._assert_model_has_column(key)
+
+        if not changes:
+            return self.get_by_id(resource_id, db_session, close_db_session, use_primary=True)
 
         if db_session is None:
-            db_session = self._create_session()
-            close_db_session = True
+            db_session, close_db_session = self._get_session()
 
-        db_models = [self._cast_to_db_model(model) for model in models]
-        db_session.add_all(db_models)
+        table = self.db_model_class.__table__
+        query = update(table) \
+            .where(table.c.id == resource_id, table.c.deleted_at.is_(None)) \
+            .values({**changes, 'updated_at': now()})
+
+        if db_session.get_bind().dialect.full_returning:
+            row = self._execute_write(db_session, query.returning(*table.columns)).first()
+        else:
+            cursor_result = self._execute_write(db_session, query)
+            row = db_session.execute(select(*table.columns).where(table.c.id == resource_id)).first() \
+                if cursor_result.rowcount else None
+
+        self._invalidate_cache(db_session, resource_id)
 
         if commit:
-            db_session.commit()
+            self._commit(db_session)
 
-        results = [self._cast_to_bl_model(db_model) for db_model in db_models]
+        result = self._cast_to_bl_model(row) if row is not None else None
 
         if close_db_session:
             db_session.close()
 
-        return results
+        return result
 
-    def update(
+    def upsert_many(
             self,
-            model: _T,
+            models: Iterable[_T],
             db_session: Session = None,
             close_db_session: bool = False,
             *,
-            commit: bool = True
-    ) -> _T:
+            conflict_columns: List[str] = None,
+            update_columns: List[str] = None,
+            commit: bool = True,
+            chunk_size: int = 1000
+    ) -> List[_T]:
+
+        conflict_columns = conflict_columns or [column.name for column in self.db_model_class.__table__.primary_key]
+        for key in [*conflict_columns, *(update_columns or [])]:
+            self._assert_model_has_column(key)
 
         if db_session is None:
-            db_session = self._create_session()
-            close_db_session = True
+            db_session, close_db_session = self._get_session()
+
+        dialect = db_session.get_bind().dialect
+        if dialect.name != 'postgresql':
+            raise ValueError(f'Upsert is not supported by the {dialect.name} dialect')
+
+        table = self.db_model_class.__table__
+        timestamp = now()
+        pairs = self._cast_to_insert_rows(models)
+        results = []
+
+        for chunk in self._chunk_insert_rows(pairs, chunk_size):
+            rows, positions = self._dedupe_upsert_rows([row for _, row in chunk], conflict_columns)
+            query = postgresql.insert(table).values(rows)
+            columns = update_columns or [
+                key for key in rows[0] if key not in {*conflict_columns, 'id', 'created_at', 'updated_at'}
+            ]
+            query = query.on_conflict_do_update(
+                index_elements=conflict_columns,
+                set_={**{key: query.excluded[key] for key in columns}, 'updated_at': timestamp}
+            ).returning(*table.columns)
 
-        db_model = self._cast_to_db_model(model)
-        db_session.merge(db_model)
+            returned_rows = [returned._mapping for returned in self._execute_write(db_session, query)]
+
+            for (model_dict, _), position in zip(chunk, positions):
+                results.append(self._cast_to_bl_model({**model_dict, **returned_rows[position]}))
+
+        self._invalidate_cache(db_session, *[result.id for result in results])
 
         if commit:
-            db_session.commit()
+            self._commit(db_session)
 
-        result = self._cast_to_bl_model(db_model)
+        if close_db_session:
+            db_session.close()
+
+        return results
+
+    def update_many(
+            self,
+            models: Iterable[_T],
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            commit: bool = True,
+            chunk_size: int = 1000
+    ) -> List[_T]:
+
+        models = list(models)
+        if any(model.id is None for model in models):
+            raise ValueError('All models must have an id to be updated')
+
+        if db_session is None:
+            db_session, close_db_session = self._get_session()
+
+        if db_session.get_bind().dialect.name != 'postgresql':
+            results = [self.update(model, db_session=db_session, commit=False) for model in models]
+
+            if commit:
+                self._commit(db_session)
+
+            if close_db_session:
+                db_session.close()
+
+            return results
+
+        table = self.db_model_class.__table__
+        timestamp = now()
+        column_names = [name for name in self.db_model_class.get_column_names() if name != 'created_at']
+        model_dicts = [model.dict() for model in models]
+        returned_by_id = {}
+
+        for i in range(0, len(model_dicts), chunk_size):
+            chunk = model_dicts[i:i + chunk_size]
+            source = values(
+                *[column(name, table.c[name].type) for name in column_names],
+                name='source'
+            ).data([tuple(model_dict.get(name) for name in column_names) for model_dict in chunk])
+
+            query = (
+                update(table)
+                .where(table.c.id == source.c.id)
+                .values({
+                    **{name: cast(source.c[name], table.c[name].type) for name in column_names if name != 'id'},
+                    'updated_at': timestamp
+                })
+                .returning(*table.columns)
+            )
+
+            for returned in self._execute_write(db_session, query):
+                returned_by_id[returned.id] = returned._mapping
+
+        self._invalidate_cache(db_session, *[model_dict['id'] for model_dict in model_dicts])
+
+        results = [
+            self._cast_to_bl_model({**model_dict, **returned_by_id[model_dict['id']]})
+            for model_dict in model_dicts
+            if model_dict['id'] in returned_by_id
+        ]
+
+        if commit:
+            self._commit(db_session)
 
         if close_db_session:
             db_session.close()
 
-        return result
+        return results
 
     def delete(
             self,
@@ -321,14 +1424,14 @@ class BaseDao(ABC, Generic[_T]):
     ) -> None:
 
         if db_session is None:
-            db_session = self._create_session()
-            close_db_session = True
+            db_session, close_db_session = self._get_session()
 
         db_model = self._cast_to_db_model(model)
         db_session.delete(db_model)
+        self._invalidate_cache(db_session, model.id)
 
         if commit:
-            db_session.commit()
+            self._commit(db_session)
 
         if close_db_session:
             db_session.close()
@@ -343,8 +1446,7 @@ class BaseDao(ABC, Generic[_T]):
     ) -> None:
 
         if db_session is None:
-            db_session = self._create_session()
-            close_db_session = True
+            db_session, close_db_session = self._get_session()
 
         model.deleted_at = datetime.utcnow()
         self.update(model, db_session=db_session, close_db_session=close_db_session, commit=commit)
@@ -385,13 +1487,13 @@ class BaseDao(ABC, Generic[_T]):
         )
 
         if db_session is None:
-            db_session = self._create_session()
-            close_db_session = True
+            db_session, close_db_session = self._get_session()
 
-        db_session.execute(query)
+        self._execute_write(db_session, query)
+        self._invalidate_cache(db_session, resource_id)
 
         if commit:
-            db_session.commit()
+            self._commit(db_session)
 
         if close_db_session:
             db_session.close()
@@ -412,17 +1514,182 @@ class BaseDao(ABC, Generic[_T]):
         )
 
         if db_session is None:
-            db_session = self._create_session()
-            close_db_session = True
+            db_session, close_db_session = self._get_session()
 
-        db_session.execute(query)
+        self._execute_write(db_session, query)
+        self._invalidate_cache(db_session, resource_id)
 
         if commit:
-            db_session.commit()
+            self._commit(db_session)
+
+        if close_db_session:
+            db_session.close()
+
+    def _execute_by_filter(
+            self,
+            query,
+            filters: dict,
+            db_session: Session,
+            *,
+            commit: bool = True,
+            chunk_size: int = None,
+            commit_chunks: bool = False
+    ) -> int:
+
+        query = self._apply_filters(query, filters).execution_options(synchronize_session=False)
+
+        if not chunk_size:
+            affected = self._execute_write(db_session, query).rowcount
+            self._clear_cache(db_session)
+            if commit:
+                self._commit(db_session)
+            return affected
+
+        id_column = self.db_model_class.id
+        ids_query = self._apply_filters(select(id_column), filters).order_by(id_column).limit(chunk_size)
+        affected = 0
+        last_id = None
+
+        while True:
+            chunk_ids_query = ids_query if last_id is None else ids_query.where(id_column > last_id)
+            ids = db_session.execute(chunk_ids_query).scalars().all()
+            if not ids:
+                break
+
+            affected += self._execute_write(db_session, query.where(id_column.in_(ids))).rowcount
+            self._clear_cache(db_session)
+            if commit and commit_chunks:
+                self._commit(db_session)
+
+            if len(ids) < chunk_size:
+                break
+            last_id = ids[-1]
+
+        if commit and not commit_chunks:
+            self._commit(db_session)
+
+        return affected
+
+    def update_by_filter(
+            self,
+            filters: dict,
+            values: dict,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            include_soft_deleted: bool = False,
+            commit: bool = True,
+            chunk_size: int = None
+    ) -> int:
+
+        for key in values:
+            self._assert_model_has_column(key)
+
+        filters = filters or {}
+        values = {'updated_at': now(), **values}
+        owns_session = False
+
+        if db_session is None:
+            db_session, close_db_session = self._get_session()
+            owns_session = close_db_session
+
+        if not include_soft_deleted:
+            filters['deleted_at'] = None
+
+        affected = self._execute_by_filter(
+            update(self.db_model_class).values(values),
+            filters,
+            db_session,
+            commit=commit,
+            chunk_size=chunk_size,
+            commit_chunks=owns_session
+        )
+
+        if close_db_session:
+            db_session.close()
+
+        return affected
+
+    def delete_by_filter(
+            self,
+            filters: dict,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            commit: bool = True,
+            hard_delete: bool = False,
+            chunk_size: int = None
+    ) -> int:
+
+        kwargs = {
+            'filters': filters,
+            'db_session': db_session,
+            'close_db_session': close_db_session,
+            'commit': commit,
+            'chunk_size': chunk_size,
+        }
+
+        if hard_delete:
+            return self.hard_delete_by_filter(**kwargs)
+
+        return self.soft_delete_by_filter(**kwargs)
+
+    def soft_delete_by_filter(
+            self,
+            filters: dict,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            commit: bool = True,
+            chunk_size: int = None
+    ) -> int:
+
+        timestamp = now()
+
+        return self.update_by_filter(
+            filters,
+            {'deleted_at': timestamp, 'updated_at': timestamp},
+            db_session=db_session,
+            close_db_session=close_db_session,
+            commit=commit,
+            chunk_size=chunk_size
+        )
+
+    def hard_delete_by_filter(
+            self,
+            filters: dict,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            include_soft_deleted: bool = True,
+            commit: bool = True,
+            chunk_size: int = None
+    ) -> int:
+
+        filters = filters or {}
+        owns_session = False
+
+        if db_session is None:
+            db_session, close_db_session = self._get_session()
+            owns_session = close_db_session
+
+        if not include_soft_deleted:
+            filters['deleted_at'] = None
+
+        affected = self._execute_by_filter(
+            delete(self.db_model_class),
+            filters,
+            db_session,
+            commit=commit,
+            chunk_size=chunk_size,
+            commit_chunks=owns_session
+        )
 
         if close_db_session:
             db_session.close()
 
+        return affected
+
     def count_by_filter(
             self,
             filters: dict = None,
@@ -430,21 +1697,143 @@ class BaseDao(ABC, Generic[_T]):
             close_db_session: bool = False,
             *,
             include_soft_deleted: bool = False,
+            use_primary: bool = False,
+            include_archived: bool = False,
     ) -> int:
         filters = filters or {}
 
         if db_session is None:
-            db_session = self._create_session()
-            close_db_session = True
+            db_session, close_db_session = self._get_read_session(use_primary)
 
         if not include_soft_deleted:
             filters['deleted_at'] = None
 
         query = select(func.count(self.db_model_class.id))
         query = self._apply_filters(query, filters)
+        if include_archived:
+            query = self._adapt_to_archive(query)
 
+        started_at = time.perf_counter()
         cursor_result = db_session.execute(query)
         result = cursor_result.scalar()
+        self._record_query_shape(filters, None, started_at)
+
+        if close_db_session:
+            db_session.close()
+
+        return result
+
+    def aggregate(
+            self,
+            filters: dict = None,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            group_by: List[str] = None,
+            metrics: Dict[str, MetricSpec] = None,
+            time_bucket: Tuple[str, str] = None,
+            order_by: dict = None,
+            limit: int = None,
+            include_soft_deleted: bool = False,
+            use_primary: bool = False,
+    ) -> List[Dict[str, Any]]:
+
+        filters = filters or {}
+        group_by = group_by or []
+        metrics = metrics or {'count': AggregateFunction.COUNT.value}
+
+        for key in group_by:
+            self._assert_model_has_column(key)
+
+        labels = [*group_by, *metrics, *([TIME_BUCKET_LABEL] if time_bucket else [])]
+        if len(set(labels)) != len(labels):
+            raise ValueError('Aggregate group_by fields, metric names and the time bucket must be unique')
+
+        metric_columns = []
+        for name, spec in metrics.items():
+            function, key = split_metric_spec(spec)
+            if key is not None:
+                self._assert_model_has_column(key)
+            attr = getattr(self.db_model_class, key) if key is not None else None
+            metric_columns.append(create_metric_expression(function, attr).label(name))
+
+        if db_session is None:
+            db_session, close_db_session = self._get_read_session(use_primary)
+
+        group_columns = [getattr(self.db_model_class, key) for key in group_by]
+        if time_bucket:
+            bucket_key, unit = time_bucket
+            self._assert_model_has_column(bucket_key)
+            bucket = create_time_bucket_expression(
+                getattr(self.db_model_class, bucket_key),
+                unit,
+                db_session.get_bind().dialect.name
+            ).label(TIME_BUCKET_LABEL)
+            group_columns.insert(0, bucket)
+
+        if not include_soft_deleted:
+            filters['deleted_at'] = None
+
+        query = select(*group_columns, *metric_columns).select_from(self.db_model_class)
+        query = self._apply_filters(query, filters)
+        if group_columns:
+            query = query.group_by(*group_columns)
+
+        columns_by_label = {column.key: column for column in [*group_columns, *metric_columns]}
+        order_by = order_by if order_by is not None else {column.key: 'asc' for column in group_columns}
+        for key, direction in order_by.items():
+            if key not in columns_by_label:
+                raise ValueError(f'Cannot order aggregate by {key}')
+            query = query.order_by(columns_by_label[key].desc() if direction == 'desc' else columns_by_label[key].asc())
+
+        query = self._apply_limit(query, limit)
+
+        started_at = time.perf_counter()
+        results = [dict(row._mapping) for row in db_session.execute(query)]
+        self._record_query_shape(filters, None, started_at)
+
+        if close_db_session:
+            db_session.close()
+
+        return results
+
+    def estimate_count_by_filter(
+            self,
+            filters: dict = None,
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            include_soft_deleted: bool = False,
+            use_primary: bool = False,
+    ) -> int:
+        filters = filters or {}
+
+        if db_session is None:
+            db_session, close_db_session = self._get_read_session(use_primary)
+
+        dialect = db_session.get_bind().dialect
+        if dialect.name != 'postgresql':
+            return self.count_by_filter(
+                filters,
+                db_session,
+                close_db_session,
+                include_soft_deleted=include_soft_deleted,
+                use_primary=use_primary
+            )
+
+        if not include_soft_deleted:
+            filters['deleted_at'] = None
+
+        query = select(self.db_model_class.id)
+        query = self._apply_filters(query, filters)
+        compiled = query.compile(dialect=dialect, compile_kwargs={'render_postcompile': True})
+
+        params = compiled.params
+        if compiled.positional:
+            params = tuple(params[name] for name in compiled.positiontup)
+
+        plan = db_session.connection().exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', params).scalar()
+        result = int(plan[0]['Plan']['Plan Rows'])
 
         if close_db_session:
             db_session.close()
@@ -457,13 +1846,13 @@ class BaseDao(ABC, Generic[_T]):
             db_session: Session = None,
             close_db_session: bool = False,
             *,
-            include_soft_deleted: bool = False
+            include_soft_deleted: bool = False,
+            use_primary: bool = False
     ) -> bool:
         filters = filters or {}
 
         if db_session is None:
-            db_session = self._create_session()
-            close_db_session = True
+            db_session, close_db_session = self._get_read_session(use_primary)
 
         if not include_soft_deleted:
             filters['deleted_at'] = None
@@ -472,14 +1861,55 @@ class BaseDao(ABC, Generic[_T]):
         query = self._apply_filters(query, filters)
         query = select(exists(query))
 
+        started_at = time.perf_counter()
         cursor_result = db_session.execute(query)
         result = cursor_result.scalar()
+        self._record_query_shape(filters, None, started_at)
 
         if close_db_session:
             db_session.close()
 
         return result
 
+    def exists_many(
+            self,
+            filters_list: List[dict],
+            db_session: Session = None,
+            close_db_session: bool = False,
+            *,
+            include_soft_deleted: bool = False,
+            use_primary: bool = False
+    ) -> List[bool]:
+
+        results = [self._is_cached_existence(filters, include_soft_deleted) for filters in filters_list]
+        pending = [i for i, cached in enumerate(results) if not cached]
+
+        if not pending:
+            if close_db_session and db_session is not None:
+                db_session.close()
+
+            return results
+
+        if db_session is None:
+            db_session, close_db_session = self._get_read_session(use_primary)
+
+        clauses = []
+        for i in pending:
+            filters = dict(filters_list[i])
+            if not include_soft_deleted:
+                filters['deleted_at'] = None
+
+            query = self._apply_filters(select(self.db_model_class.id), filters, unique_params=True)
+            clauses.append(exists(query))
+
+        for i, result in zip(pending, db_session.execute(select(*clauses)).one()):
+            results[i] = result
+
+        if close_db_session:
+            db_session.close()
+
+        return results
+
     def exists_by_field(
             self,
             field: str,
@@ -487,13 +1917,15 @@ class BaseDao(ABC, Generic[_T]):
             db_session: Session = None,
             close_db_session: bool = False,
             *,
-            include_soft_deleted: bool = False
+            include_soft_deleted: bool = False,
+            use_primary: bool = False
     ) -> bool:
         return self.exists_by_filter(
             {field: value},
             db_session=db_session,
             close_db_session=close_db_session,
             include_soft_deleted=include_soft_deleted,
+            use_primary=use_primary,
         )
 
     def exists_by_id(
@@ -502,12 +1934,22 @@ class BaseDao(ABC, Generic[_T]):
             db_session: Session = None,
             close_db_session: bool = False,
             *,
-            include_soft_deleted: bool = False
+            include_soft_deleted: bool = False,
+            use_primary: bool = False
     ) -> bool:
+
+        if self._is_cacheable_read('id', include_soft_deleted=include_soft_deleted) \
+                and self.identity_cache.contains(resource_id):
+            if close_db_session and db_session is not None:
+                db_session.close()
+
+            return True
+
         return self.exists_by_field(
             'id',
             resource_id,
             db_session=db_session,
             close_db_session=close_db_session,
             include_soft_deleted=include_soft_deleted,
+            use_primary=use_primary,
         )
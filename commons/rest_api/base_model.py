@@ -1,11 +1,14 @@
 from datetime import datetime
-from typing import Dict, List, Optional, Callable
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Callable, FrozenSet, Any, Tuple, Mapping
 
-from pydantic import Extra, BaseModel
-from sqlalchemy import Column, Integer, DateTime
-from sqlalchemy.orm import registry as _registry, InstrumentedAttribute
+from pydantic import Extra, BaseModel, PrivateAttr
+from sqlalchemy import Column, Integer, DateTime, Table, inspect
+from sqlalchemy.orm import registry as _registry, InstrumentedAttribute, RelationshipProperty, declared_attr
 
 from commons.datetime import now
+from commons.rest_api.partitioning import TimeRangePartitioning
 
 registry = _registry()
 Base = registry.generate_base()
@@ -17,20 +20,58 @@ class BaseBLModel(BaseModel):
     updated_at: Optional[datetime]
     deleted_at: Optional[datetime]
 
+    _changed_fields: FrozenSet[str] = PrivateAttr(default_factory=frozenset)
+
     class Config:
         orm_mode = True
         extra = Extra.ignore
 
+    def __setattr__(self, name: str, value: Any):
+        if name in self.__fields__ and self.__dict__.get(name) != value:
+            self._changed_fields = self._changed_fields | {name}
+        super().__setattr__(name, value)
+
+    def get_changed_fields(self) -> FrozenSet[str]:
+        return self._changed_fields
+
+    def get_changes(self) -> Dict[str, Any]:
+        return {field: self.__dict__.get(field) for field in self._changed_fields}
+
+    def has_changes(self) -> bool:
+        return bool(self._changed_fields)
+
+    def mark_clean(self) -> None:
+        self._changed_fields = frozenset()
+
 
 class BaseDBModel(Base):
     __abstract__ = True
     __tablename__: str
+    __partitioning__: Optional[TimeRangePartitioning] = None
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     created_at = Column(DateTime(True), default=now)
     updated_at = Column(DateTime(True), default=now)
     deleted_at = Column(DateTime(True), default=None)
 
+    @classmethod
+    def __table_cls__(cls, name: str, metadata, *args, **kwargs) -> Table:
+        if cls.__partitioning__ is not None:
+            for arg in args:
+                if isinstance(arg, Column) and arg.name == cls.__partitioning__.column:
+                    arg.primary_key = True
+                    arg.nullable = False
+            kwargs.setdefault('postgresql_partition_by', cls.__partitioning__.get_partition_by())
+
+        return Table(name, metadata, *args, **kwargs)
+
+    @declared_attr
+    def __mapper_args__(cls) -> dict:
+        if cls.__partitioning__ is None:
+            return {}
+
+        return {'primary_key': [cls.__table__.c.id]}
+
     def __init__(self, **kwargs):
         now_ = now()
         self.created_at = now_
@@ -40,19 +81,36 @@ class BaseDBModel(Base):
 
     @classmethod
     def has_column(cls, column_name: str) -> bool:
-        return column_name in cls.get_column_names()
+        return column_name in cls.get_column_name_set()
 
     @classmethod
     def get_column(cls, column_name: str):
         return cls.__table__.columns.get(column_name)
 
     @classmethod
-    def get_columns(cls) -> List[Column]:
-        return [c for c in cls.get_table().columns]
+    @lru_cache(maxsize=None)
+    def get_columns(cls) -> Tuple[Column, ...]:
+        return tuple(cls.get_table().columns)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_column_names(cls) -> Tuple[str, ...]:
+        return tuple(c.name for c in cls.get_columns())
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_column_name_set(cls) -> FrozenSet[str]:
+        return frozenset(cls.get_column_names())
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_column_attributes(cls) -> Tuple[InstrumentedAttribute, ...]:
+        return tuple(prop.class_attribute for prop in inspect(cls).column_attrs)
 
     @classmethod
-    def get_column_names(cls) -> List[str]:
-        return [c.name for c in cls.get_columns()]
+    @lru_cache(maxsize=None)
+    def get_relationships(cls) -> Mapping[str, RelationshipProperty]:
+        return MappingProxyType(dict(inspect(cls).relationships.items()))
 
     @classmethod
     def get_columns_with_fks(cls) -> List[Column]:
@@ -97,7 +155,7 @@ class BaseDBModel(Base):
     @classmethod
     def clean_obj(cls, obj: Dict) -> None:
         kv = list(obj.items())
-        names = cls.get_column_names()
+        names = cls.get_column_name_set()
         for k, v in kv:
             if k not in names:
                 del obj[k]
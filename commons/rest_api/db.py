@@ -1,9 +1,15 @@
-from sqlalchemy import text
+import time
+from threading import Lock, local
+from typing import Dict, Any
+
+from sqlalchemy import text, create_engine, event, exc
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
 
-from commons.logging import log_warning
+from commons.logging import log_warning, log_info
 from commons.rest_api.base_model import Base
+from commons.rest_api.partitioning import get_partitioning, sync_partitions, assert_partitioning_supported
 
 
 def drop_public_schema(engine: Engine = None):
@@ -34,7 +40,160 @@ def sync_model_tables(engine: Engine = None, models: list = None) -> None:
     if not models:
         log_warning('No models provided. Syncing tables for all models...')
 
+    for model in models or [mapper.class_ for mapper in Base.registry.mappers]:
+        assert_partitioning_supported(engine, model)
+
     Base.metadata.create_all(
         bind=engine,
         tables=[model.__table__ for model in models] if models else None,
     )
+
+    for model in models or [mapper.class_ for mapper in Base.registry.mappers]:
+        if get_partitioning(model) is not None:
+            sync_partitions(engine, model)
+
+
+class MeteredQueuePool(QueuePool):
+    _metric_names = ('checkouts', 'checkout_timeouts', 'checkout_wait_seconds_total', 'checkout_wait_seconds_max')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_seconds_total = 0.0
+        self.checkout_wait_seconds_max = 0.0
+        self._metrics_lock = Lock()
+        self._connect_time = local()
+
+    def _record_checkout(self, wait_seconds: float, timed_out: bool = False) -> None:
+        with self._metrics_lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+
+            self.checkout_wait_seconds_total += wait_seconds
+            self.checkout_wait_seconds_max = max(self.checkout_wait_seconds_max, wait_seconds)
+
+    def _create_connection(self):
+        start = time.perf_counter()
+
+        try:
+            return super()._create_connection()
+
+        finally:
+            self._connect_time.seconds = getattr(self._connect_time, 'seconds', 0.0) + time.perf_counter() - start
+
+    def _get_wait_seconds(self, start: float) -> float:
+        return max(time.perf_counter() - start - self._connect_time.seconds, 0.0)
+
+    def _do_get(self):
+        self._connect_time.seconds = 0.0
+        start = time.perf_counter()
+
+        try:
+            record = super()._do_get()
+
+        except exc.TimeoutError:
+            self._record_checkout(self._get_wait_seconds(start), timed_out=True)
+            raise
+
+        self._record_checkout(self._get_wait_seconds(start))
+        return record
+
+    def recreate(self):
+        pool = super().recreate()
+
+        with self._metrics_lock:
+            for name in self._metric_names:
+                setattr(pool, name, getattr(self, name))
+
+        return pool
+
+
+def _set_statement_timeout(engine: Engine, statement_timeout_ms: int) -> None:
+    if engine.dialect.name != 'postgresql':
+        log_warning(f'statement_timeout is not supported by the {engine.dialect.name} dialect. Ignoring...')
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_statement_timeout(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'SET statement_timeout = {int(statement_timeout_ms)}')
+        cursor.close()
+        dbapi_connection.commit()
+
+
+def warm_up_engine(engine: Engine, connection_count: int) -> None:
+    connections = []
+
+    try:
+        for _ in range(connection_count):
+            connections.append(engine.connect())
+
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def create_tuned_engine(
+        url: str,
+        *,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_timeout: float = 30,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        statement_timeout_ms: int = None,
+        warm_up_connections: int = 0,
+        **kwargs
+) -> Engine:
+
+    engine = create_engine(
+        url,
+        poolclass=MeteredQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        **kwargs
+    )
+
+    if statement_timeout_ms is not None:
+        _set_statement_timeout(engine, statement_timeout_ms)
+
+    if warm_up_connections:
+        warm_up_engine(engine, min(warm_up_connections, pool_size))
+
+    return engine
+
+
+def get_pool_stats(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    stats = {'pool_class': type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'pool_size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+        })
+
+    if isinstance(pool, MeteredQueuePool):
+        stats.update({
+            'checkouts': pool.checkouts,
+            'checkout_timeouts': pool.checkout_timeouts,
+            'checkout_wait_ms_total': pool.checkout_wait_seconds_total * 1000,
+            'checkout_wait_ms_max': pool.checkout_wait_seconds_max * 1000,
+            'checkout_wait_ms_avg': pool.checkout_wait_seconds_total * 1000 / pool.checkouts if pool.checkouts else 0.0,
+        })
+
+    return stats
+
+
+def log_pool_stats(engine: Engine) -> None:
+    stats = ', '.join(f'{key}={value:.2f}' if isinstance(value, float) else f'{key}={value}'
+                      for key, value in get_pool_stats(engine).items())
+    log_info(f'Pool stats for {engine.url.render_as_string(hide_password=True)}: {stats}')
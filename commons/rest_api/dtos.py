@@ -15,12 +15,12 @@ class BaseDTO(BaseModel):
         extra = Extra.ignore
 
     @classmethod
-    def from_model(cls, model: _T):
-        return map_model(cls, model)
+    def from_model(cls, model: _T, fields: Iterable[str] = None):
+        return map_model(cls, model, fields)
 
     @classmethod
-    def from_models(cls, models: Iterable[BaseModel]):
-        return map_models(cls, models)
+    def from_models(cls, models: Iterable[BaseModel], fields: Iterable[str] = None):
+        return map_models(cls, models, fields)
 
     def to_model(self):
         return map_model(self.__bl_model_class__, self)
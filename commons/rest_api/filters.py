@@ -0,0 +1,166 @@
+import operator
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Tuple
+
+from sqlalchemy import bindparam
+from sqlalchemy.orm import InstrumentedAttribute
+
+_LIKE_ESCAPE = '/'
+
+
+class FilterOperator(str, Enum):
+    EQ = 'eq'
+    NE = 'ne'
+    LT = 'lt'
+    LTE = 'lte'
+    GT = 'gt'
+    GTE = 'gte'
+    IN = 'in'
+    NOT_IN = 'not_in'
+    ISNULL = 'isnull'
+    STARTSWITH = 'startswith'
+    ENDSWITH = 'endswith'
+    CONTAINS = 'contains'
+
+
+_OPERATORS = {filter_operator.value: filter_operator for filter_operator in FilterOperator}
+
+_COLLECTION_OPERATORS = {FilterOperator.IN, FilterOperator.NOT_IN}
+
+_LIST_ACCEPTING_OPERATORS = {FilterOperator.EQ, FilterOperator.NE, *_COLLECTION_OPERATORS}
+
+_NULLABLE_OPERATORS = {FilterOperator.EQ, FilterOperator.NE}
+
+_BOOLEAN_STRINGS = {'true': True, '1': True, 'false': False, '0': False}
+
+_COMPARISONS = {
+    FilterOperator.EQ: operator.eq,
+    FilterOperator.NE: operator.ne,
+    FilterOperator.LT: operator.lt,
+    FilterOperator.LTE: operator.le,
+    FilterOperator.GT: operator.gt,
+    FilterOperator.GTE: operator.ge,
+}
+
+_LIKE_PATTERNS = {
+    FilterOperator.STARTSWITH: '{}%',
+    FilterOperator.ENDSWITH: '%{}',
+    FilterOperator.CONTAINS: '%{}%',
+}
+
+
+def _escape_like(value: str) -> str:
+    return value.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2).replace('%', _LIKE_ESCAPE + '%').replace('_', _LIKE_ESCAPE + '_')
+
+
+def _is_collection(value: Any) -> bool:
+    return isinstance(value, (list, tuple, set, frozenset))
+
+
+@lru_cache(maxsize=None)
+def split_filter_key(key: str) -> Tuple[str, FilterOperator]:
+    field, separator, suffix = key.rpartition('__')
+
+    if separator and suffix in _OPERATORS:
+        return field, _OPERATORS[suffix]
+
+    return key, FilterOperator.EQ
+
+
+def parse_isnull_value(key: str, value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+
+    if isinstance(value, str) and value.strip().lower() in _BOOLEAN_STRINGS:
+        return _BOOLEAN_STRINGS[value.strip().lower()]
+
+    raise ValueError(f'Filter {key} expects a boolean value')
+
+
+def assert_valid_filter(key: str, value: Any) -> None:
+    _, filter_operator = split_filter_key(key)
+
+    if filter_operator == FilterOperator.ISNULL:
+        parse_isnull_value(key, value)
+
+    elif value is None:
+        if filter_operator not in _NULLABLE_OPERATORS:
+            raise ValueError(f'Filter {key} does not accept None')
+
+    else:
+        get_filter_param(key, value)
+
+
+def get_filter_shape(key: str, value: Any) -> Any:
+    _, filter_operator = split_filter_key(key)
+
+    if filter_operator == FilterOperator.ISNULL:
+        return parse_isnull_value(key, value)
+
+    if value is None:
+        return None
+
+    return _is_collection(value)
+
+
+def has_filter_param(key: str, value: Any) -> bool:
+    _, filter_operator = split_filter_key(key)
+    return filter_operator != FilterOperator.ISNULL and value is not None
+
+
+def get_filter_param(key: str, value: Any) -> Any:
+    _, filter_operator = split_filter_key(key)
+
+    if filter_operator in _LIKE_PATTERNS:
+        if not isinstance(value, str):
+            raise ValueError(f'Filter {key} expects a string value')
+        return _LIKE_PATTERNS[filter_operator].format(_escape_like(value))
+
+    if _is_collection(value):
+        if filter_operator not in _LIST_ACCEPTING_OPERATORS:
+            raise ValueError(f'Filter {key} does not accept a list value')
+        return list(value)
+
+    if filter_operator in _COLLECTION_OPERATORS:
+        raise ValueError(f'Filter {key} expects a list value')
+
+    return value
+
+
+def create_filter_clause(
+        attr: InstrumentedAttribute,
+        key: str,
+        value: Any,
+        *,
+        bind_value: bool = True,
+        unique: bool = False
+):
+    _, filter_operator = split_filter_key(key)
+
+    if filter_operator == FilterOperator.ISNULL:
+        return attr.is_(None) if parse_isnull_value(key, value) else attr.is_not(None)
+
+    if value is None:
+        if filter_operator == FilterOperator.EQ:
+            return attr.is_(None)
+        if filter_operator == FilterOperator.NE:
+            return attr.is_not(None)
+        raise ValueError(f'Filter {key} does not accept None')
+
+    param_value = get_filter_param(key, value)
+    expanding = _is_collection(value)
+    param = bindparam(f'filter_{key}', param_value, expanding=expanding, unique=unique) if bind_value \
+        else bindparam(f'filter_{key}', expanding=expanding)
+
+    if filter_operator in (FilterOperator.EQ, FilterOperator.IN) and expanding:
+        return attr.in_(param)
+    if filter_operator in (FilterOperator.NE, FilterOperator.NOT_IN) and expanding:
+        return attr.not_in(param)
+    if filter_operator in _LIKE_PATTERNS:
+        return attr.like(param, escape=_LIKE_ESCAPE)
+
+    return _COMPARISONS[filter_operator](attr, param)
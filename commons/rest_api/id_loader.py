@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Generic, TypeVar, Optional, Iterable, List, Dict, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from commons.rest_api.async_base_dao import AsyncBaseDao
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseBLModel
+
+_T = TypeVar('_T', bound=BaseBLModel)
+
+
+class PendingLoad(Generic[_T]):
+    def __init__(self, loader: IdLoader[_T], resource_id: int):
+        self.loader = loader
+        self.resource_id = resource_id
+
+    def result(self) -> Optional[_T]:
+        return self.loader.get(self.resource_id)
+
+
+class IdLoader(Generic[_T]):
+    def __init__(self, dao: BaseDao, db_session: Session = None, *, max_batch_size: int = 1000, **kwargs):
+        self.dao = dao
+        self.db_session = db_session
+        self.max_batch_size = max_batch_size
+        self.kwargs = kwargs
+        self._results: Dict[int, Optional[_T]] = {}
+        self._pending: Dict[int, None] = {}
+
+    def load(self, resource_id: int) -> PendingLoad[_T]:
+        if resource_id not in self._results:
+            self._pending[resource_id] = None
+
+        return PendingLoad(self, resource_id)
+
+    def get(self, resource_id: int) -> Optional[_T]:
+        self.load(resource_id)
+        self.dispatch()
+
+        return self._results[resource_id]
+
+    def load_many(self, resource_ids: Iterable[int]) -> List[Optional[_T]]:
+        resource_ids = list(resource_ids)
+
+        for resource_id in resource_ids:
+            self.load(resource_id)
+
+        self.dispatch()
+
+        return [self._results[resource_id] for resource_id in resource_ids]
+
+    def prime(self, model: _T) -> None:
+        self._results[model.id] = model
+        self._pending.pop(model.id, None)
+
+    def clear(self, *resource_ids: int) -> None:
+        for resource_id in resource_ids or list(self._results):
+            self._results.pop(resource_id, None)
+
+    def dispatch(self) -> None:
+        resource_ids = list(self._pending)
+        self._pending.clear()
+
+        for i in range(0, len(resource_ids), self.max_batch_size):
+            chunk = resource_ids[i:i + self.max_batch_size]
+            models = self.dao.get_by_ids(chunk, db_session=self.db_session, **self.kwargs)
+            self._results.update(zip(chunk, models))
+
+
+class AsyncIdLoader(Generic[_T]):
+    def __init__(
+            self,
+            dao: AsyncBaseDao,
+            db_session: AsyncSession = None,
+            *,
+            max_batch_size: int = 1000,
+            **kwargs
+    ):
+        self.dao = dao
+        self.db_session = db_session
+        self.max_batch_size = max_batch_size
+        self.kwargs = kwargs
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._pending: List[int] = []
+        self._dispatch_scheduled = False
+        self._dispatch_lock = asyncio.Lock()
+        self._dispatch_tasks: Set[asyncio.Task] = set()
+
+    def load(self, resource_id: int) -> asyncio.Future:
+        if resource_id in self._futures:
+            return self._futures[resource_id]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[resource_id] = future
+        self._pending.append(resource_id)
+
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            loop.call_soon(self._create_dispatch_task)
+
+        return future
+
+    def _create_dispatch_task(self) -> None:
+        task = asyncio.get_running_loop().create_task(self.dispatch())
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def wait_for_dispatches(self) -> None:
+        await asyncio.gather(*self._dispatch_tasks)
+
+    async def load_many(self, resource_ids: Iterable[int]) -> List[Optional[_T]]:
+        return list(await asyncio.gather(*[self.load(resource_id) for resource_id in resource_ids]))
+
+    def prime(self, model: _T) -> None:
+        if model.id not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(model)
+            self._futures[model.id] = future
+
+    def clear(self, *resource_ids: int) -> None:
+        for resource_id in resource_ids or list(self._futures):
+            if resource_id not in self._pending:
+                self._futures.pop(resource_id, None)
+
+    async def dispatch(self) -> None:
+        pending = [(resource_id, self._futures[resource_id]) for resource_id in self._pending]
+        self._pending = []
+        self._dispatch_scheduled = False
+
+        async with self._dispatch_lock:
+            for i in range(0, len(pending), self.max_batch_size):
+                chunk = pending[i:i + self.max_batch_size]
+
+                try:
+                    models = await self.dao.get_by_ids(
+                        [resource_id for resource_id, _ in chunk],
+                        db_session=self.db_session,
+                        **self.kwargs
+                    )
+
+                except Exception as e:
+                    for resource_id, future in chunk:
+                        if self._futures.get(resource_id) is future:
+                            self._futures.pop(resource_id)
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for (_, future), model in zip(chunk, models):
+                    if not future.done():
+                        future.set_result(model)
@@ -0,0 +1,101 @@
+import time
+from threading import Lock
+from typing import Iterable, Optional, Type, TypeVar, Dict, Any
+
+from commons.multi_key_index_lru_cache import MultiKeyIndexLRUCache
+from commons.rest_api.base_model import BaseBLModel
+
+_T = TypeVar('_T', bound=BaseBLModel)
+
+
+class IdentityCache:
+    def __init__(
+            self,
+            secondary_keys: Iterable[str] = None,
+            *,
+            max_object_count: int = 1000,
+            ttl_seconds: float = 60,
+    ):
+        self.secondary_keys = list(secondary_keys or [])
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._cache = MultiKeyIndexLRUCache('id', self.secondary_keys, max_object_count)
+        self._lock = Lock()
+
+    def _is_expired(self, context: dict) -> bool:
+        return context['expires_at'] <= time.monotonic()
+
+    def _cast_to_model(self, obj: dict, bl_model_class: Type[_T]) -> _T:
+        return bl_model_class.construct(**obj)
+
+    def get(self, resource_id: int, bl_model_class: Type[_T]) -> Optional[_T]:
+        with self._lock:
+            entry = self._cache.get_entry(resource_id)
+
+            if entry is not None and self._is_expired(entry.context):
+                self._cache.pop(resource_id)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return self._cast_to_model(entry.value, bl_model_class)
+
+    def contains(self, resource_id: int) -> bool:
+        with self._lock:
+            entry = self._cache.get_entry(resource_id)
+
+            if entry is None or self._is_expired(entry.context):
+                self.misses += 1
+                return False
+
+            self.hits += 1
+            return True
+
+    def get_by_field(self, field: str, value: Any, bl_model_class: Type[_T]) -> Optional[_T]:
+        if field == 'id':
+            return self.get(value, bl_model_class)
+
+        with self._lock:
+            obj = self._cache.get_first(field, value)
+
+            if obj is None:
+                self.misses += 1
+                return None
+
+        return self.get(obj['id'], bl_model_class)
+
+    def has_field(self, field: str) -> bool:
+        return field == 'id' or field in self.secondary_keys
+
+    def put(self, model: BaseBLModel) -> None:
+        if model is None or model.id is None or model.deleted_at is not None:
+            return
+
+        with self._lock:
+            self._cache.add(model.dict(), {'expires_at': time.monotonic() + self.ttl_seconds})
+
+    def invalidate(self, *resource_ids: int) -> None:
+        with self._lock:
+            for resource_id in resource_ids:
+                if resource_id is not None and self._cache.pop(resource_id) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += self._cache.object_count
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / requests if requests else 0.0,
+            'invalidations': self.invalidations,
+            'size': self._cache.object_count,
+        }
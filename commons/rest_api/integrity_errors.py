@@ -0,0 +1,123 @@
+import re
+from typing import Optional, Tuple, Dict, Any
+
+from fastapi import HTTPException
+from sqlalchemy import MetaData, Table, UniqueConstraint, PrimaryKeyConstraint, ForeignKeyConstraint
+from sqlalchemy.exc import IntegrityError
+
+from commons.rest_api.http_exceptions import ConflictException, NotFoundException
+
+UNIQUE_VIOLATION = '23505'
+FOREIGN_KEY_VIOLATION = '23503'
+
+_SQLITE_UNIQUE_PATTERN = re.compile(r'UNIQUE constraint failed: (.+)')
+_SQLITE_FOREIGN_KEY_PATTERN = re.compile(r'FOREIGN KEY constraint failed')
+_POSTGRES_DETAIL_PATTERN = re.compile(r'Key \((.+?)\)=\((.*)\)')
+_INSERT_COLUMNS_PATTERN = re.compile(r'^\s*INSERT INTO \S+ \((.+?)\) VALUES', re.IGNORECASE)
+
+
+def _get_default_constraint_name(table: Table, constraint) -> Optional[str]:
+    columns = '_'.join(column.name for column in constraint.columns)
+
+    if isinstance(constraint, PrimaryKeyConstraint):
+        return f'{table.name}_pkey'
+    if isinstance(constraint, UniqueConstraint):
+        return f'{table.name}_{columns}_key'
+    if isinstance(constraint, ForeignKeyConstraint):
+        return f'{table.name}_{columns}_fkey'
+
+
+def get_constraint_columns(metadata: MetaData, constraint_name: str) -> Optional[Tuple[str, ...]]:
+    for table in metadata.tables.values():
+        for constraint in table.constraints:
+            if constraint_name in (constraint.name, _get_default_constraint_name(table, constraint)):
+                return tuple(column.name for column in constraint.columns)
+
+        for index in table.indexes:
+            if index.unique and index.name == constraint_name:
+                return tuple(column.name for column in index.columns)
+
+
+def _get_sqlstate(error: IntegrityError) -> Optional[str]:
+    return getattr(error.orig, 'pgcode', None) or getattr(error.orig, 'sqlstate', None)
+
+
+def _get_constraint_name(error: IntegrityError) -> Optional[str]:
+    diag = getattr(error.orig, 'diag', None)
+    if diag is not None:
+        return diag.constraint_name
+
+    return getattr(error.orig.__cause__, 'constraint_name', None)
+
+
+def _get_detail(error: IntegrityError) -> str:
+    diag = getattr(error.orig, 'diag', None)
+    if diag is not None:
+        return diag.message_detail or ''
+
+    return getattr(error.orig.__cause__, 'detail', None) or ''
+
+
+def _get_violation(error: IntegrityError, metadata: MetaData) -> Tuple[Optional[str], Tuple[str, ...]]:
+    sqlstate = _get_sqlstate(error)
+    if sqlstate in (UNIQUE_VIOLATION, FOREIGN_KEY_VIOLATION):
+        constraint_name = _get_constraint_name(error)
+        columns = get_constraint_columns(metadata, constraint_name) if constraint_name else None
+        if columns is None and (match := _POSTGRES_DETAIL_PATTERN.search(_get_detail(error))):
+            columns = tuple(match.group(1).split(', '))
+        return sqlstate, columns or ()
+
+    message = str(error.orig)
+    if match := _SQLITE_UNIQUE_PATTERN.search(message):
+        return UNIQUE_VIOLATION, tuple(column.split('.')[-1] for column in match.group(1).split(', '))
+    if _SQLITE_FOREIGN_KEY_PATTERN.search(message):
+        return FOREIGN_KEY_VIOLATION, ()
+
+    return None, ()
+
+
+def _get_statement_params(error: IntegrityError) -> Dict[str, Any]:
+    if isinstance(error.params, dict):
+        return error.params
+
+    match = _INSERT_COLUMNS_PATTERN.match(error.statement or '')
+    if match and isinstance(error.params, tuple):
+        return dict(zip((column.strip().strip('"') for column in match.group(1).split(',')), error.params))
+
+    return {}
+
+
+def _get_violating_params(error: IntegrityError, columns: Tuple[str, ...]) -> Dict[str, Any]:
+    params = _get_statement_params(error)
+    if all(column in params for column in columns):
+        return {column: params[column] for column in columns}
+
+    if match := _POSTGRES_DETAIL_PATTERN.search(_get_detail(error)):
+        return dict(zip(match.group(1).split(', '), match.group(2).split(', ')))
+
+    return {column: None for column in columns}
+
+
+def _format_params(params: Dict[str, Any], quote: bool) -> str:
+    return ' and '.join(f'{key} = "{value}"' if quote else f'{key} = {value}' for key, value in params.items())
+
+
+def translate_integrity_error(error: IntegrityError, metadata: MetaData) -> Optional[HTTPException]:
+    violation, columns = _get_violation(error, metadata)
+    if violation is None:
+        return None
+
+    params = _get_violating_params(error, columns)
+    is_delete = (error.statement or '').lstrip().upper().startswith('DELETE')
+
+    if violation == UNIQUE_VIOLATION:
+        message = f'Record already exists where {_format_params(params, False)}.' if params \
+            else 'Record already exists.'
+        return ConflictException(message)
+
+    if is_delete or 'is still referenced' in _get_detail(error):
+        return ConflictException('Record is still referenced by other records.')
+
+    message = f'Could not find record where {_format_params(params, True)}.' if params \
+        else 'Could not find referenced record.'
+    return NotFoundException(message)
@@ -1,14 +1,47 @@
-from typing import Type, Iterable, TypeVar, List
+from typing import Type, Iterable, TypeVar, List, Dict, Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 _T = TypeVar('T', bound=BaseModel)
 
 
-def map_model(dest_class: Type[_T], model: BaseModel) -> _T:
-    dest_kwargs = model.dict()
-    return dest_class(**dest_kwargs)
+def _validate_fields(dest_class: Type[_T], values: Dict[str, Any]) -> Dict[str, Any]:
+    validated = {}
+    errors = []
 
+    for key, value in values.items():
+        validated[key], error = dest_class.__fields__[key].validate(value, validated, loc=key, cls=dest_class)
+        if error:
+            errors.append(error)
 
-def map_models(dest_class: Type[_T], models: Iterable[BaseModel]) -> List[_T]:
-    return [map_model(dest_class, model) for model in models]
+    if errors:
+        raise ValidationError(errors, dest_class)
+
+    return validated
+
+
+def _construct_partial(dest_class: Type[_T], values: Dict[str, Any]) -> _T:
+    model = dest_class.__new__(dest_class)
+    object.__setattr__(model, '__dict__', values)
+    object.__setattr__(model, '__fields_set__', set(values))
+    model._init_private_attributes()
+    return model
+
+
+def map_model(dest_class: Type[_T], model: BaseModel, fields: Iterable[str] = None) -> _T:
+    if fields is None:
+        dest_kwargs = model.dict()
+        return dest_class(**dest_kwargs)
+
+    dest_kwargs = {
+        key: value
+        for key, value in model.dict(include={'id', *fields}).items()
+        if key in dest_class.__fields__
+    }
+    dest_kwargs = _validate_fields(dest_class, dest_kwargs)
+    return _construct_partial(dest_class, dest_kwargs)
+
+
+def map_models(dest_class: Type[_T], models: Iterable[BaseModel], fields: Iterable[str] = None) -> List[_T]:
+    fields = list(fields) if fields is not None else None
+    return [map_model(dest_class, model, fields) for model in models]
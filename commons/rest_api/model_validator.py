@@ -1,11 +1,14 @@
 from __future__ import annotations
-from typing import Any, Optional, Callable, Type, Union
+import inspect
+from typing import Any, Optional, Callable, Type, Union, List
 
 from sqlalchemy.orm import Session
 
 from commons.logging import log_error, log_warning
 from commons.rest_api.base_model import BaseBLModel
+from commons.rest_api.async_base_dao import AsyncBaseDao
 from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.filters import assert_valid_filter
 from commons.rest_api.http_exceptions import BadRequestException, InternalServerErrorException, STATUS_CODE_TO_EXCEPTION
 
 
@@ -41,6 +44,12 @@ class InvalidValueForFieldError(ValidationError):
         super().__init__(message, status_code)
 
 
+class InvalidFilterError(ValidationError):
+    def __init__(self, key: str, reason: str, status_code: int = 400):
+        message = f"Invalid filter {key}: {reason}"
+        super().__init__(message, status_code)
+
+
 class ModelValidator:
     def __init__(self, model: Union[BaseBLModel | Type[BaseBLModel]] = None, dao: BaseDao = None, *, db_session: Session = None):
         self.model = model
@@ -48,6 +57,7 @@ class ModelValidator:
         self.db_session = db_session
         self.dao = dao
         self._validators = []
+        self._db_checks = []
 
     def _add_validator(self, validator: callable, is_custom: bool = False):
         self._validators.append({
@@ -55,6 +65,13 @@ class ModelValidator:
             'is_custom': is_custom
         })
 
+    def _add_db_check(self, filters: dict[str, Any], should_exist: bool, error: ValidationError):
+        self._db_checks.append({
+            'filters': filters,
+            'should_exist': should_exist,
+            'error': error
+        })
+
     def _build_validator_context(self):
         return {'builder': self}
 
@@ -128,6 +145,16 @@ class ModelValidator:
         self._add_validator(validator)
         return self
 
+    def assert_valid_filter(self, key: str, value: Any, *, on_fail_status_code: int = 400):
+        def validator():
+            try:
+                assert_valid_filter(key, value)
+            except ValueError as e:
+                return InvalidFilterError(key, str(e), on_fail_status_code)
+
+        self._add_validator(validator)
+        return self
+
     def assert_field_is_not_null_on_model(
             self,
             field_name: str,
@@ -159,22 +186,14 @@ class ModelValidator:
         if not self._ensure_dao_exists():
             return self
 
-        def validator():
-            if self.dao.exists_by_field(field, value):
-                return ModelAlreadyExistsError({field: value}, on_fail_status_code)
-
-        self._add_validator(validator)
+        self._add_db_check({field: value}, False, ModelAlreadyExistsError({field: value}, on_fail_status_code))
         return self
 
     def assert_models_do_not_exist_in_db_by_filter(self, params: dict[str, Any], *, on_fail_status_code: int = 409):
         if not self._ensure_dao_exists():
             return self
 
-        def validator():
-            if self.dao.exists_by_filter(params):
-                return ModelAlreadyExistsError(params, on_fail_status_code)
-
-        self._add_validator(validator)
+        self._add_db_check(params, False, ModelAlreadyExistsError(params, on_fail_status_code))
         return self
 
     def assert_models_do_not_exist_in_db_by_id(self, resource_id: int = None, *, on_fail_status_code: int = 409):
@@ -183,11 +202,8 @@ class ModelValidator:
         if not self._ensure_dao_exists():
             return self
 
-        def validator():
-            if self.dao.exists_by_id(resource_id):
-                return ModelAlreadyExistsError({'id': resource_id}, on_fail_status_code)
-
-        self._add_validator(validator)
+        error = ModelAlreadyExistsError({'id': resource_id}, on_fail_status_code)
+        self._add_db_check({'id': resource_id}, False, error)
         return self
 
     def assert_model_exists_in_db_by_field(self, field: str, value: Any = None, *, on_fail_status_code: int = 404):
@@ -196,22 +212,14 @@ class ModelValidator:
         if not self._ensure_dao_exists():
             return self
 
-        def validator():
-            if not self.dao.exists_by_field(field, value):
-                return ModelNotFoundByFilterError({field: value}, on_fail_status_code)
-
-        self._add_validator(validator)
+        self._add_db_check({field: value}, True, ModelNotFoundByFilterError({field: value}, on_fail_status_code))
         return self
 
     def assert_model_exists_in_db_by_filter(self, params: dict[str, Any], *, on_fail_status_code: int = 404):
         if not self._ensure_dao_exists():
             return self
 
-        def validator():
-            if not self.dao.exists_by_filter(params):
-                return ModelNotFoundByFilterError(params, on_fail_status_code)
-
-        self._add_validator(validator)
+        self._add_db_check(params, True, ModelNotFoundByFilterError(params, on_fail_status_code))
         return self
 
     def assert_model_exists_in_db_by_id(self, resource_id: int = None, *, on_fail_status_code: int = 404):
@@ -220,33 +228,68 @@ class ModelValidator:
         if not self._ensure_dao_exists():
             return self
 
-        def validator():
-            if not self.dao.exists_by_id(resource_id):
-                return ModelNotFoundByFilterError({'id': resource_id}, on_fail_status_code)
-
-        self._add_validator(validator)
+        error = ModelNotFoundByFilterError({'id': resource_id}, on_fail_status_code)
+        self._add_db_check({'id': resource_id}, True, error)
         return self
 
-    def validate(self):
-        error_messages = []
-        error_status_codes = set()
-
-        for validator in self._validators:
-            if validator['is_custom']:
-                ctx = self._build_validator_context()
-                error = validator['validator'](ctx)
-            else:
-                error = validator['validator']()
-
-            if error:
-                error_messages.append(error.message)
-                error_status_codes.add(error.status_code)
-
-        if error_messages:
-            message = f'Validation failed: [{", ".join(error_messages)}]'
+    def _run_validator(self, validator: dict):
+        if validator['is_custom']:
+            ctx = self._build_validator_context()
+            return validator['validator'](ctx)
+        return validator['validator']()
+
+    def _collect_db_check_errors(self, results: List[bool]) -> List[ValidationError]:
+        return [
+            check['error']
+            for check, exists in zip(self._db_checks, results)
+            if exists != check['should_exist']
+        ]
+
+    def _raise_validation_errors(self, errors: List[ValidationError]):
+        if errors:
+            message = f'Validation failed: [{", ".join(error.message for error in errors)}]'
             log_error(message)
 
+            error_status_codes = {error.status_code for error in errors}
             status_code = len(error_status_codes) == 1 and error_status_codes.pop() or 400
             exc_class = STATUS_CODE_TO_EXCEPTION.get(status_code, BadRequestException)
 
             raise exc_class(message)
+
+    def _collect_validator_errors(self) -> List[ValidationError]:
+        return [error for validator in self._validators if (error := self._run_validator(validator))]
+
+    def validate_in_memory(self):
+        self._raise_validation_errors(self._collect_validator_errors())
+
+    def validate(self):
+        errors = self._collect_validator_errors()
+
+        if not errors and self._db_checks:
+            results = self.dao.exists_many([check['filters'] for check in self._db_checks], db_session=self.db_session)
+            errors = self._collect_db_check_errors(results)
+
+        self._raise_validation_errors(errors)
+
+
+class AsyncModelValidator(ModelValidator):
+    dao: AsyncBaseDao
+
+    async def validate(self):
+        errors = []
+
+        for validator in self._validators:
+            error = self._run_validator(validator)
+            if inspect.isawaitable(error):
+                error = await error
+            if error:
+                errors.append(error)
+
+        if not errors and self._db_checks:
+            results = await self.dao.exists_many(
+                [check['filters'] for check in self._db_checks],
+                db_session=self.db_session
+            )
+            errors = self._collect_db_check_errors(results)
+
+        self._raise_validation_errors(errors)
@@ -1,5 +1,9 @@
-from typing import Generic, TypeVar, Optional, Type
+import base64
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Generic, TypeVar, Optional, Type, List, Any
 
+import orjson
 from pydantic import BaseModel, validator
 from pydantic.generics import GenericModel
 
@@ -10,11 +14,25 @@ from commons.rest_api.base_model import BaseBLModel
 _T = TypeVar('_T', bound=BaseBLModel)
 
 
+class PaginationMode(str, Enum):
+    OFFSET = 'offset'
+    CURSOR = 'cursor'
+
+
+class CountStrategy(str, Enum):
+    EXACT = 'exact'
+    ESTIMATED = 'estimated'
+    NONE = 'none'
+
+
 class PaginationOptions(BaseModel):
     _max_page_size = 100
 
     page: int = 1
     size: int = 20
+    mode: PaginationMode = PaginationMode.OFFSET
+    cursor: Optional[str] = None
+    count: CountStrategy = CountStrategy.EXACT
 
     @validator('size')
     def validate_page(cls, v):
@@ -26,16 +44,51 @@ class PaginationOptions(BaseModel):
             v = cls._max_page_size
         return v
 
+    def is_cursor_mode(self) -> bool:
+        return self.mode == PaginationMode.CURSOR or self.cursor is not None
+
 
 class PaginatedResults(GenericModel, Generic[_T]):
     results: Optional[list[_T]]
     params: Optional[dict]
-    total: int = 0
+    total: Optional[int] = 0
+    has_next: Optional[bool] = None
+    next_cursor: Optional[str] = None
 
-    def map_results_to_dtos(self, dto_class: Type[_T]):
-        self.results = map_models(dto_class, self.results)
+    def map_results_to_dtos(self, dto_class: Type[_T], fields: List[str] = None):
+        self.results = map_models(dto_class, self.results, fields)
         return self
 
     @classmethod
     def empty(cls, pagination_options: PaginationOptions):
         return cls(results=[], params=pagination_options.dict(), count=0)
+
+
+def encode_cursor(keys: List[str], values: List[Any]) -> str:
+    payload = orjson.dumps([[key, value] for key, value in zip(keys, values)], default=str)
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> List[List[Any]]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        pairs = orjson.loads(payload)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid pagination cursor: {cursor}') from e
+
+    if not isinstance(pairs, list) or not all(isinstance(pair, list) and len(pair) == 2 for pair in pairs):
+        raise ValueError(f'Invalid pagination cursor: {cursor}')
+
+    return pairs
+
+
+def coerce_cursor_value(value: Any, python_type: type) -> Any:
+    if value is None or isinstance(value, python_type):
+        return value
+
+    try:
+        if python_type in (datetime, date, time):
+            return python_type.fromisoformat(value)
+        return python_type(value)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid pagination cursor value: {value}') from e
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Optional, List, Tuple, Any, Iterable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine, Connection
+
+from commons.datetime import now, parse_iso
+from commons.logging import log_info, log_error
+from commons.threads import run_in_separate_thread, ThreadWrapper
+
+_PARTITION_SUFFIX_FORMAT = '%Y%m%d'
+
+
+class PartitionInterval(str, Enum):
+    DAY = 'day'
+    WEEK = 'week'
+    MONTH = 'month'
+    YEAR = 'year'
+
+
+@dataclass(frozen=True)
+class TimeRangePartitioning:
+    column: str = 'created_at'
+    interval: PartitionInterval = PartitionInterval.MONTH
+    premake: int = 2
+    retention: Optional[int] = None
+    drop_expired: bool = True
+
+    def get_partition_by(self) -> str:
+        return f'RANGE ({self.column})'
+
+    def floor(self, value: datetime) -> datetime:
+        value = coerce_partition_value(value).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if self.interval == PartitionInterval.WEEK:
+            return value - timedelta(days=value.weekday())
+        if self.interval == PartitionInterval.MONTH:
+            return value.replace(day=1)
+        if self.interval == PartitionInterval.YEAR:
+            return value.replace(month=1, day=1)
+
+        return value
+
+    def shift(self, start: datetime, periods: int) -> datetime:
+        if self.interval == PartitionInterval.DAY:
+            return start + timedelta(days=periods)
+        if self.interval == PartitionInterval.WEEK:
+            return start + timedelta(weeks=periods)
+        if self.interval == PartitionInterval.YEAR:
+            return start.replace(year=start.year + periods)
+
+        month_index = start.year * 12 + start.month - 1 + periods
+        return start.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+    def get_partition_name(self, table_name: str, start: datetime) -> str:
+        return f'{table_name}_p{start.strftime(_PARTITION_SUFFIX_FORMAT)}'
+
+    def get_partition_ranges(self, at: datetime = None) -> List[Tuple[datetime, datetime]]:
+        current = self.floor(at or now())
+        first = -self.retention if self.retention is not None else 0
+        return [(self.shift(current, i), self.shift(current, i + 1)) for i in range(first, self.premake + 1)]
+
+    def get_expiry(self, at: datetime = None) -> Optional[datetime]:
+        if self.retention is None:
+            return None
+        return self.shift(self.floor(at or now()), -self.retention)
+
+
+@dataclass
+class PartitionSyncResult:
+    table: str
+    created: List[str] = field(default_factory=list)
+    detached: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+
+
+def get_partitioning(db_model_class) -> Optional[TimeRangePartitioning]:
+    return getattr(db_model_class, '__partitioning__', None)
+
+
+def assert_partitioning_supported(engine: Engine, db_model_class) -> None:
+    if get_partitioning(db_model_class) is not None and engine.dialect.name != 'postgresql':
+        raise ValueError(
+            f'{db_model_class.__name__} is partitioned, which is only supported by the postgresql dialect '
+            f'(got {engine.dialect.name})'
+        )
+
+
+def coerce_partition_value(value: Any) -> Any:
+    if isinstance(value, str):
+        value = parse_iso(value)
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def get_partition_names(connection: Connection, table_name: str) -> List[str]:
+    query = text(
+        'SELECT child.relname FROM pg_inherits '
+        'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+        'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+        'WHERE parent.relname = :table_name'
+    )
+    return list(connection.execute(query, {'table_name': table_name}).scalars())
+
+
+def _parse_partition_start(table_name: str, partition_name: str) -> Optional[datetime]:
+    match = re.fullmatch(rf'{re.escape(table_name)}_p(\d{{8}})', partition_name)
+    if match is None:
+        return None
+    return datetime.strptime(match.group(1), _PARTITION_SUFFIX_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def sync_partitions(engine: Engine, db_model_class, *, at: datetime = None) -> Optional[PartitionSyncResult]:
+    partitioning = get_partitioning(db_model_class)
+    if partitioning is None:
+        return None
+
+    assert_partitioning_supported(engine, db_model_class)
+
+    table = db_model_class.__table__
+    preparer = engine.dialect.identifier_preparer
+    parent = preparer.format_table(table)
+    result = PartitionSyncResult(table.name)
+    expiry = partitioning.get_expiry(at)
+
+    with engine.begin() as connection:
+        existing = set(get_partition_names(connection, table.name))
+
+        for start, end in partitioning.get_partition_ranges(at):
+            name = partitioning.get_partition_name(table.name, start)
+            if name in existing:
+                continue
+
+            connection.execute(text(
+                f'CREATE TABLE {preparer.quote(name)} PARTITION OF {parent} '
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            ))
+            result.created.append(name)
+
+        for name in sorted(existing):
+            start = _parse_partition_start(table.name, name)
+            if expiry is None or start is None or partitioning.shift(start, 1) > expiry:
+                continue
+
+            connection.execute(text(f'ALTER TABLE {parent} DETACH PARTITION {preparer.quote(name)}'))
+            result.detached.append(name)
+
+            if partitioning.drop_expired:
+                connection.execute(text(f'DROP TABLE {preparer.quote(name)}'))
+                result.dropped.append(name)
+
+    if result.created or result.detached:
+        log_info(f'Synced partitions for {table.name}: created={result.created}, detached={result.detached}, '
+                 f'dropped={result.dropped}')
+
+    return result
+
+
+class PartitionMaintainer:
+    def __init__(self, engine: Engine, db_model_classes: Iterable, *, interval_seconds: float = 3600):
+        self.engine = engine
+        self.db_model_classes = [model for model in db_model_classes if get_partitioning(model) is not None]
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[ThreadWrapper] = None
+
+    def run(self) -> List[PartitionSyncResult]:
+        results = []
+
+        for db_model_class in self.db_model_classes:
+            try:
+                results.append(sync_partitions(self.engine, db_model_class))
+            except Exception as e:
+                log_error(f'Partition sync for {db_model_class.__tablename__} failed: {type(e).__name__}: {e}')
+
+        return results
+
+    def _run_forever(self) -> None:
+        while not self._stop_event.is_set():
+            self.run()
+            self._stop_event.wait(self.interval_seconds)
+
+    def start(self) -> ThreadWrapper:
+        self._stop_event.clear()
+        self._thread = run_in_separate_thread(self._run_forever)
+        return self._thread
+
+    def stop(self, timeout: float = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.thread.join(timeout)
+            self._thread = None
+
+
+def ensure_partitions(engine: Engine, db_model_classes: Iterable, *, interval_seconds: float = 3600) \
+        -> PartitionMaintainer:
+
+    maintainer = PartitionMaintainer(engine, db_model_classes, interval_seconds=interval_seconds)
+    maintainer.start()
+    return maintainer
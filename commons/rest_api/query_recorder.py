@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple, Type
+
+from sqlalchemy import Index
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+
+from commons.rest_api.base_model import BaseDBModel
+from commons.rest_api.filters import FilterOperator, split_filter_key
+
+_EQUALITY_OPERATORS = {FilterOperator.EQ, FilterOperator.IN}
+
+_RANGE_OPERATORS = {
+    FilterOperator.LT,
+    FilterOperator.LTE,
+    FilterOperator.GT,
+    FilterOperator.GTE,
+    FilterOperator.STARTSWITH,
+}
+
+
+class QueryShape(NamedTuple):
+    table: str
+    equality_columns: Tuple[str, ...]
+    range_columns: Tuple[str, ...]
+    order_by: Tuple[Tuple[str, str], ...]
+    excludes_soft_deleted: bool
+
+
+@dataclass
+class QueryShapeStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+@dataclass
+class IndexSuggestion:
+    table: str
+    columns: Tuple[str, ...]
+    excludes_soft_deleted: bool
+    count: int = 0
+    total_seconds: float = 0.0
+    shapes: List[QueryShape] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        suffix = '_live' if self.excludes_soft_deleted else ''
+        return f'ix_{self.table}_{"_".join(self.columns)}{suffix}'
+
+    def to_index(self, db_model_class: Type[BaseDBModel]) -> Index:
+        table = db_model_class.__table__
+
+        for index in table.indexes:
+            if index.name == self.name:
+                return index
+
+        kwargs = {}
+        if self.excludes_soft_deleted:
+            kwargs['postgresql_where'] = table.c.deleted_at.is_(None)
+            kwargs['sqlite_where'] = table.c.deleted_at.is_(None)
+
+        return Index(self.name, *[table.c[column] for column in self.columns], **kwargs)
+
+    def to_sql(self, db_model_class: Type[BaseDBModel], engine: Engine) -> str:
+        return str(CreateIndex(self.to_index(db_model_class)).compile(dialect=engine.dialect))
+
+
+def create_query_shape(table: str, filters: dict, order_by: dict = None) -> QueryShape:
+    equality_columns = set()
+    range_columns = set()
+    excludes_soft_deleted = False
+
+    for key, value in filters.items():
+        column, operator = split_filter_key(key)
+
+        if column == 'deleted_at':
+            is_null_check = (operator == FilterOperator.EQ and value is None) \
+                or (operator == FilterOperator.ISNULL and value)
+            excludes_soft_deleted = excludes_soft_deleted or is_null_check
+            if is_null_check:
+                continue
+
+        if operator in _EQUALITY_OPERATORS and value is not None:
+            equality_columns.add(column)
+        elif operator in _RANGE_OPERATORS:
+            range_columns.add(column)
+
+    return QueryShape(
+        table=table,
+        equality_columns=tuple(sorted(equality_columns)),
+        range_columns=tuple(sorted(range_columns - equality_columns)),
+        order_by=tuple((order_by or {}).items()),
+        excludes_soft_deleted=excludes_soft_deleted,
+    )
+
+
+class QueryShapeRecorder:
+    def __init__(self, *, sample_rate: float = 1.0):
+        self.sample_rate = sample_rate
+        self._stats: Dict[QueryShape, QueryShapeStats] = {}
+        self._lock = Lock()
+
+    def should_record(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def record(self, shape: QueryShape, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats.get(shape)
+            if stats is None:
+                stats = self._stats[shape] = QueryShapeStats()
+
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+
+    def get_stats(self) -> Dict[QueryShape, QueryShapeStats]:
+        with self._lock:
+            return {shape: QueryShapeStats(**vars(stats)) for shape, stats in self._stats.items()}
+
+    def top(self, n: int = 10, *, by: str = 'total_seconds') -> List[Tuple[QueryShape, QueryShapeStats]]:
+        return sorted(self.get_stats().items(), key=lambda item: getattr(item[1], by), reverse=True)[:n]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def _get_index_columns(shape: QueryShape, max_columns: int) -> Tuple[str, ...]:
+    columns = list(shape.equality_columns)
+
+    for column, _ in shape.order_by:
+        if column not in columns and column != 'id':
+            columns.append(column)
+
+    if shape.range_columns and shape.range_columns[0] not in columns:
+        columns.append(shape.range_columns[0])
+
+    return tuple(columns[:max_columns])
+
+
+def _is_covered(columns: Tuple[str, ...], existing: List[Tuple[str, ...]]) -> bool:
+    return any(index_columns[:len(columns)] == columns for index_columns in existing)
+
+
+def suggest_indexes(
+        recorder: QueryShapeRecorder,
+        db_model_class: Type[BaseDBModel] = None,
+        *,
+        min_count: int = 1,
+        max_columns: int = 4,
+) -> List[IndexSuggestion]:
+
+    table = db_model_class.__tablename__ if db_model_class else None
+    existing = [('id',)]
+    if db_model_class is not None:
+        existing += [tuple(column.name for column in index.columns) for index in db_model_class.__table__.indexes]
+
+    suggestions: Dict[Tuple[str, Tuple[str, ...], bool], IndexSuggestion] = {}
+
+    for shape, stats in recorder.get_stats().items():
+        if stats.count < min_count or (table is not None and shape.table != table):
+            continue
+
+        columns = _get_index_columns(shape, max_columns)
+        if not columns or _is_covered(columns, existing):
+            continue
+
+        key = (shape.table, columns, shape.excludes_soft_deleted)
+        suggestion = suggestions.get(key)
+        if suggestion is None:
+            suggestion = suggestions[key] = IndexSuggestion(shape.table, columns, shape.excludes_soft_deleted)
+
+        suggestion.count += stats.count
+        suggestion.total_seconds += stats.total_seconds
+        suggestion.shapes.append(shape)
+
+    merged: List[IndexSuggestion] = []
+    for suggestion in sorted(suggestions.values(), key=lambda s: len(s.columns), reverse=True):
+        wider: Optional[IndexSuggestion] = next((
+            other for other in merged
+            if other.table == suggestion.table
+            and other.excludes_soft_deleted == suggestion.excludes_soft_deleted
+            and other.columns[:len(suggestion.columns)] == suggestion.columns
+        ), None)
+
+        if wider is None:
+            merged.append(suggestion)
+            continue
+
+        wider.count += suggestion.count
+        wider.total_seconds += suggestion.total_seconds
+        wider.shapes.extend(suggestion.shapes)
+
+    return sorted(merged, key=lambda s: s.total_seconds, reverse=True)
+
+
+def apply_index_suggestions(db_model_class: Type[BaseDBModel], suggestions: List[IndexSuggestion]) -> List[Index]:
+    return [suggestion.to_index(db_model_class) for suggestion in suggestions]
+
+
+def create_suggested_indexes(
+        engine: Engine,
+        db_model_class: Type[BaseDBModel],
+        suggestions: List[IndexSuggestion]
+) -> List[Index]:
+
+    indexes = apply_index_suggestions(db_model_class, suggestions)
+    for index in indexes:
+        index.create(bind=engine, checkfirst=True)
+    return indexes
+
+
+def format_index_suggestions(
+        suggestions: List[IndexSuggestion],
+        db_model_class: Type[BaseDBModel],
+        engine: Engine
+) -> str:
+    return '\n'.join(
+        f'-- {suggestion.count} queries, {suggestion.total_seconds * 1000:.1f} ms total\n'
+        f'{suggestion.to_sql(db_model_class, engine).strip()};'
+        for suggestion in suggestions
+    )
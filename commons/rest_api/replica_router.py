@@ -0,0 +1,43 @@
+from enum import Enum
+from itertools import count
+from threading import Lock
+from typing import List, Sequence, TypeVar
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_E = TypeVar('_E', Engine, AsyncEngine)
+
+
+class ReplicaStrategy(str, Enum):
+    ROUND_ROBIN = 'round_robin'
+    LEAST_CONNECTIONS = 'least_connections'
+
+
+class ReplicaRouter:
+    def __init__(self, engines: Sequence[_E], strategy: ReplicaStrategy = ReplicaStrategy.ROUND_ROBIN):
+        if not engines:
+            raise ValueError('At least one replica engine is required')
+
+        self.engines: List[_E] = list(engines)
+        self.strategy = ReplicaStrategy(strategy)
+        self._counter = count()
+        self._lock = Lock()
+
+    @staticmethod
+    def _get_checked_out_connections(engine: _E) -> int:
+        pool = getattr(engine, 'sync_engine', engine).pool
+        return pool.checkedout() if hasattr(pool, 'checkedout') else 0
+
+    def _next_round_robin(self) -> _E:
+        with self._lock:
+            return self.engines[next(self._counter) % len(self.engines)]
+
+    def _next_least_connections(self) -> _E:
+        return min(self.engines, key=self._get_checked_out_connections)
+
+    def choose(self) -> _E:
+        if self.strategy == ReplicaStrategy.LEAST_CONNECTIONS:
+            return self._next_least_connections()
+
+        return self._next_round_robin()
@@ -1,7 +1,13 @@
-from fastapi import Header, Depends
+from fastapi import Header, Depends, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from commons.rest_api.base_crud_service import BaseCrudService
+from commons.rest_api.unit_of_work import set_current_session, reset_current_session, set_current_async_session, \
+    reset_current_async_session
 
 http_bearer = HTTPBearer(auto_error=False)
 
@@ -31,11 +37,46 @@ def get_bearer_token():
     return Depends(dependency)
 
 
+def get_fields():
+    def dependency(fields: str = Query(default=None)):
+        if fields:
+            return [field.strip() for field in fields.split(',') if field.strip()]
+    return Depends(dependency)
+
+
 def get_db_session(engine: Engine):
-    def dependency():
+    async def dependency():
         session = Session(engine)
+        token = set_current_session(session)
         try:
             yield session
+            await run_in_threadpool(session.commit)
+        except Exception:
+            await run_in_threadpool(session.rollback)
+            raise
         finally:
-            session.close()
+            reset_current_session(token)
+            await run_in_threadpool(session.close)
+    return Depends(dependency)
+
+
+def get_async_db_session(engine: AsyncEngine):
+    async def dependency():
+        session = AsyncSession(engine)
+        token = set_current_async_session(session)
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            reset_current_async_session(token)
+            await session.close()
+    return Depends(dependency)
+
+
+def get_id_loader(service: BaseCrudService, **kwargs):
+    def dependency():
+        return service.create_id_loader(**kwargs)
     return Depends(dependency)
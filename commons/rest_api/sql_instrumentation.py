@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import re
+import sys
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from commons.env import is_env_prod
+from commons.logging import log_warning
+from commons.rest_api.base_dao import BaseDao
+
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_STARTED_AT_KEY = 'commons_query_started_at'
+
+_MAX_CALLER_FRAMES = 64
+
+_EXPLAIN_SAVEPOINT = 'commons_explain'
+
+_LOCKING_OR_WRITING_SELECT_PATTERN = re.compile(
+    r'\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b|\b(?:nextval|setval)\s*\(',
+    re.IGNORECASE
+)
+
+_FINGERPRINT_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?'), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(?+)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def fingerprint_statement(statement: str) -> str:
+    for pattern, replacement in _FINGERPRINT_PATTERNS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def _is_read_only_select(statement: str) -> bool:
+    return statement.lstrip().upper().startswith('SELECT') \
+        and not _LOCKING_OR_WRITING_SELECT_PATTERN.search(statement)
+
+
+def _find_dao_method() -> Optional[str]:
+    frame = sys._getframe(2)
+    caller = None
+
+    for _ in range(_MAX_CALLER_FRAMES):
+        if frame is None:
+            break
+        owner = frame.f_locals.get('self')
+        if isinstance(owner, BaseDao):
+            caller = f'{type(owner).__name__}.{frame.f_code.co_name}'
+        frame = frame.f_back
+
+    return caller
+
+
+@dataclass
+class FingerprintStats:
+    buckets_ms: Sequence[float]
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    bucket_counts: List[int] = field(default_factory=list)
+    dao_methods: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.bucket_counts = self.bucket_counts or [0] * (len(self.buckets_ms) + 1)
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def record(self, duration_ms: float, rowcount: int, dao_method: Optional[str]) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.rows += max(rowcount, 0)
+        self.bucket_counts[bisect_left(self.buckets_ms, duration_ms)] += 1
+        if dao_method:
+            self.dao_methods[dao_method] = self.dao_methods.get(dao_method, 0) + 1
+
+    def percentile(self, percent: float) -> float:
+        threshold = self.count * percent / 100
+        seen = 0
+
+        for upper_bound, bucket_count in zip([*self.buckets_ms, self.max_ms], self.bucket_counts):
+            seen += bucket_count
+            if seen >= threshold and bucket_count:
+                return min(upper_bound, self.max_ms)
+
+        return self.max_ms
+
+
+@dataclass
+class SlowQuery:
+    fingerprint: str
+    statement: str
+    duration_ms: float
+    rowcount: int
+    dao_method: Optional[str]
+    plan: Optional[str] = None
+
+
+class SqlInstrumentation:
+    def __init__(
+            self,
+            *,
+            slow_query_threshold_ms: float = 500,
+            explain_slow_queries: bool = False,
+            buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS,
+            max_slow_queries: int = 100,
+            track_dao_methods: bool = False
+    ):
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self.explain_slow_queries = explain_slow_queries
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self.track_dao_methods = track_dao_methods
+        self.slow_queries = deque(maxlen=max_slow_queries)
+        self._stats: Dict[str, FingerprintStats] = {}
+        self._lock = Lock()
+        self._engines: List[Engine] = []
+
+    def instrument(self, engine: Engine) -> SqlInstrumentation:
+        engine = getattr(engine, 'sync_engine', engine)
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        self._engines.append(engine)
+        return self
+
+    def remove(self, engine: Engine = None) -> None:
+        engines = [getattr(engine, 'sync_engine', engine)] if engine is not None else list(self._engines)
+
+        for engine_ in engines:
+            event.remove(engine_, 'before_cursor_execute', self._before_cursor_execute)
+            event.remove(engine_, 'after_cursor_execute', self._after_cursor_execute)
+            self._engines.remove(engine_)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_STARTED_AT_KEY, []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info[_STARTED_AT_KEY].pop()) * 1000
+        fingerprint = fingerprint_statement(statement)
+        dao_method = _find_dao_method() if self.track_dao_methods else None
+        rowcount = cursor.rowcount if cursor.rowcount is not None else -1
+
+        with self._lock:
+            stats = self._stats.get(fingerprint)
+            if stats is None:
+                stats = self._stats[fingerprint] = FingerprintStats(self.buckets_ms)
+            stats.record(duration_ms, rowcount, dao_method)
+
+        if duration_ms >= self.slow_query_threshold_ms:
+            self._log_slow_query(conn, cursor, statement, parameters, executemany, SlowQuery(
+                fingerprint=fingerprint,
+                statement=statement,
+                duration_ms=duration_ms,
+                rowcount=rowcount,
+                dao_method=dao_method,
+            ))
+
+    @staticmethod
+    def _run_explain(dbapi_connection, statement: str, parameters) -> str:
+        explain_cursor = dbapi_connection.cursor()
+        explain_cursor.execute(f'SAVEPOINT {_EXPLAIN_SAVEPOINT}')
+
+        try:
+            explain_cursor.execute('SET LOCAL transaction_read_only = on')
+            explain_cursor.execute(statement, parameters)
+            return '\n'.join(row[0] for row in explain_cursor.fetchall())
+
+        finally:
+            explain_cursor.execute(f'ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}')
+            explain_cursor.execute(f'RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}')
+            explain_cursor.close()
+
+    def _explain(self, conn, cursor, statement: str, parameters, executemany: bool) -> Optional[str]:
+        if not self.explain_slow_queries or is_env_prod() or executemany or conn.dialect.name != 'postgresql':
+            return None
+
+        if not statement.lstrip().upper().startswith('SELECT'):
+            return None
+
+        explain_statements = [f'EXPLAIN {statement}']
+        if _is_read_only_select(statement):
+            explain_statements.insert(0, f'EXPLAIN (ANALYZE, BUFFERS) {statement}')
+
+        error = None
+        for explain_statement in explain_statements:
+            try:
+                return self._run_explain(cursor.connection, explain_statement, parameters)
+            except Exception as e:
+                error = e
+
+        return f'EXPLAIN failed: {error}'
+
+    def _log_slow_query(self, conn, cursor, statement, parameters, executemany, slow_query: SlowQuery) -> None:
+        slow_query.plan = self._explain(conn, cursor, statement, parameters, executemany)
+        self.slow_queries.append(slow_query)
+
+        message = f'SLOW QUERY: {slow_query.duration_ms:.1f} ms, rows={slow_query.rowcount}, ' \
+                  f'caller={slow_query.dao_method}: {slow_query.fingerprint}'
+        if slow_query.plan:
+            message += f'\n{slow_query.plan}'
+
+        log_warning(message)
+
+    def get_stats(self) -> Dict[str, FingerprintStats]:
+        with self._lock:
+            return dict(self._stats)
+
+    def top(self, n: int = 10, *, by: str = 'total_ms') -> List[Tuple[str, FingerprintStats]]:
+        return sorted(self.get_stats().items(), key=lambda item: getattr(item[1], by), reverse=True)[:n]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.slow_queries.clear()
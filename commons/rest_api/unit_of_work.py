@@ -0,0 +1,108 @@
+from contextlib import contextmanager, asynccontextmanager
+from contextvars import ContextVar, Token
+from typing import Optional, Iterator, AsyncIterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+_current_session: ContextVar[Optional[Session]] = ContextVar('commons_db_session', default=None)
+
+_current_async_session: ContextVar[Optional[AsyncSession]] = ContextVar('commons_async_db_session', default=None)
+
+_HAS_WRITES_KEY = 'commons_has_writes'
+
+_UNIT_OF_WORK_KEY = 'commons_unit_of_work'
+
+
+def mark_session_writes(session: Session) -> None:
+    session.info[_HAS_WRITES_KEY] = True
+
+
+def has_session_writes(session: Session) -> bool:
+    return bool(session.info.get(_HAS_WRITES_KEY) or session.new or session.dirty or session.deleted)
+
+
+def is_unit_of_work_session(session: Session) -> bool:
+    return bool(session.info.get(_UNIT_OF_WORK_KEY))
+
+
+def _mark_flushed_writes(session: Session, flush_context) -> None:
+    mark_session_writes(session)
+
+
+def _track_unit_of_work_session(session: Session) -> None:
+    session.info[_UNIT_OF_WORK_KEY] = True
+    if not event.contains(session, 'after_flush', _mark_flushed_writes):
+        event.listen(session, 'after_flush', _mark_flushed_writes)
+
+
+def get_current_session(engine: Engine = None) -> Optional[Session]:
+    session = _current_session.get()
+    if session is not None and engine is not None and session.bind is not engine:
+        return None
+    return session
+
+
+def set_current_session(session: Optional[Session]) -> Token:
+    if session is not None:
+        _track_unit_of_work_session(session)
+    return _current_session.set(session)
+
+
+def reset_current_session(token: Token) -> None:
+    _current_session.reset(token)
+
+
+def get_current_async_session(engine: AsyncEngine = None) -> Optional[AsyncSession]:
+    session = _current_async_session.get()
+    if session is not None and engine is not None and session.bind is not engine:
+        return None
+    return session
+
+
+def set_current_async_session(session: Optional[AsyncSession]) -> Token:
+    if session is not None:
+        _track_unit_of_work_session(session.sync_session)
+    return _current_async_session.set(session)
+
+
+def reset_current_async_session(token: Token) -> None:
+    _current_async_session.reset(token)
+
+
+@contextmanager
+def unit_of_work(engine: Engine) -> Iterator[Session]:
+    session = Session(engine)
+    token = set_current_session(session)
+
+    try:
+        yield session
+        session.commit()
+
+    except Exception:
+        session.rollback()
+        raise
+
+    finally:
+        reset_current_session(token)
+        session.close()
+
+
+@asynccontextmanager
+async def async_unit_of_work(engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    session = AsyncSession(engine)
+    token = set_current_async_session(session)
+
+    try:
+        yield session
+        await session.commit()
+
+    except Exception:
+        await session.rollback()
+        raise
+
+    finally:
+        reset_current_async_session(token)
+        await session.close()
@@ -16,5 +16,16 @@ setup(
         'requests~=2.28.1',
         'sqlalchemy~=1.4.27',
         'psycopg2~=2.9.1',
-    ]
+    ],
+    extras_require={
+        'async': [
+            'sqlalchemy[asyncio]~=1.4.27',
+            'asyncpg~=0.27',
+        ],
+        'test': [
+            'sqlalchemy[asyncio]~=1.4.27',
+            'asyncpg~=0.27',
+            'aiosqlite~=0.17',
+        ],
+    }
 )
@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+from unittest import TestCase
+
+from sqlalchemy import Column, String, Integer, create_engine
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import StaticPool
+
+from commons.datetime import now
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+
+
+class SaleDBModel(BaseDBModel):
+    __tablename__ = 'aggregated_sales'
+    region = Column(String, nullable=False)
+    amount = Column(Integer, nullable=False)
+
+
+class SaleBLModel(BaseBLModel):
+    region: str
+    amount: int
+
+
+class TestAggregate(TestCase):
+    engine_url = 'sqlite://'
+
+    def setUp(self):
+        self.engine = create_engine(self.engine_url, poolclass=StaticPool)
+        SaleDBModel.__table__.drop(self.engine, checkfirst=True)
+        sync_model_tables(self.engine, [SaleDBModel])
+        self.dao = BaseDao(db_model_class=SaleDBModel, bl_model_class=SaleBLModel, engine=self.engine)
+        self.dao.create_many([
+            SaleBLModel(region='eu', amount=10, created_at=datetime(2024, 1, 1, 10, 5, tzinfo=timezone.utc)),
+            SaleBLModel(region='eu', amount=20, created_at=datetime(2024, 1, 1, 10, 45, tzinfo=timezone.utc)),
+            SaleBLModel(region='us', amount=5, created_at=datetime(2024, 1, 1, 11, 15, tzinfo=timezone.utc)),
+            SaleBLModel(region='us', amount=100, created_at=datetime(2024, 1, 1, 11, 30, tzinfo=timezone.utc),
+                        deleted_at=now()),
+        ])
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_aggregate__given_group_by_and_metrics__returns_one_row_per_group(self):
+        rows = self.dao.aggregate(group_by=['region'], metrics={'n': 'count', 'total': ('sum', 'amount')})
+
+        assert rows == [{'region': 'eu', 'n': 2, 'total': 30}, {'region': 'us', 'n': 1, 'total': 5}]
+
+    def test_aggregate__given_filters_and_include_soft_deleted__honors_them(self):
+        rows = self.dao.aggregate({'region': 'us'}, metrics={'total': ('sum', 'amount')}, include_soft_deleted=True)
+
+        assert rows == [{'total': 105}]
+
+    def test_aggregate__given_time_bucket__groups_by_truncated_time(self):
+        rows = self.dao.aggregate(metrics={'n': 'count'}, time_bucket=('created_at', 'hour'), order_by={'n': 'asc'})
+
+        assert [row['n'] for row in rows] == [1, 2]
+        assert len({row['bucket'] for row in rows}) == 2
+
+    def test_aggregate__given_invalid_metric__raises_value_error(self):
+        with self.assertRaises(ValueError):
+            self.dao.aggregate(metrics={'total': ('median', 'amount')})
+
+        with self.assertRaises(ValueError):
+            self.dao.aggregate(metrics={'total': ('sum', 'missing')})
+
+
+class TestAggregatePostgres(TestAggregate):
+    engine_url = URL.create(
+        drivername='postgresql',
+        username='postgres',
+        password='root',
+        host='localhost',
+        port=5432,
+        database='commons_test_db'
+    )
+
+    def test_aggregate__given_time_bucket__uses_date_trunc(self):
+        rows = self.dao.aggregate(group_by=['region'], time_bucket=('created_at', 'hour'))
+
+        assert [(row['bucket'].hour, row['region'], row['count']) for row in rows] == [(10, 'eu', 2), (11, 'us', 1)]
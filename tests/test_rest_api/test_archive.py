@@ -0,0 +1,103 @@
+from datetime import timedelta
+from unittest import TestCase
+from unittest.mock import patch
+
+from sqlalchemy import Column, String, create_engine
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import StaticPool
+
+from commons.datetime import now
+from commons.rest_api.archive import SoftDeleteArchiver, ArchiveMode, get_archive_table
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+
+
+class EntryDBModel(BaseDBModel):
+    __tablename__ = 'archived_entries'
+    name = Column(String, nullable=False)
+
+
+class EntryBLModel(BaseBLModel):
+    name: str
+
+
+class TestSoftDeleteArchiver(TestCase):
+    engine_url = 'sqlite://'
+
+    def setUp(self):
+        self.engine = create_engine(self.engine_url, poolclass=StaticPool)
+        get_archive_table(EntryDBModel).drop(self.engine, checkfirst=True)
+        EntryDBModel.__table__.drop(self.engine, checkfirst=True)
+        sync_model_tables(self.engine, [EntryDBModel])
+        self.dao = BaseDao(db_model_class=EntryDBModel, bl_model_class=EntryBLModel, engine=self.engine)
+        old, recent = now() - timedelta(days=40), now() - timedelta(days=1)
+        self.dao.create_many([
+            EntryBLModel(name='live1'),
+            EntryBLModel(name='old1', deleted_at=old),
+            EntryBLModel(name='old2', deleted_at=old),
+            EntryBLModel(name='live2'),
+            EntryBLModel(name='old3', deleted_at=old),
+            EntryBLModel(name='recent', deleted_at=recent),
+        ])
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_run__given_archive_mode__moves_old_soft_deleted_rows_in_chunks(self):
+        reports = []
+        archiver = SoftDeleteArchiver(
+            EntryDBModel,
+            self.engine,
+            chunk_size=2,
+            sleep_seconds=0,
+            on_progress=lambda progress: reports.append(progress.processed)
+        )
+
+        progress = archiver.run()
+
+        assert progress.processed == 3 and progress.chunks == 2 and progress.done
+        assert reports == [2, 3]
+        assert [model.name for model in self.dao.get_all(include_soft_deleted=True)] == ['live1', 'live2', 'recent']
+        assert [model.name for model in self.dao.get_all(include_soft_deleted=True, include_archived=True)] == \
+               ['live1', 'old1', 'old2', 'live2', 'old3', 'recent']
+        assert self.dao.count_by_filter({'name__startswith': 'old'}, include_soft_deleted=True, include_archived=True) == 3
+
+    def test_run__given_purge_mode__hard_deletes_old_soft_deleted_rows(self):
+        progress = SoftDeleteArchiver(EntryDBModel, self.engine, mode=ArchiveMode.PURGE, sleep_seconds=0).run()
+
+        assert progress.processed == 3
+        assert self.dao.count_by_filter(include_soft_deleted=True) == 3
+
+    def test_get_archive_table__given_model__keeps_archive_table_out_of_model_metadata(self):
+        archive_table = get_archive_table(EntryDBModel)
+
+        assert archive_table.name not in EntryDBModel.metadata.tables
+        assert get_archive_table(EntryDBModel) is archive_table
+
+    def test_start__given_failing_run__logs_and_keeps_running(self):
+        archiver = SoftDeleteArchiver(EntryDBModel, self.engine, sleep_seconds=0)
+        calls = []
+
+        def run():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise RuntimeError('connection dropped')
+            archiver._stop_event.set()
+
+        with patch.object(archiver, 'run', side_effect=run), patch('commons.rest_api.archive.log_error') as log_error:
+            archiver.start(interval_seconds=0).thread.join(5)
+
+        assert calls == [0, 1]
+        assert log_error.call_count == 1
+
+
+class TestSoftDeleteArchiverPostgres(TestSoftDeleteArchiver):
+    engine_url = URL.create(
+        drivername='postgresql',
+        username='postgres',
+        password='root',
+        host='localhost',
+        port=5432,
+        database='commons_test_db'
+    )
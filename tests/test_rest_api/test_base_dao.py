@@ -1,13 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 from typing import Optional
 from unittest import TestCase
 
-from sqlalchemy import String, Column, create_engine, Integer, ForeignKey
+from sqlalchemy import String, Column, create_engine, Integer, ForeignKey, event, Enum as SAEnum
 from sqlalchemy.engine import URL
 from sqlalchemy.orm import relationship
 
+from commons.rest_api.base_crud_service import BaseCrudService
 from commons.rest_api.base_dao import BaseDao
 from commons.rest_api.base_model import BaseDBModel, BaseBLModel, Base
 from commons.rest_api.db import drop_create_public_schema, sync_model_tables
+from commons.rest_api.unit_of_work import unit_of_work
 
 
 class BookDBModel(BaseDBModel):
@@ -46,6 +50,31 @@ class BoosLibrariesBLModel(BaseBLModel):
     library_id: int
 
 
+class TagDBModel(BaseDBModel):
+    __tablename__ = 'tags'
+    name = Column(String, nullable=False, unique=True)
+    color = Column(String, nullable=False)
+
+
+class TagBLModel(BaseBLModel):
+    name: str
+    color: str
+
+
+class Shade(Enum):
+    LIGHT = 'light'
+    DARK = 'dark'
+
+
+class ShadeDBModel(BaseDBModel):
+    __tablename__ = 'shades'
+    shade = Column(SAEnum(Shade), nullable=False)
+
+
+class ShadeBLModel(BaseBLModel):
+    shade: Shade
+
+
 engine = create_engine(
     URL.create(
         drivername='postgresql',
@@ -104,3 +133,245 @@ class TestBaseDao(TestCase):
         books_libraries.create(BoosLibrariesBLModel(book_id=3, library_id=3))
         result = books.get_all(exclude_columns=[BookDBModel.created_at, 'updated_at'])
         print(result)
+
+    def _reset_books(self):
+        drop_create_public_schema(engine)
+        sync_model_tables(engine, [BookDBModel, LibraryDBModel, BooksLibrariesDBModel])
+        return BookDao()
+
+    def test_create_many__given_bulk__returns_models_with_ids(self):
+        books = self._reset_books()
+        models = [BookBLModel(title=f'title{i}', author='author', isbn=f'isbn{i}') for i in range(25)]
+
+        results = books.create_many(models, bulk=True, chunk_size=10)
+
+        assert [result.id for result in results] == list(range(1, 26))
+        assert [result.title for result in results] == [model.title for model in models]
+        assert all(result.created_at is not None for result in results)
+        assert [(book.id, book.title) for book in books.get_all()] == [(book.id, book.title) for book in results]
+
+    def test_create_many__given_use_copy__returns_models_with_ids(self):
+        books = self._reset_books()
+        models = [BookBLModel(title='tab\there', author='new\nline', isbn='back\\slash') for _ in range(5)]
+
+        results = books.create_many(models, use_copy=True)
+        stored = books.get_all()
+
+        assert [result.id for result in results] == list(range(1, 6))
+        assert [book.id for book in stored] == [book.id for book in results]
+        assert stored[0].title == 'tab\there' and stored[0].author == 'new\nline' and stored[0].isbn == 'back\\slash'
+        assert books.create(BookBLModel(title='t', author='a', isbn='i')).id == 6
+
+    def test_create_many__given_use_copy_and_enum_column__applies_bind_processors(self):
+        drop_create_public_schema(engine)
+        sync_model_tables(engine, [ShadeDBModel])
+        shades = BaseDao(db_model_class=ShadeDBModel, bl_model_class=ShadeBLModel, engine=engine)
+
+        shades.create_many([ShadeBLModel(shade=Shade.LIGHT), ShadeBLModel(shade=Shade.DARK)], use_copy=True)
+
+        assert [model.shade for model in shades.get_all()] == [Shade.LIGHT, Shade.DARK]
+
+    def test_upsert_many__given_new_and_existing_ids__inserts_and_updates(self):
+        books = self._reset_books()
+        existing = books.create_many([BookBLModel(title=f'title{i}', author='author', isbn=f'isbn{i}') for i in range(3)])
+        existing[0].title = 'changed'
+
+        results = books.upsert_many([existing[0], BookBLModel(title='new', author='author', isbn='isbn3')])
+
+        assert [(book.id, book.title) for book in results] == [(1, 'changed'), (4, 'new')]
+        assert results[0].updated_at > existing[0].updated_at
+        assert [book.title for book in books.get_all()] == ['changed', 'title1', 'title2', 'new']
+
+    def test_upsert_many__given_several_rows_in_one_chunk__inserts_updates_and_dedupes(self):
+        books = self._reset_books()
+        existing = books.create_many([BookBLModel(title=f'title{i}', author='author', isbn=f'isbn{i}') for i in range(3)])
+        first, second = existing[0].copy(update={'title': 'first'}), existing[0].copy(update={'title': 'last'})
+
+        results = books.upsert_many([first, existing[1].copy(update={'title': 'changed'}), second])
+
+        assert [(book.id, book.title) for book in results] == [(1, 'last'), (2, 'changed'), (1, 'last')]
+        assert [book.title for book in books.get_all()] == ['last', 'changed', 'title2']
+
+    def test_upsert_many__given_conflict_columns__inserts_and_updates_in_one_chunk(self):
+        drop_create_public_schema(engine)
+        sync_model_tables(engine, [TagDBModel])
+        tags = BaseDao(db_model_class=TagDBModel, bl_model_class=TagBLModel, engine=engine)
+        tags.create_many([TagBLModel(name='a', color='red'), TagBLModel(name='b', color='red')])
+
+        results = tags.upsert_many(
+            [TagBLModel(name='a', color='blue'), TagBLModel(name='c', color='blue'), TagBLModel(name='b', color='blue')],
+            conflict_columns=['name']
+        )
+
+        assert [(tag.name, tag.color) for tag in results] == [('a', 'blue'), ('c', 'blue'), ('b', 'blue')]
+        assert results[0].id == 1 and results[2].id == 2 and results[1].id > 2
+        assert [(tag.name, tag.color) for tag in tags.get_all()] == [('a', 'blue'), ('b', 'blue'), ('c', 'blue')]
+
+    def test_update_many__given_models__updates_in_one_statement_per_chunk(self):
+        books = self._reset_books()
+        existing = books.create_many([BookBLModel(title=f'title{i}', author='author', isbn=f'isbn{i}') for i in range(5)])
+        for book in existing:
+            book.author = f'author{book.id}'
+
+        results = books.update_many(existing, chunk_size=2)
+
+        assert [book.author for book in results] == [f'author{i}' for i in range(1, 6)]
+        assert [book.author for book in books.get_all()] == [f'author{i}' for i in range(1, 6)]
+        assert all(result.created_at == book.created_at for result, book in zip(results, existing))
+
+    def test_update_by_filter__given_chunk_size__updates_matching_rows(self):
+        books = self._reset_books()
+        books.create_many([BookBLModel(title=f'title{i}', author=f'author{i % 2}', isbn=f'isbn{i}') for i in range(10)])
+
+        affected = books.update_by_filter({'author': 'author0'}, {'isbn': 'reissued'}, chunk_size=3)
+
+        assert affected == 5
+        assert books.count_by_filter({'isbn': 'reissued', 'author': 'author0'}) == 5
+        assert books.count_by_filter({'isbn': 'reissued', 'author': 'author1'}) == 0
+
+    def test_update_by_filter__given_chunk_size_and_sparse_ids__only_visits_matching_rows(self):
+        books = self._reset_books()
+        books.create(BookBLModel(title='first', author='sparse', isbn='isbn'))
+        books.create(BookBLModel(id=10_000_000, title='last', author='sparse', isbn='isbn'))
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record_statement)
+        try:
+            affected = books.update_by_filter({'author': 'sparse'}, {'isbn': 'reissued'}, chunk_size=1000)
+        finally:
+            event.remove(engine, 'before_cursor_execute', record_statement)
+
+        assert affected == 2
+        assert len(statements) == 2
+        assert books.count_by_filter({'isbn': 'reissued'}) == 2
+
+    def test_update_by_filter__given_chunk_size_and_ambient_session__does_not_commit_per_chunk(self):
+        books = self._reset_books()
+        books.create_many([BookBLModel(title=f'title{i}', author='author', isbn=f'isbn{i}') for i in range(5)])
+        commits = []
+
+        with unit_of_work(engine) as session:
+            event.listen(session, 'after_commit', commits.append)
+            affected = books.update_by_filter({'author': 'author'}, {'isbn': 'reissued'}, chunk_size=2)
+
+        assert affected == 5
+        assert len(commits) == 1
+
+    def test_delete_by_filter__given_soft_then_hard__returns_affected_counts(self):
+        books = self._reset_books()
+        books.create_many([BookBLModel(title=f'title{i}', author=f'author{i % 2}', isbn=f'isbn{i}') for i in range(10)])
+
+        assert books.delete_by_filter({'author': 'author1'}) == 5
+        assert books.soft_delete_by_filter({'author': 'author1'}) == 0
+        assert books.count_by_filter() == 5
+        assert books.count_by_filter(include_soft_deleted=True) == 10
+        assert books.delete_by_filter({'author': 'author1'}, hard_delete=True, chunk_size=4) == 5
+        assert books.count_by_filter(include_soft_deleted=True) == 5
+
+    def test_get_column_names__given_cached_metadata__returns_immutable_values(self):
+        column_names = BookDBModel.get_column_names()
+
+        with self.assertRaises(AttributeError):
+            column_names.append('extra')
+
+        with self.assertRaises(TypeError):
+            BookDBModel.get_relationships()['extra'] = None
+
+        assert 'extra' not in BookDBModel.get_column_names()
+        assert BookDBModel.get_columns() == tuple(BookDBModel.__table__.columns)
+
+    def test_get_all__given_same_query_shape__reuses_cached_statement(self):
+        books = self._reset_books()
+        books.create_many([BookBLModel(title=f'title{i}', author='author', isbn=f'isbn{i}') for i in range(4)])
+
+        first = books.get_all({'title': ['title0', 'title1']}, limit=1, offset=1)
+        second = books.get_all({'title': ['title2', 'title3']}, limit=1, offset=1)
+        books.get_all({'title': 'title0'})
+
+        assert [book.title for book in first] == ['title1']
+        assert [book.title for book in second] == ['title3']
+        assert len(books._query_cache) == 2
+
+    def test_create_get_all_query__given_concurrent_evictions__keeps_cache_bounded(self):
+        books = BookDao()
+        books.query_cache_size = 2
+        shapes = [{key: 'value'} for key in ['title', 'author', 'isbn', 'id']] * 500
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda filters: books._create_get_all_query(dict(filters), order_by={'id': 'asc'}), shapes))
+
+        assert len(books._query_cache) == 2
+
+    def test_estimate_count_by_filter__given_postgres__reads_planner_estimate(self):
+        books = self._reset_books()
+        books.create_many([BookBLModel(title=f'title{i}', author='author', isbn=f'isbn{i}') for i in range(50)], bulk=True)
+        with engine.begin() as connection:
+            connection.exec_driver_sql('ANALYZE books')
+
+        assert books.estimate_count_by_filter() == 50
+        assert books.estimate_count_by_filter({'title': ['title1', 'title2']}) <= 2
+
+    def test_get_all__given_include__eager_loads_relationships_in_fixed_queries(self):
+        books = self._reset_books()
+        books.create_many([BookBLModel(title=f'title{i}', author='author', isbn=f'isbn{i}') for i in range(4)])
+        LibraryDao().create_many([LibraryBLModel(name=f'library{i}') for i in range(2)])
+        BooksLibrariesDao().create_many([
+            BoosLibrariesBLModel(book_id=book_id, library_id=library_id)
+            for book_id in range(1, 5)
+            for library_id in range(1, 3)
+        ])
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record_statement)
+        try:
+            results = books.get_all(include=['libraries.books'], exclude_columns=['created_at'])
+        finally:
+            event.remove(engine, 'before_cursor_execute', record_statement)
+
+        assert [len(book.libraries) for book in results] == [2, 2, 2, 2]
+        assert results[0].libraries[0]['name'] == 'library0'
+        assert len(results[0].libraries[0]['books']) == 4
+        assert results[0].created_at is None
+        assert len(statements) == 3
+
+    def test_patch__given_changed_fields__updates_and_returns_in_one_statement(self):
+        books = self._reset_books()
+        books.create(BookBLModel(title='title1', author='author1', isbn='isbn1'))
+        model = books.get_by_id(1)
+        model.title = 'renamed'
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record_statement)
+        try:
+            result = books.patch(1, model)
+            missing = books.patch(2, {'title': 'missing'})
+        finally:
+            event.remove(engine, 'before_cursor_execute', record_statement)
+
+        assert model.get_changes() == {'title': 'renamed'}
+        assert result.title == 'renamed' and result.author == 'author1'
+        assert result.updated_at > model.updated_at
+        assert missing is None
+        assert len(statements) == 2
+        assert statements[0].startswith('UPDATE books SET updated_at=%(updated_at)s, title=%(title)s WHERE')
+        assert 'RETURNING' in statements[0]
+
+    def test_partial_update__given_server_managed_and_non_column_fields__ignores_them(self):
+        books = self._reset_books()
+        created = books.create(BookBLModel(title='title1', author='author1', isbn='isbn1'))
+        service = BaseCrudService(books, BookBLModel)
+
+        result = service.partial_update(1, {'title': 'renamed', 'libraries': [], 'updated_at': created.created_at})
+        patched = books.patch(1, {'author': 'author2', 'id': 5, 'created_at': None, 'updated_at': None})
+
+        assert result.title == 'renamed' and result.updated_at > created.updated_at
+        assert patched.id == 1 and patched.author == 'author2' and patched.created_at == created.created_at
@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+from sqlalchemy import Column, String, create_engine
+from sqlalchemy.pool import StaticPool
+
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+
+
+class StreamItemDBModel(BaseDBModel):
+    __tablename__ = 'stream_items'
+    name = Column(String, nullable=False)
+    body = Column(String)
+
+
+class StreamItemBLModel(BaseBLModel):
+    name: str
+    body: str = None
+
+
+engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+
+
+class StreamItemDao(BaseDao):
+    def __init__(self):
+        super().__init__(
+            db_model_class=StreamItemDBModel,
+            bl_model_class=StreamItemBLModel,
+            engine=engine
+        )
+
+
+class TestBaseDaoIterAll(TestCase):
+    def setUp(self):
+        StreamItemDBModel.__table__.drop(engine, checkfirst=True)
+        sync_model_tables(engine, [StreamItemDBModel])
+        self.dao = StreamItemDao()
+        self.dao.create_many([StreamItemBLModel(name=f'item{i}', body='x' * 10) for i in range(25)])
+        self.dao.soft_delete_by_id(25)
+
+    def test_iter_all__given_batch_size__yields_every_live_row(self):
+        models = list(self.dao.iter_all(batch_size=10))
+
+        assert [model.id for model in models] == list(range(1, 25))
+
+    def test_iter_all__given_batches__yields_lists_of_batch_size(self):
+        batches = list(self.dao.iter_all(batch_size=10, batches=True, include_soft_deleted=True))
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+
+    def test_iter_all__given_filters_and_exclude_columns__matches_get_all(self):
+        kwargs = {'order_by': {'id': 'desc'}, 'exclude_columns': ['body']}
+        streamed = list(self.dao.iter_all({'name': ['item1', 'item2']}, **kwargs))
+
+        assert streamed == self.dao.get_all({'name': ['item1', 'item2']}, **kwargs)
+        assert all(model.body is None for model in streamed)
+
+
+class TestBaseDaoTrustedHydration(TestCase):
+    def setUp(self):
+        StreamItemDBModel.__table__.drop(engine, checkfirst=True)
+        sync_model_tables(engine, [StreamItemDBModel])
+        self.dao = StreamItemDao()
+        self.trusted_dao = BaseDao(
+            db_model_class=StreamItemDBModel,
+            bl_model_class=StreamItemBLModel,
+            engine=engine,
+            trusted_hydration=True
+        )
+        self.dao.create_many([StreamItemBLModel(name=f'item{i}', body='x') for i in range(5)])
+
+    def test_get_all__given_trusted_hydration__matches_validated_models(self):
+        assert self.trusted_dao.get_all() == self.dao.get_all()
+        assert list(self.trusted_dao.iter_all(batch_size=2)) == self.dao.get_all()
+
+    def test_get_all__given_trusted_hydration_and_excluded_columns__uses_field_defaults(self):
+        models = self.trusted_dao.get_all(exclude_columns=['body', 'created_at'])
+
+        assert all(model.body is None and model.created_at is None for model in models)
+        assert models[0].__fields_set__ == {'id', 'name', 'updated_at', 'deleted_at'}
@@ -0,0 +1,134 @@
+from typing import Optional
+from unittest import TestCase
+
+from sqlalchemy import Column, String, Integer, create_engine
+from sqlalchemy.pool import StaticPool
+
+from commons.rest_api.base_crud_service import BaseCrudService
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.pagination import PaginationOptions, PaginationMode, CountStrategy
+
+
+class PageItemDBModel(BaseDBModel):
+    __tablename__ = 'cursor_pagination_items'
+    name = Column(String, nullable=False)
+    rank = Column(Integer, nullable=False)
+    note = Column(String, nullable=True)
+
+
+class PageItemBLModel(BaseBLModel):
+    name: str
+    rank: int
+    note: Optional[str]
+
+
+engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+
+
+class PageItemDao(BaseDao):
+    def __init__(self):
+        super().__init__(
+            db_model_class=PageItemDBModel,
+            bl_model_class=PageItemBLModel,
+            engine=engine
+        )
+
+
+class TestCursorPagination(TestCase):
+    def setUp(self):
+        PageItemDBModel.__table__.drop(engine, checkfirst=True)
+        sync_model_tables(engine, [PageItemDBModel])
+        self.dao = PageItemDao()
+        self.service = BaseCrudService(self.dao, PageItemBLModel)
+        self.dao.create_many([PageItemBLModel(name=f'item{i}', rank=i % 3) for i in range(10)])
+
+    def _collect_pages(self, size: int, **kwargs):
+        pages = []
+        options = PaginationOptions(size=size, mode=PaginationMode.CURSOR)
+
+        while True:
+            page = self.service.get_all_paginated(pagination_options=options, **kwargs)
+            pages.append(page)
+            if page.next_cursor is None:
+                return pages
+            options = PaginationOptions(size=size, cursor=page.next_cursor)
+
+    def test_get_all_paginated__given_cursor_mode__walks_all_rows_once(self):
+        pages = self._collect_pages(4)
+
+        assert [len(page.results) for page in pages] == [4, 4, 2]
+        assert [model.id for page in pages for model in page.results] == list(range(1, 11))
+        assert all(page.total == 10 for page in pages)
+
+    def test_get_all_paginated__given_mixed_ordering__matches_offset_ordering(self):
+        order_by = {'rank': 'desc', 'name': 'asc'}
+        pages = self._collect_pages(3, order_by=order_by)
+        expected = self.dao.get_all(order_by={**order_by, 'id': 'asc'})
+
+        assert [model.id for page in pages for model in page.results] == [model.id for model in expected]
+
+    def test_get_all_paginated__given_nulls_in_sort_column__walks_all_rows_once(self):
+        for model in self.dao.get_all():
+            if model.id % 3:
+                model.note = f'note{model.id % 4}'
+                self.dao.update(model)
+
+        for direction in ['asc', 'desc']:
+            order_by = {'note': direction}
+            pages = self._collect_pages(2, order_by=order_by)
+            expected = self.dao.get_all(order_by={**order_by, 'id': direction})
+
+            assert [model.id for page in pages for model in page.results] == [model.id for model in expected]
+            assert sorted(model.id for page in pages for model in page.results) == list(range(1, 11))
+
+    def test_get_all_paginated__given_offset_mode__has_no_cursor(self):
+        page = self.service.get_all_paginated(pagination_options=PaginationOptions(page=2, size=4))
+
+        assert [model.id for model in page.results] == [5, 6, 7, 8]
+        assert page.next_cursor is None
+
+    def test_get_all_paginated__given_invalid_cursor__raises_bad_request(self):
+        with self.assertRaises(Exception) as ctx:
+            self.service.get_all_paginated(pagination_options=PaginationOptions(cursor='not-a-cursor'))
+
+        assert ctx.exception.status_code == 400
+
+
+class TestPaginationCountStrategies(TestCase):
+    def setUp(self):
+        PageItemDBModel.__table__.drop(engine, checkfirst=True)
+        sync_model_tables(engine, [PageItemDBModel])
+        self.dao = PageItemDao()
+        self.service = BaseCrudService(self.dao, PageItemBLModel)
+        self.dao.create_many([PageItemBLModel(name=f'item{i}', rank=i % 3) for i in range(10)])
+
+    def test_get_all_paginated__given_exact__counts_in_page_query(self):
+        page = self.service.get_all_paginated({'rank': [0, 1]}, PaginationOptions(page=2, size=3))
+
+        assert [model.id for model in page.results] == [5, 7, 8]
+        assert page.total == 7
+        assert page.has_next is True
+
+    def test_get_all_paginated__given_exact_and_page_past_end__falls_back_to_count(self):
+        page = self.service.get_all_paginated(pagination_options=PaginationOptions(page=5, size=3))
+
+        assert page.results == []
+        assert page.total == 10
+        assert page.has_next is False
+
+    def test_get_all_paginated__given_none__returns_has_next_only(self):
+        options = PaginationOptions(page=4, size=3, count=CountStrategy.NONE)
+        last_page = self.service.get_all_paginated(pagination_options=options)
+        options = PaginationOptions(page=3, size=3, count=CountStrategy.NONE)
+        middle_page = self.service.get_all_paginated(pagination_options=options)
+
+        assert [model.id for model in last_page.results] == [10]
+        assert last_page.total is None and last_page.has_next is False
+        assert len(middle_page.results) == 3 and middle_page.has_next is True
+
+    def test_get_all_paginated__given_estimated_on_sqlite__falls_back_to_exact_count(self):
+        page = self.service.get_all_paginated(pagination_options=PaginationOptions(count=CountStrategy.ESTIMATED))
+
+        assert page.total == 10
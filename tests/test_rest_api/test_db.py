@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from sqlalchemy import text, exc, create_engine
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import StaticPool
+
+from commons.rest_api.db import create_tuned_engine, get_pool_stats
+
+url = URL.create(
+    drivername='postgresql',
+    username='postgres',
+    password='root',
+    host='localhost',
+    port=5432,
+    database='commons_test_db'
+)
+
+
+class TestCreateTunedEngine(TestCase):
+    def test_create_tuned_engine__given_warm_up__opens_connections_up_front(self):
+        engine = create_tuned_engine(url, pool_size=3, max_overflow=0, warm_up_connections=5)
+
+        stats = get_pool_stats(engine)
+
+        assert stats['checked_in'] == 3 and stats['checked_out'] == 0
+        assert stats['checkouts'] == 3
+        engine.dispose()
+
+    def test_create_tuned_engine__given_statement_timeout__sets_it_on_every_connection(self):
+        engine = create_tuned_engine(url, statement_timeout_ms=1500)
+
+        with engine.connect() as connection:
+            assert connection.execute(text('SHOW statement_timeout')).scalar() == '1500ms'
+
+        engine.dispose()
+
+    def test_get_pool_stats__given_exhausted_pool__counts_timeouts(self):
+        engine = create_tuned_engine(url, pool_size=1, max_overflow=0, pool_timeout=0.1)
+
+        with engine.connect():
+            with self.assertRaises(exc.TimeoutError):
+                engine.connect()
+
+            stats = get_pool_stats(engine)
+
+        assert stats['checked_out'] == 1 and stats['checkout_timeouts'] == 1
+        assert stats['checkout_wait_ms_max'] >= 100
+        engine.dispose()
+
+    def test_get_pool_stats__given_dispose__carries_metrics_over(self):
+        engine = create_tuned_engine(url, pool_size=2, warm_up_connections=2)
+
+        engine.dispose()
+        with engine.connect():
+            stats = get_pool_stats(engine)
+
+        assert stats['checkouts'] == 3 and stats['checked_out'] == 1
+        engine.dispose()
+
+    def test_get_pool_stats__given_non_queue_pool__returns_partial_stats(self):
+        engine = create_engine('sqlite://', poolclass=StaticPool)
+
+        assert get_pool_stats(engine) == {'pool_class': 'StaticPool'}
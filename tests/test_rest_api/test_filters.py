@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+from sqlalchemy import Column, String, Integer, create_engine
+from sqlalchemy.pool import StaticPool
+
+from commons.rest_api.base_crud_service import BaseCrudService
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.filters import split_filter_key, FilterOperator
+from commons.rest_api.http_exceptions import BadRequestException
+
+
+class ProductDBModel(BaseDBModel):
+    __tablename__ = 'filter_products'
+    name = Column(String, nullable=False)
+    status = Column(String)
+    stock = Column(Integer, nullable=False)
+
+
+class ProductBLModel(BaseBLModel):
+    name: str
+    status: str = None
+    stock: int
+
+
+engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+
+
+class TestFilterOperators(TestCase):
+    def setUp(self):
+        ProductDBModel.__table__.drop(engine, checkfirst=True)
+        sync_model_tables(engine, [ProductDBModel])
+        self.dao = BaseDao(db_model_class=ProductDBModel, bl_model_class=ProductBLModel, engine=engine)
+        self.dao.create_many([
+            ProductBLModel(name='apple', status='active', stock=10),
+            ProductBLModel(name='apricot', status='archived', stock=0),
+            ProductBLModel(name='banana', status=None, stock=25),
+            ProductBLModel(name='50%_off', status='active', stock=5),
+        ])
+
+    def _names(self, filters: dict):
+        return [model.name for model in self.dao.get_all(filters)]
+
+    def test_split_filter_key__given_suffixes__returns_field_and_operator(self):
+        assert split_filter_key('stock__gte') == ('stock', FilterOperator.GTE)
+        assert split_filter_key('deleted_at') == ('deleted_at', FilterOperator.EQ)
+
+    def test_get_all__given_range_and_prefix_operators__filters_in_sql(self):
+        assert self._names({'stock__gte': 5, 'stock__lt': 25}) == ['apple', '50%_off']
+        assert self._names({'name__startswith': 'ap'}) == ['apple', 'apricot']
+        assert self._names({'name__startswith': '50%_'}) == ['50%_off']
+        assert self._names({'name__contains': 'an'}) == ['banana']
+
+    def test_get_all__given_collection_and_null_operators__filters_in_sql(self):
+        assert self._names({'status__in': ['archived', 'active'], 'name__ne': 'apple'}) == ['apricot', '50%_off']
+        assert self._names({'status__not_in': ['archived']}) == ['apple', '50%_off']
+        assert self._names({'status__isnull': True}) == ['banana']
+        assert self._names({'status__isnull': 'false'}) == ['apple', 'apricot', '50%_off']
+        assert self._names({'status__isnull': '1'}) == ['banana']
+
+    def test_count_and_exists_by_filter__given_operators__stay_in_database(self):
+        assert self.dao.count_by_filter({'stock__gt': 0}) == 3
+        assert self.dao.exists_by_filter({'name__endswith': 'cot'})
+        assert not self.dao.exists_by_filter({'stock__lt': 0})
+
+    def test_get_all__given_invalid_filters__raises_value_error(self):
+        with self.assertRaises(ValueError):
+            self.dao.get_all({'missing__gte': 1})
+
+        with self.assertRaises(ValueError):
+            self.dao.get_all({'status__in': 'active'})
+
+    def test_get_all__given_unknown_filter_through_service__raises_bad_request(self):
+        service = BaseCrudService(self.dao, ProductBLModel)
+
+        with self.assertRaises(BadRequestException):
+            service.get_all({'missing__startswith': 'a'})
+
+    def test_get_all__given_invalid_filter_values_through_service__raises_bad_request(self):
+        service = BaseCrudService(self.dao, ProductBLModel)
+
+        for filters in (
+                {'name__startswith': 5},
+                {'stock__in': 3},
+                {'stock__gt': None},
+                {'stock__gt': [1, 2]},
+                {'status__isnull': 'maybe'}
+        ):
+            with self.subTest(filters=filters), self.assertRaises(BadRequestException):
+                service.get_all(filters)
@@ -0,0 +1,91 @@
+import asyncio
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from sqlalchemy import Column, String, create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from commons.rest_api.async_base_dao import AsyncBaseDao
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.id_loader import IdLoader, AsyncIdLoader
+
+
+class AuthorDBModel(BaseDBModel):
+    __tablename__ = 'loader_authors'
+    name = Column(String, nullable=False)
+
+
+class AuthorBLModel(BaseBLModel):
+    name: str
+
+
+def count_selects(engine, statements: list):
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.startswith('SELECT'):
+            statements.append(statement)
+
+
+class TestIdLoader(TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+        sync_model_tables(self.engine, [AuthorDBModel])
+        self.dao = BaseDao(db_model_class=AuthorDBModel, bl_model_class=AuthorBLModel, engine=self.engine)
+        self.dao.create_many([AuthorBLModel(name=f'author{i}') for i in range(5)])
+        self.statements = []
+        count_selects(self.engine, self.statements)
+
+    def test_load__given_many_pending_loads__issues_one_query_in_order(self):
+        loader = IdLoader(self.dao)
+        pending = [loader.load(resource_id) for resource_id in [3, 1, 99, 3]]
+
+        results = [load.result() for load in pending]
+
+        assert [result.id if result else None for result in results] == [3, 1, None, 3]
+        assert len(self.statements) == 1
+
+    def test_load_many__given_memoized_ids__only_queries_new_ids(self):
+        loader = IdLoader(self.dao, max_batch_size=2)
+        loader.load_many([1, 2, 3])
+        results = loader.load_many([3, 4])
+
+        assert [result.id for result in results] == [3, 4]
+        assert len(self.statements) == 3
+
+
+class TestAsyncIdLoader(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_async_engine('sqlite+aiosqlite://', poolclass=StaticPool)
+        async with self.engine.begin() as connection:
+            await connection.run_sync(AuthorDBModel.__table__.create)
+
+        self.dao = AsyncBaseDao(db_model_class=AuthorDBModel, bl_model_class=AuthorBLModel, engine=self.engine)
+        await self.dao.create_many([AuthorBLModel(name=f'author{i}') for i in range(5)])
+        self.statements = []
+        count_selects(self.engine.sync_engine, self.statements)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def test_load__given_concurrent_loads__batches_them_into_one_query(self):
+        loader = AsyncIdLoader(self.dao)
+
+        results = await asyncio.gather(*[loader.load(resource_id) for resource_id in [5, 2, 42, 2]])
+
+        assert [result.id if result else None for result in results] == [5, 2, None, 2]
+        assert len(self.statements) == 1
+        assert (await loader.load(5)).id == 5 and len(self.statements) == 1
+
+    async def test_load__given_scheduled_dispatch__keeps_task_referenced_until_done(self):
+        loader = AsyncIdLoader(self.dao)
+        future = loader.load(3)
+        await asyncio.sleep(0)
+
+        assert len(loader._dispatch_tasks) == 1
+
+        await loader.wait_for_dispatches()
+
+        assert future.result().id == 3
+        assert loader._dispatch_tasks == set()
@@ -0,0 +1,105 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from sqlalchemy import Column, String, create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.identity_cache import IdentityCache
+
+
+class CachedUserDBModel(BaseDBModel):
+    __tablename__ = 'cached_users'
+    email = Column(String, nullable=False, unique=True)
+    name = Column(String, nullable=False)
+
+
+class CachedUserBLModel(BaseBLModel):
+    email: str
+    name: str
+
+
+engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+
+
+class TestBaseDaoIdentityCache(TestCase):
+    def setUp(self):
+        CachedUserDBModel.__table__.drop(engine, checkfirst=True)
+        sync_model_tables(engine, [CachedUserDBModel])
+        self.cache = IdentityCache(['email'], ttl_seconds=60)
+        self.dao = BaseDao(
+            db_model_class=CachedUserDBModel,
+            bl_model_class=CachedUserBLModel,
+            engine=engine,
+            identity_cache=self.cache
+        )
+        self.dao.create_many([CachedUserBLModel(email=f'user{i}@x.com', name=f'user{i}') for i in range(3)])
+
+    def test_get_by_id__given_repeated_reads__serves_from_cache(self):
+        first = self.dao.get_by_id(1)
+        second = self.dao.get_by_id(1)
+        by_email = self.dao.get_one_by_field('email', 'user0@x.com')
+
+        assert first.dict() == second.dict() == by_email.dict()
+        assert self.dao.exists_by_id(1)
+        assert self.cache.stats()['hits'] == 3 and self.cache.stats()['misses'] == 1
+
+    def test_get_by_id__given_update_or_delete__invalidates_entry(self):
+        model = self.dao.get_by_id(1)
+        model.name = 'renamed'
+        self.dao.update(model)
+
+        assert self.dao.get_by_id(1).name == 'renamed'
+
+        self.dao.soft_delete_by_id(1)
+
+        assert self.dao.get_by_id(1) is None
+        assert self.cache.stats()['size'] == 0
+
+    def test_get_by_id__given_read_between_update_and_commit__invalidates_after_commit(self):
+        model = self.dao.get_by_id(1)
+        model.name = 'renamed'
+
+        with Session(engine) as session:
+            self.dao.update(model, db_session=session, commit=False)
+            stale = self.dao.get_by_id(1)
+            session.commit()
+
+        assert stale.name == 'user0'
+        assert self.dao.get_by_id(1).name == 'renamed'
+
+    def test_exists_many__given_cached_ids__queries_only_uncached_filters(self):
+        self.dao.get_by_id(1)
+        self.dao.get_one_by_field('email', 'user1@x.com')
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record_statement)
+        try:
+            cached = self.dao.exists_many([{'id': 1}, {'email': 'user1@x.com'}])
+            mixed = self.dao.exists_many([{'id': 1}, {'id': 3}, {'id': 99}])
+        finally:
+            event.remove(engine, 'before_cursor_execute', record_statement)
+
+        assert cached == [True, True]
+        assert mixed == [True, True, False]
+        assert len(statements) == 1 and statements[0].count('EXISTS') == 2
+
+    def test_get_by_id__given_update_by_filter__clears_cache(self):
+        self.dao.get_by_id(2)
+        self.dao.update_by_filter({'id': 2}, {'name': 'bulk'})
+
+        assert self.dao.get_by_id(2).name == 'bulk'
+
+    def test_get_by_id__given_expired_entry__reads_from_db(self):
+        self.dao.get_by_id(3)
+
+        with patch('commons.rest_api.identity_cache.time.monotonic', return_value=float('inf')):
+            assert self.dao.get_by_id(3).id == 3
+
+        assert self.cache.stats()['misses'] == 2
@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+from sqlalchemy import Column, String, Integer, ForeignKey, create_engine
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import StaticPool
+
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.http_exceptions import ConflictException, NotFoundException
+
+
+class OwnerDBModel(BaseDBModel):
+    __tablename__ = 'integrity_owners'
+    email = Column(String, nullable=False, unique=True)
+
+
+class OwnerBLModel(BaseBLModel):
+    email: str
+
+
+class PetDBModel(BaseDBModel):
+    __tablename__ = 'integrity_pets'
+    name = Column(String, nullable=False)
+    owner_id = Column(Integer, ForeignKey('integrity_owners.id'), nullable=False)
+
+
+class PetBLModel(BaseBLModel):
+    name: str
+    owner_id: int
+
+
+class TestIntegrityErrors(TestCase):
+    engine_url = 'sqlite://'
+
+    def setUp(self):
+        self.engine = create_engine(self.engine_url, poolclass=StaticPool)
+        PetDBModel.__table__.drop(self.engine, checkfirst=True)
+        OwnerDBModel.__table__.drop(self.engine, checkfirst=True)
+        sync_model_tables(self.engine, [OwnerDBModel, PetDBModel])
+        self.owners = BaseDao(db_model_class=OwnerDBModel, bl_model_class=OwnerBLModel, engine=self.engine)
+        self.pets = BaseDao(db_model_class=PetDBModel, bl_model_class=PetBLModel, engine=self.engine)
+        self.owners.create(OwnerBLModel(email='alice@example.com'))
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_create__given_duplicate_unique_field__raises_conflict(self):
+        with self.assertRaises(ConflictException) as context:
+            self.owners.create(OwnerBLModel(email='alice@example.com'))
+
+        assert context.exception.detail['error_message'] == 'Record already exists where email = alice@example.com.'
+        assert self.owners.count_by_filter() == 1
+
+    def test_patch__given_duplicate_unique_field__raises_conflict(self):
+        self.owners.create(OwnerBLModel(email='bob@example.com'))
+
+        with self.assertRaises(ConflictException):
+            self.owners.patch(2, {'email': 'alice@example.com'})
+
+        assert self.owners.get_by_id(2).email == 'bob@example.com'
+
+
+class TestIntegrityErrorsPostgres(TestIntegrityErrors):
+    engine_url = URL.create(
+        drivername='postgresql',
+        username='postgres',
+        password='root',
+        host='localhost',
+        port=5432,
+        database='commons_test_db'
+    )
+
+    def test_create__given_missing_foreign_key__raises_not_found(self):
+        with self.assertRaises(NotFoundException) as context:
+            self.pets.create(PetBLModel(name='rex', owner_id=99))
+
+        assert context.exception.detail['error_message'] == 'Could not find record where owner_id = "99".'
+
+    def test_hard_delete_by_id__given_referenced_record__raises_conflict(self):
+        self.pets.create(PetBLModel(name='rex', owner_id=1))
+
+        with self.assertRaises(ConflictException):
+            self.owners.hard_delete_by_id(1)
+
+        assert self.owners.exists_by_id(1)
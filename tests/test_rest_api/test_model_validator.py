@@ -0,0 +1,97 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from sqlalchemy import Column, String, create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from commons.rest_api.async_base_dao import AsyncBaseDao
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.http_exceptions import ConflictException, BadRequestException
+from commons.rest_api.model_validator import ModelValidator, AsyncModelValidator
+
+
+class MemberDBModel(BaseDBModel):
+    __tablename__ = 'validator_members'
+    email = Column(String, nullable=False)
+    username = Column(String, nullable=False)
+
+
+class MemberBLModel(BaseBLModel):
+    email: str
+    username: str
+
+
+def record_selects(engine, statements: list):
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.startswith('SELECT'):
+            statements.append(statement)
+
+
+class TestModelValidator(TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+        sync_model_tables(self.engine, [MemberDBModel])
+        self.dao = BaseDao(db_model_class=MemberDBModel, bl_model_class=MemberBLModel, engine=self.engine)
+        self.dao.create(MemberBLModel(email='alice@example.com', username='alice'))
+        self.statements = []
+        record_selects(self.engine, self.statements)
+
+    def test_validate__given_several_db_checks__issues_one_query(self):
+        model = MemberBLModel(email='alice@example.com', username='bob')
+
+        with self.assertRaises(ConflictException) as context:
+            ModelValidator(model, self.dao) \
+                .assert_models_do_not_exist_in_db_by_field('email') \
+                .assert_models_do_not_exist_in_db_by_field('username') \
+                .assert_models_do_not_exist_in_db_by_filter({'email': 'carol@example.com', 'username': 'bob'}) \
+                .validate()
+
+        assert context.exception.detail['error_message'] == \
+               'Validation failed: [Record already exists where email = alice@example.com.]'
+        assert len(self.statements) == 1
+
+    def test_validate__given_in_memory_error__skips_db_checks(self):
+        model = MemberBLModel(id=2, email='alice@example.com', username='bob')
+
+        with self.assertRaises(BadRequestException):
+            ModelValidator(model, self.dao) \
+                .assert_models_do_not_exist_in_db_by_field('email') \
+                .assert_resource_id_matches_path_variable_id(3) \
+                .validate()
+
+        assert self.statements == []
+
+    def test_validate__given_passing_db_checks__does_not_raise(self):
+        ModelValidator(MemberBLModel(id=1, email='alice@example.com', username='alice'), self.dao) \
+            .assert_model_exists_in_db_by_id() \
+            .assert_model_exists_in_db_by_field('username') \
+            .assert_models_do_not_exist_in_db_by_field('email', 'dave@example.com') \
+            .validate()
+
+        assert len(self.statements) == 1
+
+
+class TestAsyncModelValidator(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_async_engine('sqlite+aiosqlite://', poolclass=StaticPool)
+        async with self.engine.begin() as connection:
+            await connection.run_sync(lambda conn: sync_model_tables(conn, [MemberDBModel]))
+        self.dao = AsyncBaseDao(db_model_class=MemberDBModel, bl_model_class=MemberBLModel, engine=self.engine)
+        await self.dao.create(MemberBLModel(email='alice@example.com', username='alice'))
+        self.statements = []
+        record_selects(self.engine.sync_engine, self.statements)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def test_validate__given_several_db_checks__issues_one_query(self):
+        with self.assertRaises(ConflictException):
+            await AsyncModelValidator(MemberBLModel(email='alice@example.com', username='alice'), self.dao) \
+                .assert_models_do_not_exist_in_db_by_field('email') \
+                .assert_models_do_not_exist_in_db_by_field('username') \
+                .validate()
+
+        assert len(self.statements) == 1
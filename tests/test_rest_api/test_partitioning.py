@@ -0,0 +1,117 @@
+from datetime import datetime, timezone, timedelta
+from unittest import TestCase
+
+from sqlalchemy import Column, String, create_engine, text
+from sqlalchemy.engine import URL
+
+from commons.datetime import now
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.partitioning import TimeRangePartitioning, PartitionInterval, PartitionMaintainer, \
+    sync_partitions, get_partition_names
+from commons.rest_api.sql_instrumentation import SqlInstrumentation
+
+partitioning = TimeRangePartitioning('created_at', interval=PartitionInterval.MONTH, premake=1, retention=1)
+
+
+class AuditEventDBModel(BaseDBModel):
+    __tablename__ = 'audit_events'
+    __partitioning__ = partitioning
+    action = Column(String, nullable=False)
+
+
+class AuditEventBLModel(BaseBLModel):
+    action: str
+
+
+engine = create_engine(
+    URL.create(
+        drivername='postgresql',
+        username='postgres',
+        password='root',
+        host='localhost',
+        port=5432,
+        database='commons_test_db'
+    )
+)
+
+
+class TestTimeRangePartitioning(TestCase):
+    def test_get_partition_ranges__given_month_interval__spans_retention_to_premake(self):
+        at = datetime(2026, 12, 15, 10, tzinfo=timezone.utc)
+
+        assert [start.month for start, _ in partitioning.get_partition_ranges(at)] == [11, 12, 1]
+        assert partitioning.get_partition_ranges(at)[-1][1] == datetime(2027, 2, 1, tzinfo=timezone.utc)
+        assert partitioning.get_partition_name('audit_events', datetime(2026, 11, 1)) == 'audit_events_p20261101'
+
+    def test_sync_model_tables__given_non_postgres_engine__raises_value_error(self):
+        sqlite_engine = create_engine('sqlite://')
+
+        with self.assertRaises(ValueError):
+            sync_model_tables(sqlite_engine, [AuditEventDBModel])
+
+        with self.assertRaises(ValueError):
+            BaseDao(db_model_class=AuditEventDBModel, bl_model_class=AuditEventBLModel, engine=sqlite_engine)
+
+
+class TestPartitionedTable(TestCase):
+    def setUp(self):
+        with engine.begin() as connection:
+            connection.execute(text('DROP TABLE IF EXISTS audit_events CASCADE'))
+        sync_model_tables(engine, [AuditEventDBModel])
+        self.dao = BaseDao(db_model_class=AuditEventDBModel, bl_model_class=AuditEventBLModel, engine=engine)
+        self.current = partitioning.floor(now())
+        self.previous = partitioning.shift(self.current, -1)
+
+    def _get_partition_names(self):
+        with engine.connect() as connection:
+            return sorted(get_partition_names(connection, 'audit_events'))
+
+    def test_sync_model_tables__given_partitioning__creates_rolling_partitions(self):
+        assert self._get_partition_names() == [
+            partitioning.get_partition_name('audit_events', partitioning.shift(self.current, i)) for i in (-1, 0, 1)
+        ]
+
+        result = sync_partitions(engine, AuditEventDBModel, at=partitioning.shift(self.current, 1))
+
+        assert result.created == [partitioning.get_partition_name('audit_events', partitioning.shift(self.current, 2))]
+        assert result.dropped == [partitioning.get_partition_name('audit_events', self.previous)]
+
+    def test_get_all__given_partition_key_filter__prunes_other_partitions(self):
+        self.dao.create(AuditEventBLModel(action='old', created_at=self.previous + timedelta(days=1)))
+        created = self.dao.create(AuditEventBLModel(action='new'))
+        instrumentation = SqlInstrumentation(slow_query_threshold_ms=0, explain_slow_queries=True).instrument(engine)
+
+        try:
+            results = self.dao.get_all({'created_at__gte': self.current.replace(tzinfo=None)})
+        finally:
+            instrumentation.remove()
+
+        plan = instrumentation.slow_queries[-1].plan
+        assert [model.action for model in results] == ['new']
+        assert partitioning.get_partition_name('audit_events', self.current) in plan
+        assert partitioning.get_partition_name('audit_events', self.previous) not in plan
+        assert self.dao.get_by_id(created.id).action == 'new'
+
+    def test_partition_maintainer__given_missing_future_partition__recreates_it(self):
+        future = partitioning.get_partition_name('audit_events', partitioning.shift(self.current, 1))
+        with engine.begin() as connection:
+            connection.execute(text(f'DROP TABLE {future}'))
+
+        results = PartitionMaintainer(engine, [AuditEventDBModel]).run()
+
+        assert [result.created for result in results] == [[future]]
+        assert future in self._get_partition_names()
+
+    def test_upsert_many__given_default_conflict_target__uses_composite_primary_key(self):
+        existing = self.dao.create(AuditEventBLModel(action='created'))
+
+        results = self.dao.upsert_many([
+            existing.copy(update={'action': 'updated'}),
+            AuditEventBLModel(action='inserted', created_at=now())
+        ])
+
+        assert [model.action for model in results] == ['updated', 'inserted']
+        assert results[0].id == existing.id
+        assert sorted(model.action for model in self.dao.get_all()) == ['inserted', 'updated']
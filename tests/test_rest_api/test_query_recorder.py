@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+from sqlalchemy import Column, String, Integer, create_engine, inspect
+from sqlalchemy.pool import StaticPool
+
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.query_recorder import QueryShapeRecorder, suggest_indexes, create_suggested_indexes, \
+    format_index_suggestions
+
+
+class OrderDBModel(BaseDBModel):
+    __tablename__ = 'recorded_orders'
+    status = Column(String, nullable=False)
+    customer_id = Column(Integer, nullable=False)
+    total = Column(Integer, nullable=False)
+
+
+class OrderBLModel(BaseBLModel):
+    status: str
+    customer_id: int
+    total: int
+
+
+engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+
+
+class TestQueryShapeRecorder(TestCase):
+    def setUp(self):
+        OrderDBModel.__table__.drop(engine, checkfirst=True)
+        sync_model_tables(engine, [OrderDBModel])
+        self.recorder = QueryShapeRecorder()
+        self.dao = BaseDao(
+            db_model_class=OrderDBModel,
+            bl_model_class=OrderBLModel,
+            engine=engine,
+            query_recorder=self.recorder
+        )
+        self.dao.create_many([OrderBLModel(status='open', customer_id=i % 3, total=i * 10) for i in range(9)])
+
+    def test_get_all__given_recorder__aggregates_query_shapes(self):
+        for customer_id in range(3):
+            self.dao.get_all({'customer_id': customer_id, 'status': 'open'}, order_by={'total': 'desc'})
+        self.dao.count_by_filter({'total__gte': 20}, include_soft_deleted=True)
+
+        stats = {
+            (shape.equality_columns, shape.range_columns, shape.excludes_soft_deleted): stat.count
+            for shape, stat in self.recorder.get_stats().items()
+        }
+
+        assert stats == {(('customer_id', 'status'), (), True): 3, ((), ('total',), False): 1}
+
+    def test_suggest_indexes__given_recorded_shapes__proposes_composite_partial_indexes(self):
+        for customer_id in range(3):
+            self.dao.get_all({'customer_id': customer_id, 'status': 'open'}, order_by={'total': 'desc'})
+            self.dao.get_all({'customer_id': customer_id})
+            self.dao.get_by_id(customer_id + 1)
+
+        suggestions = suggest_indexes(self.recorder, OrderDBModel)
+
+        assert [(s.columns, s.excludes_soft_deleted, s.count) for s in suggestions] == [
+            (('customer_id', 'status', 'total'), True, 6)
+        ]
+        assert 'WHERE deleted_at IS NULL' in format_index_suggestions(suggestions, OrderDBModel, engine)
+
+        create_suggested_indexes(engine, OrderDBModel, suggestions)
+
+        assert suggestions[0].name in [index['name'] for index in inspect(engine).get_indexes('recorded_orders')]
@@ -0,0 +1,97 @@
+from unittest import TestCase
+
+from sqlalchemy import Column, String, create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool, QueuePool
+
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.replica_router import ReplicaRouter, ReplicaStrategy
+from commons.rest_api.unit_of_work import unit_of_work
+
+
+class ReplicatedNoteDBModel(BaseDBModel):
+    __tablename__ = 'replicated_notes'
+    text = Column(String, nullable=False)
+
+
+class ReplicatedNoteBLModel(BaseBLModel):
+    text: str
+
+
+def create_sqlite_engine():
+    return create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+
+
+class TestBaseDaoReplicaRouting(TestCase):
+    def setUp(self):
+        self.primary = create_sqlite_engine()
+        self.replicas = [create_sqlite_engine(), create_sqlite_engine()]
+
+        for engine in [self.primary, *self.replicas]:
+            sync_model_tables(engine, [ReplicatedNoteDBModel])
+
+        self.dao = BaseDao(
+            db_model_class=ReplicatedNoteDBModel,
+            bl_model_class=ReplicatedNoteBLModel,
+            engine=self.primary,
+            replica_engines=self.replicas
+        )
+
+        for i, replica in enumerate(self.replicas):
+            BaseDao(db_model_class=ReplicatedNoteDBModel, bl_model_class=ReplicatedNoteBLModel, engine=replica) \
+                .create(ReplicatedNoteBLModel(text=f'replica{i}'))
+
+    def test_get_all__given_replicas__reads_round_robin_and_writes_to_primary(self):
+        self.dao.create(ReplicatedNoteBLModel(text='primary'))
+
+        texts = [self.dao.get_all()[0].text for _ in range(4)]
+
+        assert texts == ['replica0', 'replica1', 'replica0', 'replica1']
+        assert self.dao.count_by_filter({'text': 'primary'}) == 0
+
+    def test_get_all__given_use_primary__reads_own_writes(self):
+        self.dao.create(ReplicatedNoteBLModel(text='primary'))
+
+        assert self.dao.get_by_id(1, use_primary=True).text == 'primary'
+        assert self.dao.exists_by_filter({'text': 'primary'}, use_primary=True)
+
+    def test_get_all__given_session_that_wrote__stays_on_primary(self):
+        with Session(self.primary) as session:
+            self.dao.create(ReplicatedNoteBLModel(text='uncommitted'), db_session=session, commit=False)
+
+            assert self.dao.get_all({'text': 'uncommitted'}, db_session=session)[0].id == 1
+
+    def test_get_all__given_read_only_unit_of_work__reads_from_replica(self):
+        self.dao.create(ReplicatedNoteBLModel(text='primary'))
+
+        with unit_of_work(self.primary):
+            texts = [model.text for model in self.dao.get_all()]
+            primary_texts = [model.text for model in self.dao.get_all(use_primary=True)]
+
+        assert texts == ['replica0']
+        assert primary_texts == ['primary']
+
+    def test_get_all__given_unit_of_work_that_wrote__reads_own_writes_from_primary(self):
+        with unit_of_work(self.primary):
+            self.dao.create(ReplicatedNoteBLModel(text='first'))
+            first = [model.text for model in self.dao.get_all()]
+            self.dao.patch(1, {'text': 'patched'}, commit=False)
+            patched = [model.text for model in self.dao.get_all()]
+
+        assert first == ['first'] and patched == ['patched']
+
+
+class TestReplicaRouter(TestCase):
+    def test_choose__given_least_connections__picks_idlest_engine(self):
+        busy = create_engine('sqlite://', poolclass=QueuePool)
+        idle = create_engine('sqlite://', poolclass=QueuePool)
+        router = ReplicaRouter([busy, idle], ReplicaStrategy.LEAST_CONNECTIONS)
+
+        with busy.connect():
+            assert router.choose() is idle
+
+    def test_init__given_no_engines__raises_value_error(self):
+        with self.assertRaises(ValueError):
+            ReplicaRouter([])
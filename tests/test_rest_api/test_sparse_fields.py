@@ -0,0 +1,133 @@
+import asyncio
+import json
+from datetime import datetime
+from enum import Enum
+from unittest import TestCase
+from urllib.parse import urlencode
+
+from fastapi import FastAPI
+from sqlalchemy import Column, String, Integer, Text, create_engine, event
+from sqlalchemy.pool import StaticPool
+
+from commons.rest_api.base_crud_service import BaseCrudService
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.dtos import generate_response_dto
+from commons.rest_api.http_exceptions import BadRequestException
+from commons.rest_api.pagination import PaginationOptions, PaginationMode
+from commons.rest_api.route_dependencies import get_fields
+
+
+class ArticleDBModel(BaseDBModel):
+    __tablename__ = 'sparse_articles'
+    title = Column(String, nullable=False)
+    views = Column(Integer, nullable=False)
+    body = Column(Text, nullable=False)
+    color = Column(String, nullable=False)
+
+
+class Color(str, Enum):
+    RED = 'red'
+    BLUE = 'blue'
+
+
+class ArticleBLModel(BaseBLModel):
+    title: str
+    views: int
+    body: str
+    color: Color
+
+
+ArticleResponseDTO = generate_response_dto('ArticleResponseDTO', ArticleBLModel)
+
+def call_get_route(app: FastAPI, path: str, params: dict) -> (int, dict):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http', 'path': path, 'root_path': '',
+        'query_string': urlencode(params).encode(), 'headers': [], 'server': ('testserver', 80)
+    }
+    asyncio.run(app(scope, receive, send))
+
+    body = b''.join(message.get('body', b'') for message in messages if message['type'] == 'http.response.body')
+    return messages[0]['status'], json.loads(body)
+
+
+engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+
+
+class TestSparseFields(TestCase):
+    def setUp(self):
+        ArticleDBModel.__table__.drop(engine, checkfirst=True)
+        sync_model_tables(engine, [ArticleDBModel])
+        self.dao = BaseDao(db_model_class=ArticleDBModel, bl_model_class=ArticleBLModel, engine=engine)
+        self.service = BaseCrudService(self.dao, ArticleBLModel)
+        self.dao.create_many([ArticleBLModel(title=f'title{i}', views=i, body='x' * 1000, color=Color.RED) for i in range(5)])
+        self.statements = []
+        event.listen(engine, 'before_cursor_execute', self._record_statement)
+
+    def tearDown(self):
+        event.remove(engine, 'before_cursor_execute', self._record_statement)
+
+    def _record_statement(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def test_get_all_paginated__given_fields__projects_only_selected_columns(self):
+        options = PaginationOptions(size=2, mode=PaginationMode.CURSOR)
+        first = self.service.get_all_paginated(pagination_options=options, order_by={'views': 'desc'}, fields=['title'])
+        second = self.service.get_all_paginated(
+            pagination_options=PaginationOptions(size=2, cursor=first.next_cursor),
+            order_by={'views': 'desc'},
+            fields=['title']
+        )
+
+        assert [model.title for model in first.results + second.results] == ['title4', 'title3', 'title2', 'title1']
+        assert first.results[0].dict(exclude_unset=True) == {'id': 5, 'title': 'title4', 'views': 4}
+        assert all('body' not in statement for statement in self.statements)
+
+    def test_get_all__given_fields_without_trusted_hydration__validates_selected_fields(self):
+        models = self.dao.get_all(fields=['color', 'created_at'], limit=1)
+
+        assert models[0].color is Color.RED
+        assert isinstance(models[0].created_at, datetime)
+        assert models[0].dict(exclude_unset=True).keys() == {'id', 'color', 'created_at'}
+
+    def test_from_models__given_fields__maps_only_selected_fields(self):
+        models = self.service.get_all(fields=['title'])
+
+        dtos = ArticleResponseDTO.from_models(models, fields=['id', 'title'])
+
+        assert dtos[0].dict() == {'id': 1, 'title': 'title0'}
+
+    def test_list_route__given_fields_query__returns_only_selected_fields_and_id(self):
+        app = FastAPI()
+
+        @app.get('/articles')
+        def get_articles(fields=get_fields()):
+            return self.service \
+                .get_all_paginated(pagination_options=PaginationOptions(size=2), fields=fields) \
+                .map_results_to_dtos(ArticleResponseDTO, fields)
+
+        status_code, body = call_get_route(app, '/articles', {'fields': 'title,color'})
+
+        assert status_code == 200
+        assert body['results'] == [
+            {'id': 1, 'title': 'title0', 'color': 'red'},
+            {'id': 2, 'title': 'title1', 'color': 'red'}
+        ]
+        assert body['total'] == 5
+
+    def test_get_by_id__given_unknown_field__raises_bad_request(self):
+        with self.assertRaises(BadRequestException):
+            self.service.get_by_id(1, fields=['title', 'missing'])
+
+    def test_get_fields__given_comma_separated_query__returns_list(self):
+        assert get_fields().dependency(fields='title, views,') == ['title', 'views']
+        assert get_fields().dependency(fields=None) is None
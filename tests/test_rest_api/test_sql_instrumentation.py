@@ -0,0 +1,116 @@
+from os import environ
+from unittest import TestCase
+
+from sqlalchemy import Column, String, create_engine, text
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import StaticPool
+
+from commons.env import ENV_KEY, set_env_to_prod
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.sql_instrumentation import SqlInstrumentation, fingerprint_statement
+
+
+class EventDBModel(BaseDBModel):
+    __tablename__ = 'instrumented_events'
+    name = Column(String, nullable=False)
+
+
+class EventBLModel(BaseBLModel):
+    name: str
+
+
+class EventDao(BaseDao):
+    db_model_class = EventDBModel
+    bl_model_class = EventBLModel
+
+
+class TestSqlInstrumentation(TestCase):
+    engine_url = 'sqlite://'
+
+    def setUp(self):
+        self.engine = create_engine(self.engine_url, poolclass=StaticPool)
+        EventDBModel.__table__.drop(self.engine, checkfirst=True)
+        sync_model_tables(self.engine, [EventDBModel])
+        self.dao = EventDao(engine=self.engine)
+        self.dao.create_many([EventBLModel(name=f'event{i}') for i in range(3)])
+        self.instrumentation = SqlInstrumentation(
+            slow_query_threshold_ms=0,
+            explain_slow_queries=True,
+            track_dao_methods=True
+        )
+        self.instrumentation.instrument(self.engine)
+
+    def tearDown(self):
+        self.instrumentation.remove()
+        self.engine.dispose()
+
+    def test_fingerprint_statement__given_literals_and_params__normalizes_them(self):
+        assert fingerprint_statement("SELECT * FROM t WHERE a = 'x' AND b IN (1, 2, 3) AND c = %(c)s") == \
+               'SELECT * FROM t WHERE a = ? AND b IN (?+) AND c = ?'
+
+    def test_get_by_id__given_instrumentation__records_fingerprint_histogram_and_caller(self):
+        for resource_id in range(1, 4):
+            self.dao.get_by_id(resource_id)
+
+        (fingerprint, stats), = self.instrumentation.top(1, by='count')
+
+        assert fingerprint.startswith('SELECT') and 'instrumented_events' in fingerprint
+        assert stats.count == 3
+        assert sum(stats.bucket_counts) == 3
+        assert stats.dao_methods == {'EventDao.get_by_id': 3}
+        assert len(self.instrumentation.slow_queries) == 3
+
+
+class TestSqlInstrumentationPostgres(TestSqlInstrumentation):
+    engine_url = URL.create(
+        drivername='postgresql',
+        username='postgres',
+        password='root',
+        host='localhost',
+        port=5432,
+        database='commons_test_db'
+    )
+
+    def test_get_all__given_slow_select_in_non_prod__captures_explain_analyze(self):
+        self.dao.get_all({'name': 'event1'})
+
+        plan = self.instrumentation.slow_queries[-1].plan
+
+        assert 'actual time' in plan and 'Buffers' in plan
+
+    def test_explain__given_select_with_side_effects__does_not_rerun_it_or_break_transaction(self):
+        with self.engine.begin() as connection:
+            connection.execute(text(
+                'CREATE OR REPLACE FUNCTION commons_add_event() RETURNS int AS '
+                "$$ INSERT INTO instrumented_events (name) VALUES ('added') RETURNING id $$ LANGUAGE sql"
+            ))
+
+        with self.engine.begin() as connection:
+            connection.execute(text('SELECT commons_add_event()'))
+            plan = self.instrumentation.slow_queries[-1].plan
+            connection.execute(text("INSERT INTO instrumented_events (name) VALUES ('after')"))
+
+        assert plan.startswith('Result') and 'actual time' not in plan
+        assert self.dao.count_by_filter({'name': 'added'}) == 1
+        assert self.dao.count_by_filter({'name': 'after'}) == 1
+
+    def test_explain__given_prod_env__skips_explain(self):
+        previous_env = environ.get(ENV_KEY)
+        set_env_to_prod()
+
+        try:
+            self.dao.get_all({'name': 'event1'})
+        finally:
+            environ.pop(ENV_KEY)
+            if previous_env is not None:
+                environ[ENV_KEY] = previous_env
+
+        assert self.instrumentation.slow_queries[-1].plan is None
+
+    def test_instrumentation__given_defaults__does_not_explain_or_walk_frames(self):
+        instrumentation = SqlInstrumentation()
+
+        assert instrumentation.explain_slow_queries is False
+        assert instrumentation.track_dao_methods is False
@@ -0,0 +1,115 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from sqlalchemy import Column, String, create_engine, event
+from sqlalchemy.pool import StaticPool
+from starlette.concurrency import run_in_threadpool
+
+from commons.rest_api.base_crud_service import BaseCrudService
+from commons.rest_api.base_dao import BaseDao
+from commons.rest_api.base_model import BaseDBModel, BaseBLModel
+from commons.rest_api.db import sync_model_tables
+from commons.rest_api.route_dependencies import get_db_session
+from commons.rest_api.unit_of_work import unit_of_work, get_current_session
+
+
+class AccountDBModel(BaseDBModel):
+    __tablename__ = 'uow_accounts'
+    name = Column(String, nullable=False)
+
+
+class AccountBLModel(BaseBLModel):
+    name: str
+
+
+class TestUnitOfWork(TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+        sync_model_tables(self.engine, [AccountDBModel])
+        self.dao = BaseDao(db_model_class=AccountDBModel, bl_model_class=AccountBLModel, engine=self.engine)
+        self.service = BaseCrudService(self.dao, AccountBLModel)
+        self.dao.create(AccountBLModel(name='alice'))
+        self.checkouts = []
+        event.listen(self.engine, 'checkout', self._record_checkout)
+
+    def _record_checkout(self, *args):
+        self.checkouts.append(args)
+
+    def test_partial_update__given_unit_of_work__checks_out_one_connection(self):
+        with unit_of_work(self.engine) as session:
+            model = self.service.partial_update(1, {'name': 'bob'})
+
+            assert get_current_session(self.engine) is session
+
+        assert model.name == 'bob'
+        assert len(self.checkouts) == 1
+        assert get_current_session() is None
+
+    def test_unit_of_work__given_exception__rolls_back_uncommitted_writes(self):
+        with self.assertRaises(RuntimeError):
+            with unit_of_work(self.engine):
+                self.dao.create(AccountBLModel(name='carol'), commit=False)
+                raise RuntimeError()
+
+        assert self.dao.count_by_filter({}) == 1
+
+    def test_unit_of_work__given_committing_writes_then_exception__rolls_back_every_write(self):
+        with self.assertRaises(RuntimeError):
+            with unit_of_work(self.engine):
+                self.dao.create(AccountBLModel(name='carol'))
+                self.service.partial_update(1, {'name': 'bob'})
+                raise RuntimeError()
+
+        assert [model.name for model in self.dao.get_all()] == ['alice']
+
+    def test_unit_of_work__given_several_writes__commits_once_at_the_end(self):
+        commits = []
+
+        with unit_of_work(self.engine) as session:
+            event.listen(session, 'after_commit', commits.append)
+            self.dao.create(AccountBLModel(name='carol'))
+            self.dao.update_by_filter({'name': 'alice'}, {'name': 'bob'})
+
+            assert commits == []
+
+        assert len(commits) == 1
+        assert [model.name for model in self.dao.get_all()] == ['bob', 'carol']
+
+
+class TestGetDbSession(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+        sync_model_tables(self.engine, [AccountDBModel])
+        self.dao = BaseDao(db_model_class=AccountDBModel, bl_model_class=AccountBLModel, engine=self.engine)
+        self.service = BaseCrudService(self.dao, AccountBLModel)
+        self.dao.create(AccountBLModel(name='alice'))
+        self.checkouts = []
+        event.listen(self.engine, 'checkout', lambda *args: self.checkouts.append(args))
+
+    async def test_get_db_session__given_sync_route__shares_session_with_service(self):
+        dependency = get_db_session(self.engine).dependency()
+        db_session = await dependency.__anext__()
+
+        def route():
+            assert get_current_session() is db_session
+            return self.service.partial_update(1, {'name': 'dave'})
+
+        model = await run_in_threadpool(route)
+        await dependency.aclose()
+
+        assert model.name == 'dave'
+        assert len(self.checkouts) == 1
+        assert get_current_session() is None
+
+    async def test_get_db_session__given_route_error__rolls_back_route_writes(self):
+        dependency = get_db_session(self.engine).dependency()
+        await dependency.__anext__()
+
+        def route():
+            self.dao.create(AccountBLModel(name='erin'))
+            self.service.partial_update(1, {'name': 'dave'})
+
+        await run_in_threadpool(route)
+        with self.assertRaises(RuntimeError):
+            await dependency.athrow(RuntimeError())
+
+        assert [model.name for model in self.dao.get_all()] == ['alice']